@@ -0,0 +1,82 @@
+"""
+Memory footprint of an auction's bid history, per bid.
+
+    PYTHONPATH=src python benchmarks/bid_history_memory.py [--bids 100000] [--bidders 1000]
+
+"before" is the previous representation: a list of frozen dataclasses with a `__dict__` each.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from module.auction.domain.bid_history import BidHistory
+from module.auction.domain.entity import Auction
+from module.auction.domain.event import BidPlaced
+from module.auction.domain.value_object import Bid
+
+
+@dataclass(frozen=True)
+class DictBid:
+    bidder_id: str
+    amount: float
+
+
+@dataclass(frozen=True)
+class DictBidPlaced:
+    auction_id: str
+    bidder_id: str
+    amount: float
+    sequence: int
+    occurred_at: str
+
+
+def measure(build: Callable[[], Any]) -> tuple[int, float]:
+    """Bytes still allocated by what `build` returns, and how long building it took."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bids", type=int, default=100_000)
+    parser.add_argument("--bidders", type=int, default=1_000)
+    args = parser.parse_args()
+
+    # Rows as the repository reads them; the bidder ids are distinct string objects, like fresh query results
+    rows = [(f"bidder-{i % args.bidders}", float(i + 1)) for i in range(args.bids)]
+
+    def rehydrate() -> Auction:
+        auction = Auction(item_id="item", starting_price=0.0)
+        auction.restore_bids_lazily(len(rows), Bid(*rows[-1]), lambda: BidHistory.from_rows(rows))
+        auction.bids  # noqa: B018 (forces the load)
+        return auction
+
+    cases = {
+        "list of Bid with __dict__ (before)": lambda: [DictBid(bidder_id, amount) for bidder_id, amount in rows],
+        "list of slotted Bid": lambda: [Bid(bidder_id, amount) for bidder_id, amount in rows],
+        "BidHistory": lambda: BidHistory.from_rows(rows),
+        "Auction rehydrated with its history": rehydrate,
+        "BidPlaced with __dict__ (before)": lambda: [DictBidPlaced("auction", b, a, i, "2024-01-01") for i, (b, a) in enumerate(rows)],
+        "slotted BidPlaced": lambda: [BidPlaced("auction", b, a, i, "2024-01-01") for i, (b, a) in enumerate(rows)],
+    }
+
+    print(f"{args.bids} bids from {args.bidders} bidders (bidder id strings are shared with the input rows)")
+    for name, build in cases.items():
+        size, elapsed = measure(build)
+        print(f"  {name:<38} {size / args.bids:8.1f} bytes/bid {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
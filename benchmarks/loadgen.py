@@ -0,0 +1,331 @@
+"""
+Load generator for the running API: a weighted mix of listing auctions, polling single auctions and bid storms on a
+few hot auctions, over keep-alive connections.
+
+    PYTHONPATH=src python benchmarks/loadgen.py [--url http://localhost:8000] [--mode open|closed] [--rate 200]
+        [--duration 30] [--connections 16] [--mix list=1,poll=6,bid=3] [--hot 3] [--out load_results.json]
+
+or `make load LOAD_ARGS="..."`, with the server running (`PYTHONPATH=src python src/interface/api/main.py`).
+Open loop sends `--rate` requests per second, each on the next free connection, whether or not the server keeps up.
+Closed loop has every connection send its next request once the previous one is answered (and `--think` ms passed).
+
+Latency is reported twice: service time, from sending a request to reading its response, and corrected for
+coordinated omission, from when the request should have been sent. In open loop, that is its slot in the schedule.
+In closed loop with `--rate`, each connection is expected to send every `connections / rate` seconds, and a response
+that took longer is recorded along with the requests that would have been sent meanwhile, as HdrHistogram's
+`recordValueWithExpectedInterval` does. Either way a stalled server shows in the percentiles, not only in throughput.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import urlsplit
+
+from shared.application.metrics import DEFAULT_LATENCY_BUCKETS, Histogram, HistogramSnapshot
+
+# About 10% apart, from 50 microseconds to a minute: percentiles read from them are within 10% of the actual value
+BUCKETS = tuple(50e-6 * 1.1**i for i in range(int(math.log(60 / 50e-6, 1.1)) + 2))
+
+PERCENTILES = (50.0, 75.0, 90.0, 99.0, 99.9, 99.99, 100.0)
+
+OPERATIONS = ("list", "poll", "bid")
+
+
+class Client:
+    """One keep-alive connection, reopened after a transport error or when the server closes it."""
+
+    def __init__(self, host: str, port: int, timeout: float, headers: dict[str, str]):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.headers = headers
+        self._connection: http.client.HTTPConnection | None = None
+
+    def send(
+        self, method: str, path: str, body: dict[str, Any] | None = None, headers: dict[str, str] | None = None
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        """The response and its body, read to the end. Raises OSError or HTTPException if the request could not complete."""
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        all_headers = {**self.headers, **(headers or {})}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            all_headers["Content-Type"] = "application/json"
+        try:
+            self._connection.request(method, path, body=payload, headers=all_headers)
+            response = self._connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        return response, content
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class Stats:
+    """Statuses and both latency histograms of one operation."""
+
+    def __init__(self):
+        self.service = Histogram(BUCKETS)
+        self.corrected = Histogram(BUCKETS)
+        self.statuses: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, status: str, service: float, corrected: float, expected_interval: float | None = None):
+        self.service.observe(service)
+        self.corrected.observe(corrected)
+        if expected_interval:
+            # The requests this connection would have sent while waiting, each having waited that much less
+            missed = corrected - expected_interval
+            while missed >= expected_interval:
+                self.corrected.observe(missed)
+                missed -= expected_interval
+        with self._lock:
+            self.statuses[status] += 1
+
+
+def errors(statuses: Counter[str]) -> int:
+    """Requests that failed on the server (5xx) or never completed."""
+    return sum(count for status, count in statuses.items() if status == "error" or status.startswith("5"))
+
+
+class Traffic:
+    """What each request does: picks an operation by weight, and the auction it is about."""
+
+    def __init__(self, mix: dict[str, float], hot: list[str], polled: list[str], conditional: bool, page: int):
+        self.operations = [name for name in mix if mix[name] > 0]
+        self.weights = [mix[name] for name in self.operations]
+        self.hot = hot
+        self.polled = polled
+        self.conditional = conditional
+        self.page = page
+        # Bids only go up, so most are accepted; concurrent ones may still be outbid before they land (400)
+        self._amounts = itertools.count(2)
+
+    def run(self, client: Client, rng: random.Random, etags: dict[str, str]) -> tuple[str, str]:
+        """Sends one request; returns the operation and the response status (or "error")."""
+        operation = rng.choices(self.operations, self.weights)[0]
+        try:
+            if operation == "list":
+                response, _ = client.send("GET", f"/auctions?limit={self.page}")
+            elif operation == "poll":
+                auction_id = rng.choice(self.polled)
+                headers = {"If-None-Match": etags[auction_id]} if self.conditional and auction_id in etags else None
+                response, _ = client.send("GET", f"/auctions/{auction_id}", headers=headers)
+                etag = response.getheader("ETag")
+                if etag:
+                    etags[auction_id] = etag
+            else:
+                amount = next(self._amounts)
+                response, _ = client.send("POST", f"/auctions/{rng.choice(self.hot)}/bids", {"bidder_id": f"load-{amount % 97}", "amount": amount})
+        except (OSError, http.client.HTTPException):
+            return operation, "error"
+        except Exception:
+            # Anything else (e.g. a malformed response) still counts against the run rather than ending its worker
+            return operation, "error"
+        return operation, str(response.status)
+
+
+def prepare(client: Client, hot: int, poll_from: int) -> tuple[list[str], list[str]]:
+    """Creates the hot auctions; returns them and the auctions to poll (the first `poll_from` listed, and the hot ones)."""
+    hot_ids = []
+    for i in range(hot):
+        response, content = client.send("POST", "/auctions", {"item_id": f"load-hot-{i}", "starting_price": 1.0})
+        if response.status != 201:
+            raise SystemExit(f"Could not create a hot auction: {response.status} {content[:200]!r}")
+        hot_ids.append(json.loads(content)["id"])
+    response, content = client.send("GET", f"/auctions?limit={poll_from}")
+    listed = [auction["id"] for auction in json.loads(content)["items"]] if response.status == 200 else []
+    return hot_ids, list(dict.fromkeys(listed + hot_ids))
+
+
+def open_loop(traffic: Traffic, clients: list[Client], stats: dict[str, Stats], rate: float, duration: float) -> float:
+    """Sends `rate` requests per second for `duration` seconds; returns how long sending them took."""
+    total = int(rate * duration)
+    slots = itertools.count()
+    start = time.perf_counter() + 0.1
+
+    def worker(index: int):
+        client, rng, etags = clients[index], random.Random(index), {}
+        while (slot := next(slots)) < total:
+            intended = start + slot / rate
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            sent = time.perf_counter()
+            operation, status = traffic.run(client, rng, etags)
+            done = time.perf_counter()
+            stats[operation].record(status, done - sent, done - intended)
+
+    run_workers(worker, len(clients))
+    return time.perf_counter() - start
+
+
+def closed_loop(traffic: Traffic, clients: list[Client], stats: dict[str, Stats], rate: float | None, duration: float, think: float) -> float:
+    """Every connection sends requests back to back for `duration` seconds; returns how long that took."""
+    expected_interval = len(clients) / rate if rate else None
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def worker(index: int):
+        client, rng, etags = clients[index], random.Random(index), {}
+        while time.perf_counter() < deadline:
+            sent = time.perf_counter()
+            operation, status = traffic.run(client, rng, etags)
+            latency = time.perf_counter() - sent
+            stats[operation].record(status, latency, latency, expected_interval)
+            if think:
+                time.sleep(think)
+
+    run_workers(worker, len(clients))
+    return time.perf_counter() - start
+
+
+def run_workers(worker: Callable[[int], None], count: int):
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def merge(snapshots: list[HistogramSnapshot]) -> HistogramSnapshot:
+    counts = tuple(map(sum, zip(*(snapshot.counts for snapshot in snapshots), strict=True)))
+    return HistogramSnapshot(BUCKETS, counts, sum(s.count for s in snapshots), sum(s.sum for s in snapshots))
+
+
+def summary(latency: HistogramSnapshot) -> dict[str, Any]:
+    return {
+        "count": latency.count,
+        "mean_ms": round(latency.mean * 1000, 3),
+        "percentiles_ms": {str(p): round(latency.percentile(p) * 1000, 3) for p in PERCENTILES},
+        # Non-empty buckets, by upper bound in milliseconds ("inf" for slower than a minute)
+        "buckets_ms": {f"{bound * 1000:.3f}": n for bound, n in zip((*BUCKETS, float("inf")), latency.counts, strict=True) if n},
+    }
+
+
+def report(stats: dict[str, Stats], elapsed: float) -> dict[str, Any]:
+    """Prints throughput, statuses and latency percentiles per operation; returns the same as a dict."""
+    results: dict[str, Any] = {}
+    rows = [(name, s.statuses, s.service.snapshot(), s.corrected.snapshot()) for name, s in stats.items() if s.statuses]
+    if not rows:
+        print("\nno requests were sent")
+        return results
+    total: Counter[str] = sum((statuses for _, statuses, _, _ in rows), Counter())
+    rows.append(("all", total, merge([row[2] for row in rows]), merge([row[3] for row in rows])))
+
+    print(f"\n{'':<6} {'requests':>9} {'req/s':>9} {'errors':>7}  statuses")
+    for name, statuses, service, corrected in rows:
+        requests = sum(statuses.values())
+        failed = errors(statuses)
+        codes = " ".join(f"{status}:{n}" for status, n in sorted(statuses.items()))
+        print(f"{name:<6} {requests:>9} {requests / elapsed:>9,.1f} {failed / requests:>7.2%}  {codes}")
+        results[name] = {
+            "requests": requests,
+            "throughput": round(requests / elapsed, 3),
+            "errors": failed,
+            "error_rate": round(failed / requests, 6),
+            "statuses": dict(statuses),
+            "service": summary(service),
+            "corrected": summary(corrected),
+        }
+
+    print(f"\n{'latency (ms)':<17}" + "".join(f"{'max' if p == 100 else f'p{p:g}':>10}" for p in PERCENTILES))
+    for name, _, service, corrected in rows:
+        for kind, latency in (("service", service), ("corrected", corrected)):
+            print(f"{name + ' ' + kind:<17}" + "".join(f"{latency.percentile(p) * 1000:>10.2f}" for p in PERCENTILES))
+
+    # Corrected latency of every request, over coarser buckets
+    _, _, _, corrected = rows[-1]
+    print("\ncorrected latency of all requests")
+    bounds = (*DEFAULT_LATENCY_BUCKETS, float("inf"))
+    counts = [0] * len(bounds)
+    for bound, n in zip((*BUCKETS, float("inf")), corrected.counts, strict=True):
+        counts[next(i for i, upper in enumerate(bounds) if bound <= upper)] += n
+    widest = max(counts) or 1
+    used = [i for i, n in enumerate(counts) if n]
+    for upper, n in list(zip(bounds, counts, strict=True))[used[0] : used[-1] + 1]:
+        print(f"  <= {upper * 1000:>8g} ms {n:>9}  {'#' * round(40 * n / widest)}")
+    return results
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}, expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"negative weight for {name!r}")
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--mode", choices=("open", "closed"), default="open")
+    parser.add_argument("--rate", type=float, help="requests per second: the schedule in open loop, the expected pace in closed loop")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--think", type=float, default=0.0, help="closed loop: milliseconds between a response and the next request")
+    parser.add_argument("--mix", type=parse_mix, default="list=1,poll=6,bid=3", help="operation weights")
+    parser.add_argument("--hot", type=int, default=3, help="auctions created for the bid storm")
+    parser.add_argument("--poll-from", type=int, default=100, help="existing auctions to poll, besides the hot ones")
+    parser.add_argument("--page", type=int, default=50, help="auctions per list request")
+    parser.add_argument("--conditional", action="store_true", help="polls send If-None-Match with the last ETag seen")
+    parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds")
+    parser.add_argument("--out", help="where to write the results as JSON")
+    args = parser.parse_args()
+    if args.mode == "open" and not args.rate:
+        parser.error("open loop needs --rate")
+    if not any(args.mix.values()):
+        parser.error("--mix needs an operation with a weight above 0")
+    if args.mix.get("bid") and args.hot < 1:
+        parser.error("bids need at least one --hot auction")
+
+    url = urlsplit(args.url)
+    headers = {"Accept-Encoding": "gzip"} if args.gzip else {}
+    clients = [Client(url.hostname, url.port or 80, args.timeout, headers) for _ in range(args.connections)]
+    setup = Client(url.hostname, url.port or 80, args.timeout, {})
+    hot, polled = prepare(setup, args.hot, args.poll_from)
+    setup.close()
+    if args.mix.get("poll") and not polled:
+        parser.error("no auctions to poll: create some, or use --hot")
+    traffic = Traffic(args.mix, hot, polled, args.conditional, args.page)
+    stats = {operation: Stats() for operation in OPERATIONS}
+
+    pace = f"{args.rate:g} req/s" if args.rate else "unpaced"
+    print(f"{args.mode} loop, {pace}, {args.connections} connections, {args.duration:g}s against {args.url}")
+    print(f"mix {args.mix}, {len(hot)} hot auctions, {len(polled)} polled")
+    if args.mode == "open":
+        elapsed = open_loop(traffic, clients, stats, args.rate, args.duration)
+    else:
+        elapsed = closed_loop(traffic, clients, stats, args.rate, args.duration, args.think / 1000)
+    for client in clients:
+        client.close()
+
+    results = report(stats, elapsed)
+    if args.out:
+        meta = {key: value for key, value in vars(args).items() if key != "out"}
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": {**meta, "elapsed": round(elapsed, 3)}, "results": results}, f, indent=2)
+        print(f"\nresults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
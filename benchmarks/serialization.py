@@ -0,0 +1,87 @@
+"""
+Throughput of encoding a page of auctions with their links, and the constant GET / body.
+
+    PYTHONPATH=src python benchmarks/serialization.py [--page 500] [--pages 200]
+
+"before" builds the `_links` dict of every auction and encodes the whole page with `json.dumps`, as the
+controllers used to. Every variant must produce the same bytes for the same backend.
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from interface.api.routes import ROOT_DOCUMENT, encode_body
+from module.auction.interface.api.serializer import AuctionSerializer, auction_links
+from shared.interface.api.json_backend import STDLIB_JSON, select_json_backend
+from shared.interface.api.json_stream import JSONStream
+
+
+def rows(count: int) -> list[dict[str, Any]]:
+    """Auctions as the summary read model returns them."""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "item_id": f"item-{i}",
+            "starting_price": 10.0 + i,
+            "is_active": True,
+            "current_price": 12.5 + i,
+            "bid_count": i % 7,
+            "highest_bidder": f"bidder-{i}",
+            "last_bid_at": "2024-01-01 00:00:00.000000+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(encode: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+    """Seconds per call, and what the call returns."""
+    body = encode()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encode()
+    return (time.perf_counter() - started) / repeat, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    page = rows(args.page)
+    tail = {"_links": {"self": {"href": f"/auctions?limit={args.page}&sort=id", "method": "GET"}}}
+
+    def before() -> bytes:
+        items = ({**auction, "_links": auction_links(auction["id"])} for auction in page)
+        return b"".join(JSONStream(items, tail=lambda: tail, encode_item=lambda item: json.dumps(item).encode("utf-8")).chunks())
+
+    def precompiled(backend) -> Callable[[], bytes]:
+        serializer = AuctionSerializer(backend)
+        return lambda: b"".join(JSONStream(page, tail=lambda: tail, backend=backend, encode_item=serializer.encode).chunks())
+
+    cases = {"dicts + json.dumps (before)": before, "precompiled, stdlib": precompiled(STDLIB_JSON)}
+    backend = select_json_backend("auto")
+    if backend.name != "stdlib":
+        cases[f"precompiled, {backend.name}"] = precompiled(backend)
+
+    print(f"{args.page} auctions per page, {args.pages} pages")
+    baseline, expected = None, None
+    for name, encode in cases.items():
+        elapsed, body = timed(encode, args.pages)
+        baseline, expected = baseline or elapsed, expected or body
+        same = "identical" if body == expected else "differs (other backend)"
+        print(f"  {name:<28} {args.page / elapsed:>12,.0f} auctions/s {elapsed * 1000:7.2f} ms/page  x{baseline / elapsed:4.2f}  {same}")
+
+    repeat = args.pages * 100
+    dumped, expected = timed(lambda: json.dumps(ROOT_DOCUMENT.value).encode("utf-8"), repeat)
+    static, body = timed(lambda: encode_body(ROOT_DOCUMENT), repeat)
+    assert body == expected
+    print(f"  GET / body: json.dumps {dumped * 1e6:.2f} us, pre-encoded {static * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Throughput and p50/p99 latency of the command and query paths, single-threaded and with N threads.
+
+    PYTHONPATH=src python benchmarks/suite.py [--auctions 200] [--bids 20] [--ops 500] [--threads 1,4]
+        [--out bench_results.json] [--baseline benchmarks/baseline.json] [--tolerance 0.15]
+
+or `make bench`, `make bench-baseline` and `make bench-compare` (extra arguments in BENCH_ARGS).
+Requests go through RouteTable.dispatch, so routing, controllers, buses, units of work and SQLite, without the
+HTTP server, against a database seeded with `--auctions` auctions of `--bids` bids each. Log output is switched off.
+Results are written as JSON; with `--baseline`, every scenario is compared with the saved run, and the exit status
+is 1 if the throughput of any of them dropped by more than `--tolerance`.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from interface.api.bootstrap import bootstrap_dependencies
+from interface.api.routes import RouteTable, encode_body
+from module.auction.interface.api.auction_controller import AuctionController
+from module.auction.interface.api.batch import MAX_BATCH_SIZE
+from module.auction.interface.api.bid_controller import BidController
+from shared.interface.api.json_backend import select_json_backend
+
+SCENARIOS = ("create_auction", "place_bid", "get_auction", "list_auctions", "list_bids")
+
+
+@dataclass
+class Dataset:
+    auction_ids: list[str]
+    # The amount that outbids each auction's highest bid; place_bid threads bid on disjoint auctions, so never clash
+    next_amount: dict[str, float]
+
+
+def request(routes: RouteTable, method: str, target: str, body: dict[str, Any] | None = None) -> bytes:
+    """The response body, encoded as the servers would send it. Raises RuntimeError unless the request succeeded."""
+    raw = json.dumps(body).encode("utf-8") if body is not None else b""
+    status, data, _ = routes.dispatch(method, target, "application/json" if body is not None else None, raw)
+    payload = encode_body(data, "application/json", routes.json_backend)
+    if status >= 300:
+        raise RuntimeError(f"{method} {target} answered {status}: {payload[:200]!r}")
+    return payload
+
+
+def build(db_path: str, args: argparse.Namespace):
+    container = bootstrap_dependencies(
+        db_path,
+        async_events=args.async_events,
+        read_cache=args.read_cache,
+        group_commit=args.group_commit,
+        aggregate_cache=args.aggregate_cache,
+    )
+    backend = select_json_backend(args.json_backend)
+    auction_ctrl = AuctionController(container.query_bus, container.uow_factory, container.event_bus, db_path, json_backend=backend)
+    bid_ctrl = BidController(
+        container.query_bus,
+        container.uow_factory,
+        container.event_bus,
+        db_path,
+        bid_writer=container.bid_writer,
+        retry_policy=container.bid_retry_policy,
+        lanes=container.bid_lanes,
+        json_backend=backend,
+    )
+    return container, RouteTable(auction_ctrl, bid_ctrl, backend)
+
+
+def seed(routes: RouteTable, auctions: int, bids: int) -> Dataset:
+    """Creates the auctions and their bids through the batch endpoints, a thousand per transaction."""
+    auction_ids: list[str] = []
+    for start in range(0, auctions, MAX_BATCH_SIZE):
+        items = [{"item_id": f"item-{i}", "starting_price": 10.0} for i in range(start, min(auctions, start + MAX_BATCH_SIZE))]
+        response = json.loads(request(routes, "POST", "/auctions/batch", {"items": items}))
+        auction_ids += [item["id"] for item in response["items"]]
+
+    placed = [{"auction_id": auction_id, "bidder_id": f"bidder-{n % 10}", "amount": 11.0 + n} for n in range(bids) for auction_id in auction_ids]
+    for start in range(0, len(placed), MAX_BATCH_SIZE):
+        response = json.loads(request(routes, "POST", "/bids/batch", {"items": placed[start : start + MAX_BATCH_SIZE]}))
+        if response["failed"]:
+            raise RuntimeError(f"Seeding bids failed: {response['items'][0]}")
+    return Dataset(auction_ids, dict.fromkeys(auction_ids, 11.0 + bids))
+
+
+def operation(scenario: str, routes: RouteTable, dataset: Dataset, thread: int, threads: int) -> Callable[[int], Any]:
+    """What thread `thread` of `threads` does for its i-th request of the scenario."""
+    auction_ids = dataset.auction_ids
+    rng = random.Random(thread)
+    if scenario == "create_auction":
+        return lambda i: request(routes, "POST", "/auctions", {"item_id": f"bench-{thread}-{i}", "starting_price": 10.0})
+    if scenario == "place_bid":
+        own = auction_ids[thread::threads]
+
+        def place_bid(i: int):
+            auction_id = own[i % len(own)]
+            amount = dataset.next_amount[auction_id]
+            dataset.next_amount[auction_id] = amount + 1
+            request(routes, "POST", f"/auctions/{auction_id}/bids", {"bidder_id": f"bidder-{thread}", "amount": amount})
+
+        return place_bid
+    if scenario == "get_auction":
+        return lambda i: request(routes, "GET", f"/auctions/{rng.choice(auction_ids)}")
+    if scenario == "list_auctions":
+        return lambda i: request(routes, "GET", "/auctions?limit=50")
+    if scenario == "list_bids":
+        return lambda i: request(routes, "GET", f"/auctions/{rng.choice(auction_ids)}/bids")
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+def run(scenario: str, routes: RouteTable, dataset: Dataset, ops: int, threads: int, warmup: int) -> dict[str, Any]:
+    """Runs `ops` requests spread over `threads` threads, after `warmup` unmeasured ones."""
+    operations = [operation(scenario, routes, dataset, thread, threads) for thread in range(threads)]
+    for i in range(warmup):
+        operations[0](ops + i)
+
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+    errors: list[str] = []
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(thread: int):
+        op, samples = operations[thread], latencies[thread]
+        barrier.wait()
+        for i in range(thread, ops, threads):
+            started = time.perf_counter()
+            try:
+                op(i)
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            samples.append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=worker, args=(thread,)) for thread in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(sample for samples in latencies for sample in samples)
+    return {
+        "scenario": scenario,
+        "threads": threads,
+        "ops": len(ordered),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": round(elapsed, 6),
+        "throughput": round(len(ordered) / elapsed, 3) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4) if ordered else 0.0,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> bool:
+    """Prints every scenario against the baseline. True if any throughput dropped by more than `tolerance`."""
+    if baseline["meta"]["dataset"] != results["meta"]["dataset"]:
+        print(f"  warning: baseline dataset {baseline['meta']['dataset']} differs from {results['meta']['dataset']}")
+    saved = {(r["scenario"], r["threads"]): r for r in baseline["results"]}
+    regressed = False
+    print(f"\nagainst {baseline['meta']['created_at']} (tolerance {tolerance:.0%})")
+    for result in results["results"]:
+        before = saved.get((result["scenario"], result["threads"]))
+        if before is None or not before["throughput"] or not before["p99_ms"]:
+            print(f"  {result['scenario']:<15} x{result['threads']:<3} not in the baseline")
+            continue
+        throughput = result["throughput"] / before["throughput"] - 1
+        p99 = result["p99_ms"] / before["p99_ms"] - 1
+        worse = throughput < -tolerance
+        regressed = regressed or worse
+        verdict = "REGRESSED" if worse else "ok"
+        print(f"  {result['scenario']:<15} x{result['threads']:<3} throughput {throughput:+7.1%}  p99 {p99:+7.1%}  {verdict}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--auctions", type=int, default=200, help="auctions to seed")
+    parser.add_argument("--bids", type=int, default=20, help="bids to seed per auction")
+    parser.add_argument("--ops", type=int, default=500, help="measured requests per scenario and thread count")
+    parser.add_argument("--threads", default="1,4", help="comma-separated thread counts to run every scenario with")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--out", default="bench_results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="throughput drop tolerated against the baseline")
+    parser.add_argument("--json-backend", default="stdlib")
+    parser.add_argument("--async-events", action="store_true")
+    parser.add_argument("--read-cache", action="store_true")
+    parser.add_argument("--group-commit", action="store_true")
+    parser.add_argument("--aggregate-cache", action="store_true")
+    args = parser.parse_args()
+
+    thread_counts = [int(n) for n in args.threads.split(",")]
+    scenarios = args.scenarios.split(",")
+    if args.auctions < max(thread_counts):
+        parser.error("--auctions must be at least the largest thread count, so bidding threads get auctions of their own")
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as directory:
+        container, routes = build(os.path.join(directory, "bench.db"), args)
+        try:
+            started = time.perf_counter()
+            dataset = seed(routes, args.auctions, args.bids)
+            print(f"seeded {args.auctions} auctions x {args.bids} bids in {time.perf_counter() - started:.1f}s")
+            results = []
+            for scenario in scenarios:
+                for threads in thread_counts:
+                    result = run(scenario, routes, dataset, args.ops, threads, warmup=max(1, args.ops // 10))
+                    results.append(result)
+                    print(
+                        f"  {scenario:<15} x{threads:<3} {result['throughput']:>10,.0f} req/s"
+                        f"  p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms  errors {result['errors']}"
+                    )
+        finally:
+            container.close()
+
+    output = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "dataset": {"auctions": args.auctions, "bids": args.bids},
+            "ops": args.ops,
+            "options": {
+                "json_backend": args.json_backend,
+                "async_events": args.async_events,
+                "read_cache": args.read_cache,
+                "group_commit": args.group_commit,
+                "aggregate_cache": args.aggregate_cache,
+            },
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(output, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import signal
+import socket
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any
+
+from interface.api.routes import RouteTable, encode_body
+from shared.interface.api.json_stream import ChunkedBody, chunked
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+SUPPORTED_METHODS = ("GET", "POST")
+
+
+class HTTPError(Exception):
+    """A malformed or unsupported request; answered with `status` and the connection is closed."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncHTTPServer:
+    """
+    Asyncio HTTP/1.1 front-end for the same RouteTable the threaded server uses.
+    Every connection is a coroutine, so idle keep-alive connections cost no thread.
+    Controllers (blocking SQLite work) run on a bounded thread pool.
+    Pipelined requests are answered in order, one at a time per connection.
+    SIGTERM stops it gracefully: no new connections, keep-alive connections are closed after their request in
+    progress, which it waits for up to `drain_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        routes: RouteTable,
+        host: str = "",
+        port: int = 8000,
+        workers: int = 8,
+        keep_alive_timeout: float = 75.0,
+        drain_timeout: float = 30.0,
+    ):
+        self.routes = routes
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self.drain_timeout = drain_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="controller")
+        self.draining = False
+        self._active = 0
+
+    async def serve_forever(self, sock: socket.socket | None = None, ready: Callable[[], None] | None = None):
+        """Serves on `port`, or on the already listening `sock` (from the pre-fork supervisor), until SIGTERM."""
+        if sock is None:
+            server = await asyncio.start_server(self._handle_connection, self.host or None, self.port, limit=MAX_HEADER_BYTES, backlog=1024)
+        else:
+            server = await asyncio.start_server(self._handle_connection, sock=sock, limit=MAX_HEADER_BYTES)
+        stopping = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+        logger.info(f"🚀 Async server starting on http://localhost:{self.port}")
+        if ready:
+            ready()
+        try:
+            await stopping.wait()
+            server.close()
+            if not await self.drain(self.drain_timeout):
+                logger.warning(f"⏱️ Requests still in progress after {self.drain_timeout:g}s; stopping anyway.")
+        finally:
+            server.close()
+            self.executor.shutdown(wait=True)
+
+    async def drain(self, timeout: float) -> bool:
+        """Waits up to `timeout` seconds for the requests in progress; from now on, connections close after their response."""
+        self.draining = True
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self._active and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+        return not self._active
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader, writer), timeout=self.keep_alive_timeout)
+                except (TimeoutError, asyncio.IncompleteReadError):
+                    # Idle timeout or the client closed the connection between requests
+                    return
+                except HTTPError as e:
+                    await self._write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+
+                method, target, headers, body, keep_alive, accepts_chunked = request
+                self._active += 1
+                try:
+                    status, data, response_headers = await loop.run_in_executor(
+                        self.executor, self.routes.dispatch, method, target, headers.get("content-type"), body, headers
+                    )
+                    # Stopping: this is the connection's last response
+                    keep_alive = keep_alive and not self.draining
+                    content_type = response_headers.pop("Content-Type", "application/json")
+                    if isinstance(data, ChunkedBody) and accepts_chunked:
+                        if not await self._write_stream(writer, status, data, keep_alive, content_type, response_headers):
+                            return
+                    else:
+                        if isinstance(data, ChunkedBody):
+                            # The client cannot take a chunked response: encode it whole, off the event loop
+                            data = await loop.run_in_executor(self.executor, encode_body, data, "application/json", self.routes.json_backend)
+                        await self._write_response(writer, status, data, keep_alive, content_type, response_headers)
+                finally:
+                    self._active -= 1
+                logger.debug(f'"{method} {target}" {status}')
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.LimitOverrunError):
+            return
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> tuple[str, str, dict[str, str], bytes, bool, bool] | None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise HTTPError(400, "Incomplete request") from e
+        except asyncio.LimitOverrunError as e:
+            raise HTTPError(431, "Request header fields too large") from e
+
+        request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+        try:
+            method, target, version = request_line.split(" ")
+        except ValueError as e:
+            raise HTTPError(400, f"Bad request line: {request_line!r}") from e
+        if method not in SUPPORTED_METHODS:
+            raise HTTPError(501, f"Unsupported method ({method!r})")
+
+        headers: dict[str, str] = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        if "transfer-encoding" in headers:
+            raise HTTPError(501, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError as e:
+            raise HTTPError(400, "Invalid Content-Length") from e
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+
+        body = b""
+        if length:
+            if headers.get("expect", "").lower() == "100-continue":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                await writer.drain()
+            body = await reader.readexactly(length)
+
+        return method, target, headers, body, keep_alive, version == "HTTP/1.1"
+
+    async def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        data: Any,
+        keep_alive: bool,
+        content_type: str = "application/json",
+        headers: dict[str, str] | None = None,
+    ):
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        if status == 304:
+            # No body, and no Content-Length: it would describe the representation the client already has
+            payload = b""
+            representation = ""
+        else:
+            payload = encode_body(data, content_type, self.routes.json_backend)
+            representation = f"Content-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n"
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n{extra}{representation}Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _write_stream(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        stream: ChunkedBody,
+        keep_alive: bool,
+        content_type: str = "application/json",
+        headers: dict[str, str] | None = None,
+    ) -> bool:
+        """
+        Writes the body chunked as it is encoded. Producing it runs queries, so each chunk is made on the
+        worker pool. Returns False if the response had to be cut short.
+        """
+        loop = asyncio.get_running_loop()
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"{extra}"
+            f"Content-Type: {content_type}\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1"))
+        frames = chunked(stream.chunks())
+        try:
+            while (frame := await loop.run_in_executor(self.executor, next, frames, None)) is not None:
+                writer.write(frame)
+                await writer.drain()
+            return True
+        except ConnectionError:
+            return False
+        except Exception:
+            # The status line is already out: all that is left is to cut the response short
+            logger.exception("Streaming the response failed")
+            return False
+        finally:
+            await loop.run_in_executor(self.executor, stream.close)
+
+
+def run_async_server(
+    port: int = 8000,
+    workers: int = 8,
+    sock: socket.socket | None = None,
+    ready: Callable[[], None] | None = None,
+    drain_timeout: float = 30.0,
+):
+    # Imported here: importing the router bootstraps the application
+    from interface.api.router import Router
+
+    server = AsyncHTTPServer(Router.routes, port=port, workers=workers, drain_timeout=drain_timeout)
+    try:
+        asyncio.run(server.serve_forever(sock, ready))
+    finally:
+        Router.container.close()
@@ -1,37 +1,159 @@
 import sqlite3
+from collections.abc import Callable
+from contextlib import closing
+from dataclasses import dataclass
+from functools import partial
 
+from module.auction.application.command import PlaceBidCommand, RebuildAuctionSummaryCommand
+from module.auction.application.command_handler import PlaceBidHandler, RebuildAuctionSummaryHandler
 from module.auction.application.event_handler import send_email_to_bidder, update_analytics
-from module.auction.application.query import GetAuctionQuery, ListAuctionsQuery, ListBidsQuery
+from module.auction.application.query import (
+    GetAuctionListVersionQuery,
+    GetAuctionQuery,
+    GetAuctionVersionQuery,
+    ListAuctionsQuery,
+    ListBidsQuery,
+)
 from module.auction.application.query_handler import (
     GetAuctionHandler,
+    GetAuctionListVersionHandler,
+    GetAuctionVersionHandler,
     ListAuctionsHandler,
     ListBidsHandler,
 )
-from module.auction.domain.event import BidPlaced
+from module.auction.application.read_repository import AuctionReadRepository
+from module.auction.application.unit_of_work import AuctionUnitOfWork
+from module.auction.domain.event import AuctionCreated, BidPlaced
+from module.auction.infrastructure.auction_aggregate_cache import AuctionAggregateCache
+from module.auction.infrastructure.cached_auction_read_repository import CachedAuctionReadRepository
 from module.auction.infrastructure.sqlite_auction_read_repository import SQLiteAuctionReadRepository
+from module.auction.infrastructure.sqlite_auction_summary_projection import SQLiteAuctionSummaryProjection
+from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
 from module.auction.infrastructure.sqlite_auction_write_repository import SQLiteAuctionWriteRepository
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool, SQLitePragmas
+from module.auction.infrastructure.sqlite_event_sourced_auction_repository import SQLiteEventSourcedAuctionRepository
+from module.auction.infrastructure.sqlite_outbox import OutboxRelay, SQLiteOutbox
+from shared.application.async_event_bus import AsyncEventBus
 from shared.application.command_bus import CommandBus
 from shared.application.event_bus import EventBus
+from shared.application.group_commit import GroupCommitWriter
+from shared.application.metrics import MetricsRegistry
 from shared.application.query_bus import QueryBus
+from shared.application.retry import RetryPolicy
+from shared.application.serial_lanes import SerialLanes
+
+
+@dataclass
+class Container:
+    """The wired application: buses, the per-request UoW factory and the resources to release on shutdown."""
 
+    event_bus: EventBus
+    command_bus: CommandBus
+    query_bus: QueryBus
+    # Called as uow_factory(event_bus, db_path=...) by the controllers
+    uow_factory: Callable[..., AuctionUnitOfWork]
+    write_pool: SQLiteConnectionPool
+    read_pool: SQLiteConnectionPool
+    projection_pool: SQLiteConnectionPool
+    outbox_relay: OutboxRelay | None = None
+    # Retries bids that hit an optimistic concurrency conflict; its stats give the conflict rate
+    bid_retry_policy: RetryPolicy | None = None
+    # Set when bids are written through group commit
+    bid_writer: GroupCommitWriter | None = None
+    # Set when committed auctions are kept in memory for the write side, with bids serialized per auction
+    aggregate_cache: AuctionAggregateCache | None = None
+    bid_lanes: SerialLanes | None = None
+    # Set when the buses, units of work and SQLite connections record metrics
+    metrics: MetricsRegistry | None = None
 
-def bootstrap_dependencies(db_path: str = "auctions.db") -> tuple[EventBus, CommandBus, QueryBus]:
+    def close(self):
+        # Apply queued bids, deliver what is left in the outbox, then drain queued events before the connections go away
+        if self.bid_writer:
+            self.bid_writer.stop(timeout=10.0)
+        if self.outbox_relay:
+            self.outbox_relay.stop(timeout=10.0)
+        self.event_bus.shutdown(timeout=10.0)
+        self.write_pool.close()
+        self.read_pool.close()
+        self.projection_pool.close()
+
+
+def bootstrap_dependencies(
+    db_path: str = "auctions.db",
+    write_pool_size: int = 4,
+    read_pool_size: int = 8,
+    pragmas: SQLitePragmas | None = None,
+    async_events: bool = False,
+    event_workers: int = 1,
+    event_queue_size: int = 1000,
+    use_outbox: bool = False,
+    outbox_batch_size: int = 100,
+    outbox_poll_interval: float = 0.5,
+    read_cache: bool = False,
+    read_cache_max_entries: int = 10_000,
+    read_cache_max_bytes: int = 64 * 1024 * 1024,
+    read_cache_ttl: float | None = None,
+    group_commit: bool = False,
+    group_commit_max_batch_size: int = 64,
+    group_commit_max_wait: float = 0.002,
+    bid_max_attempts: int = 5,
+    aggregate_cache: bool = False,
+    aggregate_cache_max_entries: int = 10_000,
+    serial_lanes: int = 64,
+    event_sourcing: bool = False,
+    snapshot_every: int = 20,
+    metrics: MetricsRegistry | None = None,
+    trace_sql: bool = False,
+) -> Container:
     """
     Sets up the dependency injection container and wires the application.
-    Returns the event, command, and query buses ready for use.
+    Returns the container holding the event, command, and query buses ready for use.
+    With `trace_sql`, pool checkouts, SQL statements and commits are recorded as spans of traced requests.
     """
+    pragmas = pragmas or SQLitePragmas()
+
     # Ensure DB tables exist
-    with sqlite3.connect(db_path) as conn:
-        # Just instantiating the repo creates the table if it doesn't exist
-        SQLiteAuctionWriteRepository(conn)
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        # WAL is persistent, so readers never block the writer from here on
+        conn.execute(f"PRAGMA journal_mode={pragmas.journal_mode}")
+        # Creates the tables, and migrates older databases once here rather than in every unit of work
+        if event_sourcing:
+            SQLiteEventSourcedAuctionRepository.create_schema(conn)
+        else:
+            SQLiteAuctionWriteRepository.create_schema(conn)
+        outbox = SQLiteOutbox([AuctionCreated, BidPlaced])
+        outbox.create_schema(conn)
+        # Read model: whatever it lacks is derived from the write side, all of it the first time (or after it was dropped),
+        # and any auction a failed apply left missing or behind otherwise
+        SQLiteAuctionSummaryProjection.create_schema(conn)
+        SQLiteAuctionSummaryProjection.catch_up_on(conn, event_sourcing)
 
-    event_bus = EventBus()
-    command_bus = CommandBus()
-    query_bus = QueryBus()
+    # Async dispatch runs subscribers on their own worker threads, off the request path
+    event_bus = (
+        AsyncEventBus(queue_size=event_queue_size, workers_per_subscriber=event_workers, metrics=metrics) if async_events else EventBus(metrics)
+    )
+    command_bus = CommandBus(metrics)
+    query_bus = QueryBus(metrics)
 
     # INFRASTRUCTURE
+    # Long-lived connections: one pool for the UoW (write side), a read-only one for queries
+    write_pool = SQLiteConnectionPool(db_path, size=write_pool_size, pragmas=pragmas, name="write", metrics=metrics, traced=trace_sql)
+    read_pool = SQLiteConnectionPool(db_path, size=read_pool_size, read_only=True, pragmas=pragmas, name="read", metrics=metrics, traced=trace_sql)
+
+    # Projection (Read Side) - keeps auction_summary up to date from the events of each write
+    # Its own connections: with sync dispatch it runs while the committing UoW still holds a write-pool connection,
+    # so sharing that pool would let a burst of writers exhaust it and wait on each other
+    projection_pool = SQLiteConnectionPool(db_path, size=2, pragmas=pragmas, name="projection", metrics=metrics, traced=trace_sql)
+    projection = SQLiteAuctionSummaryProjection(projection_pool, event_sourced=event_sourcing, metrics=metrics)
+    projection.subscribe(event_bus)
+
     # Read Repo (Read Side) - Singleton-ish (stateless)
-    read_repo = SQLiteAuctionReadRepository(db_path)
+    read_repo: AuctionReadRepository = SQLiteAuctionReadRepository(db_path, pool=read_pool, event_sourced=event_sourcing)
+    if read_cache:
+        # LRU in front of SQLite, invalidated once the projection has applied each event
+        cached_repo = CachedAuctionReadRepository(read_repo, read_cache_max_entries, read_cache_max_bytes, read_cache_ttl, metrics=metrics)
+        projection.on_applied.append(cached_repo.on_event)
+        read_repo = cached_repo
 
     # Wiring: Register Event Listeners
     event_bus.subscribe(BidPlaced, send_email_to_bidder)
@@ -41,9 +163,69 @@ def bootstrap_dependencies(db_path: str = "auctions.db") -> tuple[EventBus, Comm
     query_bus.register(GetAuctionQuery, GetAuctionHandler(read_repo))
     query_bus.register(ListAuctionsQuery, ListAuctionsHandler(read_repo))
     query_bus.register(ListBidsQuery, ListBidsHandler(read_repo))
+    query_bus.register(GetAuctionVersionQuery, GetAuctionVersionHandler(read_repo))
+    query_bus.register(GetAuctionListVersionQuery, GetAuctionListVersionHandler(read_repo))
 
     # Wiring: Register Command Handlers
-    # Note: UoW is created per-request inside the actual execution flow (main.py),
-    # so we don't register instances here for commands yet in this simple example.
+    command_bus.register(RebuildAuctionSummaryCommand, RebuildAuctionSummaryHandler(projection))
+    # Note: UoW is created per-request inside the actual execution flow (the controllers),
+    # so we only hand out a factory that borrows connections from the write pool.
+    # With the outbox, events are written in the UoW transaction and a relay publishes them.
+    # With the aggregate cache, hot auctions are validated in memory and only the delta is written.
+    # With event sourcing, auctions are stored as event streams with periodic snapshots instead of state rows.
+    outbox_relay = None
+    repository_factory = (
+        partial(SQLiteEventSourcedAuctionRepository, snapshot_every=snapshot_every) if event_sourcing else SQLiteAuctionWriteRepository
+    )
+    auction_cache = AuctionAggregateCache(aggregate_cache_max_entries, metrics=metrics) if aggregate_cache else None
+    bid_lanes = SerialLanes(serial_lanes) if aggregate_cache else None
+    if use_outbox:
+        uow_factory = partial(
+            SQLiteAuctionUnitOfWork,
+            pool=write_pool,
+            outbox=outbox,
+            aggregate_cache=auction_cache,
+            repository_factory=repository_factory,
+            metrics=metrics,
+        )
+        outbox_relay = OutboxRelay(outbox, write_pool, event_bus, batch_size=outbox_batch_size, poll_interval=outbox_poll_interval).start()
+    else:
+        uow_factory = partial(
+            SQLiteAuctionUnitOfWork, pool=write_pool, aggregate_cache=auction_cache, repository_factory=repository_factory, metrics=metrics
+        )
+
+    # Optimistic concurrency: a bid that lost a race is retried against the fresh auction, with jittered backoff
+    bid_retry_policy = RetryPolicy(max_attempts=bid_max_attempts, name="bid", metrics=metrics)
+
+    # Group commit: concurrent bids are applied by a single writer, many per transaction
+    bid_writer = None
+    if group_commit:
+
+        def bid_command_bus(uow: AuctionUnitOfWork) -> CommandBus:
+            bus = CommandBus(metrics)
+            bus.register(PlaceBidCommand, PlaceBidHandler(uow, bid_retry_policy))
+            return bus
+
+        bid_writer = GroupCommitWriter(
+            partial(uow_factory, event_bus),
+            bid_command_bus,
+            max_batch_size=group_commit_max_batch_size,
+            max_wait=group_commit_max_wait,
+            metrics=metrics,
+        ).start()
 
-    return event_bus, command_bus, query_bus
+    return Container(
+        event_bus=event_bus,
+        command_bus=command_bus,
+        query_bus=query_bus,
+        uow_factory=uow_factory,
+        write_pool=write_pool,
+        read_pool=read_pool,
+        projection_pool=projection_pool,
+        outbox_relay=outbox_relay,
+        bid_retry_policy=bid_retry_policy,
+        bid_writer=bid_writer,
+        aggregate_cache=auction_cache,
+        bid_lanes=bid_lanes,
+        metrics=metrics,
+    )
@@ -1,13 +1,101 @@
+import argparse
 import logging
+import os
+import socket
+from collections.abc import Callable
 
-from interface.api.server import run_server
+from interface.api.prefork import PreforkSupervisor
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Options keeping state in the server process that other processes would need to see
+PROCESS_LOCAL_STATE = ("READ_CACHE", "AGGREGATE_CACHE", "USE_OUTBOX")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Auction Service API")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--server",
+        choices=("threaded", "asyncio"),
+        default=os.getenv("SERVER_MODE", "threaded"),
+        help="threaded: one thread per connection. asyncio: event loop with keep-alive and a bounded worker pool.",
+    )
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", "8")), help="asyncio mode: threads running controllers")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.getenv("PROCESSES", "1")),
+        help="More than 1 pre-forks that many server processes sharing the port. SIGHUP reloads them one at a time.",
+    )
+    parser.add_argument(
+        "--reuse-port",
+        action="store_true",
+        default=os.getenv("REUSE_PORT", "0") == "1",
+        help="With --processes: each process listens on its own SO_REUSEPORT socket rather than sharing one.",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        help="Seconds a stopping server waits for requests in progress.",
+    )
+    parser.add_argument(
+        "--rebuild-summary",
+        action="store_true",
+        help="Re-derive the auction_summary read model from the write tables, then exit.",
+    )
+    args = parser.parse_args()
+    if args.processes > 1:
+        # Each process would keep its own copy, unaware of the others' writes (or deliver the same outbox events)
+        shared_state = [name for name in PROCESS_LOCAL_STATE if os.getenv(name, "0") == "1"]
+        if shared_state:
+            parser.error(f"--processes cannot be combined with {', '.join(shared_state)}")
+    return args
+
+
+def serve(args: argparse.Namespace, sock: socket.socket | None = None, ready: Callable[[], None] | None = None):
+    # Imported lazily: importing the router bootstraps the application
+    if args.server == "asyncio":
+        from interface.api.async_server import run_async_server
+
+        run_async_server(port=args.port, workers=args.workers, sock=sock, ready=ready, drain_timeout=args.graceful_timeout)
+    else:
+        from interface.api.server import run_server
+
+        run_server(port=args.port, sock=sock, ready=ready, drain_timeout=args.graceful_timeout)
+
+
+def rebuild_summary():
+    from interface.api.bootstrap import bootstrap_dependencies
+    from module.auction.application.command import RebuildAuctionSummaryCommand
+
+    container = bootstrap_dependencies(os.getenv("DB_PATH", "auctions.db"), event_sourcing=os.getenv("EVENT_SOURCING", "0") == "1")
+    try:
+        container.command_bus.dispatch(RebuildAuctionSummaryCommand())
+    finally:
+        container.close()
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.rebuild_summary:
+        rebuild_summary()
+        raise SystemExit(0)
     try:
-        run_server()
+        if args.processes > 1:
+            # The supervisor never imports the application, so every worker wires its own from a clean fork
+            supervisor = PreforkSupervisor(
+                lambda sock, ready: serve(args, sock, ready),
+                args.processes,
+                args.port,
+                reuse_port=args.reuse_port,
+                # Past the workers' own wait for their requests, so they get to close their connections cleanly
+                graceful_timeout=args.graceful_timeout + 5,
+            )
+            supervisor.run()
+        else:
+            serve(args)
     except KeyboardInterrupt:
         logger.info("Stopping server...")
@@ -0,0 +1,260 @@
+import contextlib
+import logging
+import os
+import select
+import signal
+import socket
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Serves on the listening socket until SIGTERM, calling the second argument once it accepts connections
+WorkerFunc = Callable[[socket.socket, Callable[[], None]], None]
+
+# A worker exiting sooner than this after it started counts as a crash loop, and is restarted with a growing delay
+MIN_UPTIME = 5.0
+MAX_RESTART_DELAY = 30.0
+
+_SUPERVISOR_SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD)
+
+
+def listen(host: str, port: int, reuse_port: bool = False, backlog: int = 1024) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+@dataclass
+class Worker:
+    index: int
+    pid: int
+    started: float
+    # Read end of a pipe the worker writes to once it serves, and closes (EOF) if it dies first
+    ready_fd: int
+    stopping: bool = False
+
+
+class PreforkSupervisor:
+    """
+    Runs `processes` workers serving the same port, each calling `worker` in a process forked from this one.
+    Nothing is wired before the fork, so every worker bootstraps its own SQLite connections, caches and threads
+    against the shared database (in WAL mode), and a reload picks up the application code as it is on disk.
+    By default the workers share one listening socket, and the kernel hands each connection to a worker waiting in
+    accept. With `reuse_port`, each worker listens on its own SO_REUSEPORT socket and the kernel spreads connections
+    evenly, but connections still queued on a worker's socket are reset when that worker stops.
+    A worker that exits unexpectedly is restarted, with a growing delay if it keeps exiting right after it started.
+    SIGHUP reloads the workers one at a time: a new one is started and, once it serves, an old one is stopped.
+    If a new worker fails to start, the reload stops there and the remaining old workers carry on.
+    Stopping a worker is SIGTERM, for it to finish its requests in progress, then SIGKILL after `graceful_timeout`.
+    SIGTERM or SIGINT stops every worker that way, then the supervisor.
+    """
+
+    def __init__(
+        self,
+        worker: WorkerFunc,
+        processes: int,
+        port: int,
+        host: str = "",
+        reuse_port: bool = False,
+        graceful_timeout: float = 30.0,
+        startup_timeout: float = 60.0,
+    ):
+        if processes < 1:
+            raise ValueError("At least one worker process is needed")
+        self.worker = worker
+        self.processes = processes
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.graceful_timeout = graceful_timeout
+        self.startup_timeout = startup_timeout
+
+        self._socket: socket.socket | None = None
+        self._workers: dict[int, Worker] = {}
+        # Worker index -> when to start its replacement, and how many times in a row it crashed
+        self._restart_at: dict[int, float] = {}
+        self._crashes: dict[int, int] = {}
+        self._stopping = False
+        self._reload_requested = False
+        self._wakeup_fds: tuple[int, ...] = ()
+
+    def run(self):
+        """Starts the workers and supervises them until SIGTERM or SIGINT."""
+        if not self.reuse_port:
+            self._socket = listen(self.host, self.port)
+        # Signals only set flags; the wakeup fd makes them interrupt the wait of the supervision loop
+        wakeup_read, wakeup_write = self._wakeup_fds = os.pipe()
+        os.set_blocking(wakeup_read, False)
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        for signum in _SUPERVISOR_SIGNALS:
+            signal.signal(signum, self._on_signal)
+        logger.info(f"🚀 Supervisor {os.getpid()} starting {self.processes} workers on http://localhost:{self.port}")
+        try:
+            # The first worker alone creates the schema of a new database, so the others start once it serves
+            first = self._spawn(0)
+            if not self._wait_ready(first):
+                logger.error(f"💥 Worker 0 (pid {first.pid}) did not start.")
+            for index in range(1, self.processes):
+                self._spawn(index)
+            while not self._stopping:
+                select.select([wakeup_read], [], [], 1.0)
+                while _read_available(wakeup_read):
+                    pass
+                self._reap()
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._reload()
+                self._restart_due()
+        finally:
+            logger.info(f"🛑 Stopping {len(self._workers)} workers...")
+            self._stop(list(self._workers.values()))
+            signal.set_wakeup_fd(-1)
+            for signum in _SUPERVISOR_SIGNALS:
+                signal.signal(signum, signal.SIG_DFL)
+            os.close(wakeup_read)
+            os.close(wakeup_write)
+            if self._socket:
+                self._socket.close()
+
+    def _on_signal(self, signum: int, frame: object):
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            self._stopping = True
+        elif signum == signal.SIGHUP:
+            self._reload_requested = True
+
+    def _spawn(self, index: int) -> Worker:
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            self._run_worker(index, ready_write)
+        os.close(ready_write)
+        worker = Worker(index, pid, time.monotonic(), ready_read)
+        self._workers[pid] = worker
+        logger.info(f"👷 Started worker {index} (pid {pid})")
+        return worker
+
+    def _run_worker(self, index: int, ready_write: int):
+        """In the forked process: serves until told to stop, then exits without returning to the supervisor's code."""
+        code = 0
+        try:
+            signal.set_wakeup_fd(-1)
+            for signum in _SUPERVISOR_SIGNALS:
+                signal.signal(signum, signal.SIG_DFL)
+            # Ctrl+C reaches the whole process group; the supervisor stops the workers itself
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            for fd in (*self._wakeup_fds, *(sibling.ready_fd for sibling in self._workers.values())):
+                os.close(fd)
+            os.environ["WORKER_INDEX"] = str(index)
+            sock = self._socket or listen(self.host, self.port, reuse_port=True)
+
+            def ready():
+                os.write(ready_write, b"1")
+                os.close(ready_write)
+
+            self.worker(sock, ready)
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            logger.exception(f"💥 Worker {index} failed")
+            code = 1
+        finally:
+            logging.shutdown()
+            os._exit(code)
+
+    def _reap(self):
+        """Collects exited workers, scheduling a restart for those that were not being stopped."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self._workers.pop(pid, None)
+            if worker is None:
+                continue
+            os.close(worker.ready_fd)
+            if worker.stopping or self._stopping:
+                continue
+
+            # Backs off when it dies right after starting (bad configuration, database unavailable...) instead of forking in a loop
+            crashed_early = time.monotonic() - worker.started < MIN_UPTIME
+            crashes = self._crashes.get(worker.index, 0) + 1 if crashed_early else 0
+            self._crashes[worker.index] = crashes
+            delay = min(MAX_RESTART_DELAY, 0.5 * 2**crashes) if crashes else 0.0
+            self._restart_at[worker.index] = time.monotonic() + delay
+            logger.warning(f"💥 Worker {worker.index} (pid {pid}) exited with {os.waitstatus_to_exitcode(status)}; restarting it in {delay:g}s.")
+
+    def _restart_due(self):
+        now = time.monotonic()
+        for index, at in list(self._restart_at.items()):
+            if at <= now:
+                del self._restart_at[index]
+                self._spawn(index)
+
+    def _reload(self):
+        logger.info("🔄 Reloading workers one at a time...")
+        for old in [worker for worker in self._workers.values() if not worker.stopping]:
+            if self._stopping:
+                return
+            new = self._spawn(old.index)
+            if not self._wait_ready(new):
+                logger.error(f"💥 New worker {new.index} (pid {new.pid}) did not start; keeping the remaining workers.")
+                self._stop([new])
+                return
+            self._stop([old])
+        logger.info("✅ Reloaded every worker.")
+
+    def _wait_ready(self, worker: Worker) -> bool:
+        readable, _, _ = select.select([worker.ready_fd], [], [], self.startup_timeout)
+        return bool(readable) and os.read(worker.ready_fd, 1) == b"1"
+
+    def _stop(self, workers: list[Worker]):
+        """SIGTERM, then SIGKILL for those still running after `graceful_timeout`; returns once they have all exited."""
+        for worker in workers:
+            worker.stopping = True
+            _kill(worker.pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        running = list(workers)
+        while running:
+            running = [worker for worker in running if not self._exited(worker)]
+            if running and time.monotonic() >= deadline:
+                for worker in running:
+                    logger.warning(f"⏱️ Worker {worker.index} (pid {worker.pid}) did not stop in {self.graceful_timeout:g}s; killing it.")
+                    _kill(worker.pid, signal.SIGKILL)
+                deadline = float("inf")
+            elif running:
+                time.sleep(0.05)
+
+    def _exited(self, worker: Worker) -> bool:
+        try:
+            pid, _ = os.waitpid(worker.pid, os.WNOHANG)
+        except ChildProcessError:
+            # Already collected by `_reap`
+            pid = worker.pid
+        if pid == 0:
+            return False
+        if self._workers.pop(worker.pid, None) is not None:
+            os.close(worker.ready_fd)
+        return True
+
+
+def _read_available(fd: int) -> bool:
+    try:
+        return bool(os.read(fd, 512))
+    except BlockingIOError:
+        return False
+
+
+def _kill(pid: int, signum: int):
+    with contextlib.suppress(ProcessLookupError):
+        os.kill(pid, signum)
@@ -0,0 +1,188 @@
+import re
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from operator import itemgetter
+
+from interface.api.request_types import ControllerFunc
+from shared.application.metrics import DEFAULT_LATENCY_BUCKETS, Histogram, HistogramSnapshot, MetricSnapshot
+from shared.interface.api.conditional import Validators
+
+# Template that requests matching no route are counted under, so unknown paths do not each get their own stats
+UNMATCHED = "<unmatched>"
+
+_PARAMETER = re.compile(r"\{(\w+)\}")
+
+
+@dataclass(frozen=True)
+class Route:
+    """A controller declared for a method and a path template, such as `GET /auctions/{id}/bids`."""
+
+    method: str
+    template: str
+    controller: ControllerFunc
+    # For conditional GETs: how to get the validators of the representation cheaply (None when there is nothing to validate)
+    validators: Callable[[dict[str, str]], Validators | None] | None = None
+    # Of successful responses, when they are not JSON
+    content_type: str | None = None
+
+
+@dataclass(frozen=True)
+class RouteStatsSnapshot:
+    """Point-in-time copy of the requests one route template has served."""
+
+    method: str
+    template: str
+    statuses: dict[int, int]
+    latency: HistogramSnapshot
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+
+class RouteStats:
+    """Request count, status codes and latency histogram of one route template."""
+
+    def __init__(self, method: str, template: str, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.method = method
+        self.template = template
+        self.latency = Histogram(buckets)
+        self._statuses: Counter[int] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, status: int, seconds: float):
+        self.latency.observe(seconds)
+        with self._lock:
+            self._statuses[status] += 1
+
+    def snapshot(self) -> RouteStatsSnapshot:
+        with self._lock:
+            statuses = dict(self._statuses)
+        return RouteStatsSnapshot(self.method, self.template, statuses, self.latency.snapshot())
+
+
+class _Shape:
+    """
+    Templates with the same number of segments and parameters at the same positions, such as `/auctions/{id}/bids`
+    and `/users/{id}/bids`. Their literal segments are the key of a dict, so matching all of them is one lookup.
+    """
+
+    def __init__(self, size: int, parameter_indexes: tuple[int, ...]):
+        self.parameter_indexes = parameter_indexes
+        literal_indexes = [index for index in range(size) if index not in parameter_indexes]
+        # Over a path's segments; with a single index, itemgetter returns the item itself rather than a 1-tuple
+        self.literals = itemgetter(*literal_indexes) if literal_indexes else lambda segments: ()
+        self._parameters = itemgetter(*parameter_indexes)
+        self._single = len(parameter_indexes) == 1
+        # Literals (as `literals` returns them) -> the route and the names of its parameters
+        self.routes: dict[object, tuple[Route, tuple[str, ...]]] = {}
+
+    def add(self, route: Route, segments: list[str], names: tuple[str, ...]):
+        key = self.literals(segments)
+        if key in self.routes:
+            raise ValueError(f"Route template overlaps {self.routes[key][0].template!r}: {route.template!r}")
+        self.routes[key] = (route, names)
+
+    def match(self, segments: list[str]) -> tuple[Route, dict[str, str]] | None:
+        found = self.routes.get(self.literals(segments))
+        if found is None:
+            return None
+        route, names = found
+        values = self._parameters(segments)
+        if self._single:
+            return (route, {names[0]: values}) if values else None
+        if not all(values):
+            return None
+        return route, dict(zip(names, values, strict=True))
+
+
+class RouteRegistry:
+    """
+    Routes declared as (method, path template), compiled when added so matching does not slow down as routes are added:
+    templates without parameters are found with one dict lookup, the others with one lookup per distinct shape
+    (number of segments and positions of the parameters) of the method's templates. A literal template wins over
+    one with parameters (`/auctions/batch` over `/auctions/{id}`), fewer parameters win over more, then the first added.
+    Also keeps request counts, status codes and latencies per route template, see `record`.
+    """
+
+    def __init__(self, routes: Iterable[Route] = (), buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = buckets
+        # By method, then by path (templates without parameters) or by number of segments (the others)
+        self._static: dict[str, dict[str, Route]] = {}
+        self._shapes: dict[str, dict[int, list[_Shape]]] = {}
+        self._stats: dict[tuple[str, str], RouteStats] = {}
+        self._lock = threading.Lock()
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: Route) -> Route:
+        if not route.template.startswith("/"):
+            raise ValueError(f"Route template must start with '/': {route.template!r}")
+        if (route.method, route.template) in self._stats:
+            raise ValueError(f"Route already declared: {route.method} {route.template}")
+
+        segments = route.template.strip("/").split("/")
+        parameters = {}
+        for index, segment in enumerate(segments):
+            parameter = _PARAMETER.fullmatch(segment)
+            if parameter:
+                parameters[index] = parameter.group(1)
+            elif "{" in segment or "}" in segment:
+                raise ValueError(f"A parameter must be a whole path segment: {route.template!r}")
+
+        if parameters:
+            shapes = self._shapes.setdefault(route.method, {}).setdefault(len(segments), [])
+            shape = next((shape for shape in shapes if shape.parameter_indexes == tuple(parameters)), None)
+            if shape is None:
+                shape = _Shape(len(segments), tuple(parameters))
+                shapes.append(shape)
+                shapes.sort(key=lambda shape: len(shape.parameter_indexes))
+            shape.add(route, segments, tuple(parameters.values()))
+        else:
+            self._static.setdefault(route.method, {})[route.template] = route
+        self._stats[(route.method, route.template)] = RouteStats(route.method, route.template, self.buckets)
+        return route
+
+    def match(self, method: str, path: str) -> tuple[Route, dict[str, str]] | None:
+        """The route for the request and the path parameters it captured, or None."""
+        static = self._static.get(method)
+        route = static.get(path) if static else None
+        if route is not None:
+            return route, {}
+        shapes = self._shapes.get(method)
+        if not shapes:
+            return None
+        segments = path.strip("/").split("/")
+        for shape in shapes.get(len(segments), ()):
+            match = shape.match(segments)
+            if match is not None:
+                return match
+        return None
+
+    def record(self, method: str, template: str, status: int, seconds: float):
+        """Counts a served request under its route template (UNMATCHED for requests no route matched)."""
+        stats = self._stats.get((method, template))
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault((method, template), RouteStats(method, template, self.buckets))
+        stats.record(status, seconds)
+
+    def stats(self) -> list[RouteStatsSnapshot]:
+        """A snapshot of every route, in the order they were added, then the unmatched requests by method."""
+        with self._lock:
+            stats = list(self._stats.values())
+        return [route_stats.snapshot() for route_stats in stats]
+
+    def collect(self) -> list[MetricSnapshot]:
+        """The route stats as metrics, for a MetricsRegistry collector."""
+        stats = self.stats()
+        requests = tuple(
+            ((route.method, route.template, str(status)), float(count)) for route in stats for status, count in sorted(route.statuses.items())
+        )
+        latencies = tuple(((route.method, route.template), route.latency) for route in stats if route.count)
+        return [
+            MetricSnapshot("http_requests_total", "HTTP requests served, by route template.", "counter", ("method", "route", "status"), requests),
+            MetricSnapshot("http_request_duration_seconds", "Time to dispatch an HTTP request.", "histogram", ("method", "route"), latencies),
+        ]
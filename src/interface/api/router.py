@@ -1,118 +1,163 @@
-import json
 import logging
 import os
 from http.server import BaseHTTPRequestHandler
 from typing import Any
-from urllib.parse import urlparse
 
 from interface.api.bootstrap import bootstrap_dependencies
-from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from interface.api.routes import RouteTable, encode_body
 from module.auction.interface.api.auction_controller import AuctionController
 from module.auction.interface.api.bid_controller import BidController
-from shared.domain.exception import DomainException
+from shared.application.metrics import MetricsRegistry
+from shared.application.tracing import JSONLTraceExporter, Tracer
+from shared.interface.api.compression import CompressedBodyCache, ResponseCompressor
+from shared.interface.api.json_backend import select_json_backend
+from shared.interface.api.json_stream import ChunkedBody, chunked
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.getenv("DB_PATH", "auctions.db")
+DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", "4"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+# "sync" runs event subscribers inline after commit, "async" hands them to worker threads
+EVENT_DISPATCH = os.getenv("EVENT_DISPATCH", "sync")
+# "1" stores events in the outbox table and delivers them from a background relay
+USE_OUTBOX = os.getenv("USE_OUTBOX", "0") == "1"
+# "1" puts an event-invalidated LRU cache in front of the read repository
+READ_CACHE = os.getenv("READ_CACHE", "0") == "1"
+# "1" applies concurrent bids in shared transactions, batching up to N bids or waiting at most the given milliseconds
+GROUP_COMMIT = os.getenv("GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv("GROUP_COMMIT_MAX_WAIT_MS", "2"))
+# "1" keeps committed auctions in memory on the write side and serializes bids per auction
+AGGREGATE_CACHE = os.getenv("AGGREGATE_CACHE", "0") == "1"
+# "1" stores auctions as event streams, with a snapshot every SNAPSHOT_EVERY events (use with a fresh database)
+EVENT_SOURCING = os.getenv("EVENT_SOURCING", "0") == "1"
+SNAPSHOT_EVERY = int(os.getenv("SNAPSHOT_EVERY", "20"))
+# "stdlib", "orjson" (falls back to stdlib when it is not installed) or "auto"
+JSON_BACKEND = os.getenv("JSON_BACKEND", "stdlib")
+# "1" compresses bodies of COMPRESSION_MIN_SIZE bytes or more with gzip or deflate, for clients that accept it
+# (with READ_CACHE, compressed bodies are cached by ETag)
+COMPRESSION = os.getenv("COMPRESSION", "1") == "1"
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# "1" times commands, queries, units of work and SQL, and serves them with per-route stats at GET /metrics
+METRICS = os.getenv("METRICS", "1") == "1"
+# "1" traces requests through the buses, units of work, SQLite and event handlers, exporting kept traces to TRACE_FILE
+# (JSON lines, rotated at TRACE_MAX_BYTES): a TRACE_SAMPLE_RATE fraction of them, plus any taking TRACE_SLOW_MS or longer
+TRACING = os.getenv("TRACING", "0") == "1"
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+if os.getenv("WORKER_INDEX"):
+    # Each pre-forked worker writes its own file (traces.3.jsonl), as rotation is not safe across processes
+    root, extension = os.path.splitext(TRACE_FILE)
+    TRACE_FILE = f"{root}.{os.environ['WORKER_INDEX']}{extension}"
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "500"))
 
 
 class Router(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep the connection alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: without TCP_NODELAY, the body waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    metrics = MetricsRegistry() if METRICS else None
+    tracer = Tracer(JSONLTraceExporter(TRACE_FILE, TRACE_MAX_BYTES), TRACE_SAMPLE_RATE, TRACE_SLOW_MS / 1000) if TRACING else None
+
     # Dependencies
-    event_bus, _, query_bus = bootstrap_dependencies(DB_PATH)
+    container = bootstrap_dependencies(
+        DB_PATH,
+        write_pool_size=DB_WRITE_POOL_SIZE,
+        read_pool_size=DB_READ_POOL_SIZE,
+        async_events=EVENT_DISPATCH == "async",
+        use_outbox=USE_OUTBOX,
+        read_cache=READ_CACHE,
+        group_commit=GROUP_COMMIT,
+        group_commit_max_batch_size=GROUP_COMMIT_MAX_BATCH,
+        group_commit_max_wait=GROUP_COMMIT_MAX_WAIT_MS / 1000,
+        aggregate_cache=AGGREGATE_CACHE,
+        event_sourcing=EVENT_SOURCING,
+        snapshot_every=SNAPSHOT_EVERY,
+        metrics=metrics,
+        trace_sql=TRACING,
+    )
+
+    json_backend = select_json_backend(JSON_BACKEND)
 
     # Initialize Controllers
-    auction_ctrl = AuctionController(query_bus, SQLiteAuctionUnitOfWork, event_bus, DB_PATH)
-    bid_ctrl = BidController(query_bus, SQLiteAuctionUnitOfWork, event_bus, DB_PATH)
-
-    def _send_response(self, status_code: int, data: Any = None, content_type: str = "application/json"):
+    auction_ctrl = AuctionController(
+        container.query_bus, container.uow_factory, container.event_bus, DB_PATH, json_backend=json_backend, metrics=metrics
+    )
+    bid_ctrl = BidController(
+        container.query_bus,
+        container.uow_factory,
+        container.event_bus,
+        DB_PATH,
+        bid_writer=container.bid_writer,
+        retry_policy=container.bid_retry_policy,
+        lanes=container.bid_lanes,
+        json_backend=json_backend,
+        metrics=metrics,
+    )
+    compressor = None
+    if COMPRESSION:
+        compressor = ResponseCompressor(COMPRESSION_LEVEL, COMPRESSION_MIN_SIZE, CompressedBodyCache() if READ_CACHE else None)
+    routes = RouteTable(auction_ctrl, bid_ctrl, json_backend, compressor, metrics, tracer)
+
+    def _send_response(self, status_code: int, data: Any = None, content_type: str = "application/json", headers: dict[str, str] | None = None):
+        if isinstance(data, ChunkedBody) and self.request_version == "HTTP/1.1":
+            self._send_stream(status_code, data, content_type, headers)
+            return
         self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status_code == 304:
+            # No body, and no Content-Length: it would describe the representation the client already has
+            self.end_headers()
+            return
+        payload = encode_body(data, content_type, self.routes.json_backend)
         self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
-        if data is not None:
-            if content_type == "application/json":
-                self.wfile.write(json.dumps(data).encode("utf-8"))
-            else:
-                self.wfile.write(data.encode("utf-8"))
-
-    def _parse_body(self) -> dict[str, Any]:
-        length = int(self.headers.get("Content-Length", 0))
-        if length == 0:
-            return {}
-
-        # Determine content type to parse form data vs json
-        if self.headers.get("Content-Type") == "application/x-www-form-urlencoded":
-            from urllib.parse import parse_qs
-
-            data = self.rfile.read(length).decode("utf-8")
-            parsed = parse_qs(data)
-            # Flatten lists from parse_qs
-            return {k: v[0] for k, v in parsed.items()}
+        self.wfile.write(payload)
 
+    def _send_stream(self, status_code: int, stream: ChunkedBody, content_type: str, headers: dict[str, str] | None = None):
+        """Writes the body as it is encoded, so memory stays flat however many items there are."""
+        self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
         try:
-            return json.loads(self.rfile.read(length))
-        except json.JSONDecodeError:
-            return {}
+            for frame in chunked(stream.chunks()):
+                self.wfile.write(frame)
+        except ConnectionError:
+            self.close_connection = True
+        except Exception:
+            # The status line is already out: all that is left is to cut the response short
+            logger.exception("Streaming the response failed")
+            self.close_connection = True
+        finally:
+            stream.close()
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
 
     def do_GET(self):
-        try:
-            parsed = urlparse(self.path)
-            path_parts = parsed.path.strip("/").split("/")
-
-            # Router Logic
-            status, data = 404, {"error": "Not Found"}
-
-            # API Routes
-            # GET /
-            if parsed.path == "/":
-                status, data = 200, {
-                    "message": "Welcome to the Auction Service API",
-                    "_links": {
-                        "self": {"href": "/", "method": "GET"},
-                        "auctions": {"href": "/auctions", "method": "GET"},
-                        "create_auction": {"href": "/auctions", "method": "POST"},
-                    },
-                }
-
-            # GET /auctions
-            elif parsed.path == "/auctions":
-                status, data = self.auction_ctrl.list_auctions(None, {})
-
-            # GET /auctions/{id}
-            elif len(path_parts) == 2 and path_parts[0] == "auctions":
-                status, data = self.auction_ctrl.get_auction(None, {"id": path_parts[1]})
-
-            # GET /auctions/{id}/bids
-            elif len(path_parts) == 3 and path_parts[0] == "auctions" and path_parts[2] == "bids":
-                status, data = self.bid_ctrl.list_bids(None, {"id": path_parts[1]})
-
-            self._send_response(status, data)
-
-        except Exception as e:
-            logger.exception("GET Request failed")
-            self._send_response(500, {"error": str(e)}, "application/json")
+        with self.server.request():
+            status, data, headers = self.routes.dispatch("GET", self.path, headers=self.headers)
+            self._send_response(status, data, headers.pop("Content-Type", "application/json"), self._closing_if_draining(headers))
 
     def do_POST(self):
-        try:
-            parsed = urlparse(self.path)
-            path_parts = parsed.path.strip("/").split("/")
-            body = self._parse_body()
-
-            # Router Logic
-            status, data = 404, {"error": "Not Found"}
-
-            # POST /auctions
-            if parsed.path == "/auctions":
-                status, data = self.auction_ctrl.create_auction(body, {})
-
-            # POST /auctions/{id}/bids
-            elif len(path_parts) == 3 and path_parts[0] == "auctions" and path_parts[2] == "bids":
-                status, data = self.bid_ctrl.place_bid(body, {"id": path_parts[1]})
-
-            self._send_response(status, data)
-
-        except DomainException as e:
-            self._send_response(400, {"error": str(e), "type": "BusinessRuleViolation"})
-        except Exception as e:
-            logger.exception("POST Request failed")
-            self._send_response(500, {"error": str(e)})
+        with self.server.request():
+            status, data, headers = self.routes.dispatch("POST", self.path, self.headers.get("Content-Type"), self._read_body(), self.headers)
+            self._send_response(status, data, headers.pop("Content-Type", "application/json"), self._closing_if_draining(headers))
+
+    def _closing_if_draining(self, headers: dict[str, str]) -> dict[str, str]:
+        # The server is stopping, so this is the connection's last response (send_header then closes it)
+        if self.server.draining:
+            headers["Connection"] = "close"
+        return headers
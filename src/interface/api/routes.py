@@ -0,0 +1,235 @@
+import json
+import logging
+import time
+from collections.abc import Mapping
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from interface.api.request_types import ControllerFunc
+from interface.api.route_registry import UNMATCHED, Route, RouteRegistry
+from module.auction.interface.api.auction_controller import AuctionController
+from module.auction.interface.api.bid_controller import BidController
+from shared.application.exception import ConcurrencyException
+from shared.application.metrics import MetricsRegistry
+from shared.application.tracing import NO_SPAN, Tracer, span
+from shared.domain.exception import DomainException
+from shared.interface.api.compression import ResponseCompressor, negotiate_encoding
+from shared.interface.api.conditional import coded_etag
+from shared.interface.api.json_backend import STDLIB_JSON, JSONBackend, StaticJSON
+from shared.interface.api.json_stream import ChunkedBody
+from shared.interface.api.prometheus import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE
+from shared.interface.api.prometheus import render_prometheus
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+ROOT_DOCUMENT = StaticJSON(
+    {
+        "message": "Welcome to the Auction Service API",
+        "_links": {
+            "self": {"href": "/", "method": "GET"},
+            "auctions": {"href": "/auctions", "method": "GET"},
+            "create_auction": {"href": "/auctions", "method": "POST"},
+            "create_auctions_batch": {"href": "/auctions/batch", "method": "POST"},
+            "place_bids_batch": {"href": "/bids/batch", "method": "POST"},
+        },
+    }
+)
+
+
+# GET /
+def root(body: dict[str, Any] | None, params: dict[str, str]) -> tuple[int, Any]:
+    return 200, ROOT_DOCUMENT
+
+
+def parse_body(content_type: str | None, raw: bytes) -> dict[str, Any]:
+    if not raw:
+        return {}
+
+    # Determine content type to parse form data vs json
+    if content_type == "application/x-www-form-urlencoded":
+        parsed = parse_qs(raw.decode("utf-8"))
+        # Flatten lists from parse_qs
+        return {k: v[0] for k, v in parsed.items()}
+
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+
+
+def encode_body(data: Any, content_type: str = "application/json", backend: JSONBackend = STDLIB_JSON) -> bytes:
+    if data is None:
+        return b""
+    if isinstance(data, bytes):
+        # Already encoded, e.g. by a resource serializer
+        return data
+    if isinstance(data, StaticJSON):
+        return data.encode(backend)
+    if isinstance(data, ChunkedBody):
+        # For clients that cannot take a chunked response
+        try:
+            return b"".join(data.chunks())
+        finally:
+            data.close()
+    if content_type == "application/json":
+        return backend.dumps(data)
+    return data.encode("utf-8")
+
+
+class RouteTable:
+    """
+    The API's routes, declared as (method, path template) pairs in a RouteRegistry.
+    Shared by every server front-end so they all expose the same API.
+    GET routes with validators answer conditional requests: the validators are looked up before the
+    controller runs, and a matching If-None-Match (or If-Modified-Since) gets a 304 without reading
+    or encoding the representation.
+    With a compressor, bodies are compressed as the request's Accept-Encoding allows, and a body already
+    compressed for the same ETag is served from its cache without running the controller.
+    Every request is counted under its route template, with its status and how long dispatch took
+    (for a streamed body, until the stream is handed to the front-end).
+    With a metrics registry, those stats and the registry's metrics are served at `GET /metrics`, for Prometheus.
+    """
+
+    def __init__(
+        self,
+        auction_ctrl: AuctionController,
+        bid_ctrl: BidController,
+        json_backend: JSONBackend = STDLIB_JSON,
+        compressor: ResponseCompressor | None = None,
+        metrics: MetricsRegistry | None = None,
+        tracer: Tracer | None = None,
+    ):
+        self.auction_ctrl = auction_ctrl
+        self.bid_ctrl = bid_ctrl
+        # What the front-ends encode response bodies with
+        self.json_backend = json_backend
+        self.compressor = compressor
+        self.registry = RouteRegistry(
+            [
+                Route("GET", "/", root),
+                Route("GET", "/auctions", auction_ctrl.list_auctions, auction_ctrl.list_validators),
+                Route("GET", "/auctions/{id}", auction_ctrl.get_auction, auction_ctrl.auction_validators),
+                Route("GET", "/auctions/{id}/bids", bid_ctrl.list_bids, bid_ctrl.bids_validators),
+                Route("POST", "/auctions", auction_ctrl.create_auction),
+                Route("POST", "/auctions/batch", auction_ctrl.create_auctions_batch),
+                Route("POST", "/bids/batch", bid_ctrl.place_bids_batch),
+                Route("POST", "/auctions/{id}/bids", bid_ctrl.place_bid),
+            ]
+        )
+        # Each dispatch is the root span of a trace, when the tracer samples it (or watches it for slowness)
+        self.tracer = tracer
+        self.metrics = metrics
+        if metrics:
+            self.registry.add(Route("GET", "/metrics", self.get_metrics, content_type=PROMETHEUS_CONTENT_TYPE))
+            metrics.register_collector(self.registry.collect)
+
+    # GET /metrics
+    def get_metrics(self, body: dict[str, Any] | None, params: dict[str, str]) -> tuple[int, Any]:
+        return 200, render_prometheus(self.metrics.collect())
+
+    def match(self, method: str, path: str) -> tuple[ControllerFunc, dict[str, str]] | None:
+        match = self.registry.match(method, path)
+        if match is None:
+            return None
+        route, params = match
+        return route.controller, params
+
+    def dispatch(
+        self,
+        method: str,
+        target: str,
+        content_type: str | None = None,
+        raw_body: bytes = b"",
+        headers: Mapping[str, str] | None = None,
+    ) -> tuple[int, Any, dict[str, str]]:
+        """
+        Runs the request through the matching controller and maps errors to status codes.
+        Returns the status, the body and the response headers. `headers` are the request's (lower-case names).
+        """
+        started = time.perf_counter()
+        template = UNMATCHED
+        trace = self.tracer.trace("http.request", method=method, target=target) if self.tracer else NO_SPAN
+        with trace as root:
+            try:
+                parsed = urlparse(target)
+                match = self.registry.match(method, parsed.path)
+                if match is None:
+                    response = 404, {"error": "Not Found"}, {}
+                else:
+                    route, path_params = match
+                    template = route.template
+                    response = self._run(route, method, parsed.query, path_params, content_type, raw_body, headers or {})
+
+            except DomainException as e:
+                response = 400, {"error": str(e), "type": "BusinessRuleViolation"}, {}
+            except ConcurrencyException as e:
+                # Still conflicting after the handler's retries; the client may try again
+                response = 409, {"error": str(e), "type": "ConcurrencyConflict"}, {}
+            except Exception as e:
+                logger.exception(f"{method} Request failed")
+                response = 500, {"error": str(e)}, {}
+            root.set(route=template, status=response[0])
+
+        self.registry.record(method, template, response[0], time.perf_counter() - started)
+        return response
+
+    def _run(
+        self,
+        route: Route,
+        method: str,
+        query: str,
+        path_params: dict[str, str],
+        content_type: str | None,
+        raw_body: bytes,
+        headers: Mapping[str, str],
+    ) -> tuple[int, Any, dict[str, str]]:
+        # Query-string parameters (first value wins), overridden by path parameters
+        params = {k: v[0] for k, v in parse_qs(query).items()}
+        params.update(path_params)
+        body = parse_body(content_type, raw_body) if method == "POST" else None
+
+        validators = route.validators(params) if route.validators and method == "GET" else None
+        vary = {"Vary": "Accept-Encoding"} if self.compressor else {}
+        encoding = negotiate_encoding(headers.get("accept-encoding")) if self.compressor else None
+        if validators and validators.not_modified(headers):
+            not_modified = {**validators.headers(), **vary}
+            # The validator the 200 sent with the copy the client holds: the compressed form's, if that is what it has
+            if encoding and validators.matched_coded(headers, encoding):
+                not_modified["ETag"] = coded_etag(validators.etag, encoding)
+            return 304, None, not_modified
+
+        if encoding and validators:
+            cached = self.compressor.cached(validators.etag, encoding)
+            if cached is not None:
+                return 200, cached, self._coded({**validators.headers(), **vary}, encoding)
+
+        with span("controller", route=route.template):
+            status, data = route.controller(body, params)
+        response_headers = {**validators.headers(), **vary} if validators and status == 200 else dict(vary)
+        if route.content_type and status == 200:
+            response_headers["Content-Type"] = route.content_type
+        if encoding and data is not None:
+            etag = validators.etag if validators and status == 200 else None
+            return self._compress(status, data, response_headers, encoding, etag)
+        return status, data, response_headers
+
+    def _compress(self, status: int, data: Any, headers: dict[str, str], encoding: str, etag: str | None) -> tuple[int, Any, dict[str, str]]:
+        """The response with its body compressed, when that is worth it. Bodies with an ETag are cached by it."""
+        if isinstance(data, ChunkedBody):
+            return status, self.compressor.compress_stream(data, encoding, etag), self._coded(headers, encoding)
+        with span("compress", encoding=encoding) as current:
+            payload = encode_body(data, "application/json", self.json_backend)
+            compressed = self.compressor.compress_body(payload, encoding, etag)
+            current.set(bytes=len(payload))
+        if compressed is None:
+            return status, payload, headers
+        return status, compressed, self._coded(headers, encoding)
+
+    @staticmethod
+    def _coded(headers: dict[str, str], encoding: str) -> dict[str, str]:
+        coded = {**headers, "Content-Encoding": encoding}
+        if "ETag" in coded:
+            coded["ETag"] = coded_etag(coded["ETag"], encoding)
+        return coded
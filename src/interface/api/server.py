@@ -1,4 +1,9 @@
 import logging
+import signal
+import socket
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from http.server import HTTPServer
 from socketserver import ThreadingMixIn
 
@@ -9,13 +14,61 @@ logger = logging.getLogger(__name__)
 
 
 class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
-    """Handle requests in a separate thread."""
+    """
+    Handle requests in a separate thread.
+    `drain` stops it gracefully: no new connections, and keep-alive connections are closed after their request in progress.
+    """
 
-    pass
+    # Idle keep-alive connections must not keep a stopping server alive; `drain` waits for the requests in progress
+    daemon_threads = True
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.draining = False
+        self._active = 0
+        self._idle = threading.Condition()
 
-def run_server(port: int = 8000):
-    server_address = ("", port)
-    httpd = ThreadingHTTPServer(server_address, Router)
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """Counts a request as in progress, for `drain`."""
+        with self._idle:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._idle:
+                self._active -= 1
+                if not self._active:
+                    self._idle.notify_all()
+
+    def drain(self, timeout: float) -> bool:
+        """Stops accepting connections and waits up to `timeout` seconds for the requests in progress to finish."""
+        self.draining = True
+        self.shutdown()
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._active, timeout)
+
+
+def _interrupt(signum: int, frame: object):
+    # A second SIGTERM kills the process outright
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    raise KeyboardInterrupt
+
+
+def run_server(port: int = 8000, sock: socket.socket | None = None, ready: Callable[[], None] | None = None, drain_timeout: float = 30.0):
+    """Serves on `port`, or on the already listening `sock` (from the pre-fork supervisor). SIGTERM stops it like Ctrl+C."""
+    httpd = ThreadingHTTPServer(("", port), Router, bind_and_activate=sock is None)
+    if sock is not None:
+        httpd.socket.close()
+        httpd.socket = sock
+    signal.signal(signal.SIGTERM, _interrupt)
     logger.info(f"🚀 Server starting on http://localhost:{port}")
-    httpd.serve_forever()
+    if ready:
+        ready()
+    try:
+        httpd.serve_forever()
+    finally:
+        if not httpd.drain(drain_timeout):
+            logger.warning(f"⏱️ Requests still in progress after {drain_timeout:g}s; stopping anyway.")
+        httpd.server_close()
+        Router.container.close()
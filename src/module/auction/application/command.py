@@ -18,3 +18,10 @@ class CreateAuctionCommand(Command):
 
     item_id: str
     starting_price: float
+
+
+@dataclass
+class RebuildAuctionSummaryCommand(Command):
+    """Command to re-derive the auction summary read model from the write tables."""
+
+    pass
@@ -1,17 +1,33 @@
-from module.auction.application.command import CreateAuctionCommand, PlaceBidCommand
+from contextlib import nullcontext
+
+from module.auction.application.command import CreateAuctionCommand, PlaceBidCommand, RebuildAuctionSummaryCommand
+from module.auction.application.projection import AuctionSummaryProjection
 from module.auction.application.unit_of_work import AuctionUnitOfWork
 from module.auction.domain.entity import Auction
 from module.auction.domain.exception import AuctionException
 from module.auction.domain.value_object import AuctionID
+from shared.application.retry import RetryPolicy
+from shared.application.serial_lanes import SerialLanes
 
 
 class PlaceBidHandler:
-    """Handler for PlaceBidCommand."""
+    """
+    Handler for PlaceBidCommand. With a retry policy, a bid that lost a race is re-applied to the fresh auction.
+    With serial lanes, bids on the same auction from this process take turns instead of racing at all.
+    """
 
-    def __init__(self, uow: AuctionUnitOfWork):
+    def __init__(self, uow: AuctionUnitOfWork, retry_policy: RetryPolicy | None = None, lanes: SerialLanes | None = None):
         self.uow = uow
+        self.retry_policy = retry_policy
+        self.lanes = lanes
 
     def handle(self, command: PlaceBidCommand):
+        with self.lanes.lane(command.auction_id) if self.lanes else nullcontext():
+            if self.retry_policy:
+                return self.retry_policy.run(lambda: self._handle_once(command))
+            return self._handle_once(command)
+
+    def _handle_once(self, command: PlaceBidCommand):
         # 1. Start Transaction
         with self.uow:
             # 2. Retrieve
@@ -37,6 +53,16 @@ class CreateAuctionHandler:
 
     def handle(self, command: CreateAuctionCommand) -> str:
         with self.uow:
-            auction = Auction(item_id=command.item_id, starting_price=command.starting_price)
+            auction = Auction.create(item_id=command.item_id, starting_price=command.starting_price)
             self.uow.repo.save(auction)
             return auction.id.value
+
+
+class RebuildAuctionSummaryHandler:
+    """Handler for RebuildAuctionSummaryCommand."""
+
+    def __init__(self, projection: AuctionSummaryProjection):
+        self.projection = projection
+
+    def handle(self, command: RebuildAuctionSummaryCommand) -> int:
+        return self.projection.rebuild()
@@ -0,0 +1,9 @@
+from typing import Protocol
+
+
+class AuctionSummaryProjection(Protocol):
+    """Interface for the denormalized auction summary read model (Query Side)."""
+
+    def rebuild(self) -> int:
+        """Re-derives the read model from the write side. Returns the number of auctions."""
+        ...
@@ -8,11 +8,44 @@ class GetAuctionQuery(Query):
     auction_id: str
 
 
+@dataclass
+class GetAuctionVersionQuery(Query):
+    """What changes whenever the auction or its bids do, see AuctionVersion."""
+
+    auction_id: str
+
+
+# Sort orders supported by ListAuctionsQuery; a leading "-" means descending
+AUCTION_SORT_ORDERS = ("id", "-id", "starting_price", "-starting_price", "current_price", "-current_price")
+
+
+@dataclass
+class GetAuctionListVersionQuery(Query):
+    """What changes whenever the page ListAuctionsQuery returns for the same arguments does, see PageVersion."""
+
+    limit: int = 50
+    cursor: str | None = None
+    is_active: bool | None = None
+    sort: str = "id"
+
+
 @dataclass
 class ListAuctionsQuery(Query):
-    pass
+    """
+    One page of auctions. `cursor` is the opaque `next_cursor` of the previous page.
+    With `stream`, the result is an AuctionPageStream rather than a dict.
+    """
+
+    limit: int = 50
+    cursor: str | None = None
+    is_active: bool | None = None
+    sort: str = "id"
+    stream: bool = False
 
 
 @dataclass
 class ListBidsQuery(Query):
+    """With `stream`, the bids are an iterator read lazily rather than a list."""
+
     auction_id: str
+    stream: bool = False
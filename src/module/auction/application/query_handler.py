@@ -1,7 +1,14 @@
+from collections.abc import Iterable
 from typing import Any
 
-from module.auction.application.query import GetAuctionQuery, ListAuctionsQuery, ListBidsQuery
-from module.auction.application.read_repository import AuctionReadRepository
+from module.auction.application.query import (
+    GetAuctionListVersionQuery,
+    GetAuctionQuery,
+    GetAuctionVersionQuery,
+    ListAuctionsQuery,
+    ListBidsQuery,
+)
+from module.auction.application.read_repository import AuctionPageStream, AuctionReadRepository, AuctionVersion, PageVersion
 
 
 class GetAuctionHandler:
@@ -12,17 +19,37 @@ class GetAuctionHandler:
         return self.repo.get_auction(query.auction_id)
 
 
+class GetAuctionVersionHandler:
+    def __init__(self, repo: AuctionReadRepository):
+        self.repo = repo
+
+    def handle(self, query: GetAuctionVersionQuery) -> AuctionVersion | None:
+        return self.repo.get_auction_version(query.auction_id)
+
+
+class GetAuctionListVersionHandler:
+    def __init__(self, repo: AuctionReadRepository):
+        self.repo = repo
+
+    def handle(self, query: GetAuctionListVersionQuery) -> PageVersion:
+        return self.repo.get_page_version(limit=query.limit, cursor=query.cursor, is_active=query.is_active, sort=query.sort)
+
+
 class ListAuctionsHandler:
     def __init__(self, repo: AuctionReadRepository):
         self.repo = repo
 
-    def handle(self, query: ListAuctionsQuery) -> list[dict[str, Any]]:
-        return self.repo.list_auctions()
+    def handle(self, query: ListAuctionsQuery) -> dict[str, Any] | AuctionPageStream:
+        if query.stream:
+            return self.repo.stream_auctions(limit=query.limit, cursor=query.cursor, is_active=query.is_active, sort=query.sort)
+        return self.repo.list_auctions(limit=query.limit, cursor=query.cursor, is_active=query.is_active, sort=query.sort)
 
 
 class ListBidsHandler:
     def __init__(self, repo: AuctionReadRepository):
         self.repo = repo
 
-    def handle(self, query: ListBidsQuery) -> list[dict[str, Any]] | None:
+    def handle(self, query: ListBidsQuery) -> Iterable[dict[str, Any]] | None:
+        if query.stream:
+            return self.repo.stream_bids(query.auction_id)
         return self.repo.list_bids(query.auction_id)
@@ -1,4 +1,39 @@
-from typing import Any, Protocol
+from collections.abc import Iterator
+from typing import Any, NamedTuple, Protocol
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor is malformed or was issued for a different sort order."""
+
+    pass
+
+
+class AuctionPageStream:
+    """One page of auctions read lazily. `next_cursor` is only known once `items` has been exhausted."""
+
+    def __init__(self, items: Iterator[dict[str, Any]], next_cursor: str | None = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    def close(self):
+        close = getattr(self.items, "close", None)
+        if close:
+            close()
+
+
+class AuctionVersion(NamedTuple):
+    """
+    How many bids of an auction the read model (`summary`, None until it has the auction) and the write side
+    (`bids`) hold. Nothing else about an auction changes, so together they change whenever its representation does.
+    """
+
+    summary: int | None
+    bids: int
+
+
+# The (id, bid count) of every auction on a page of the list, and of the first one after it, which decides the next link.
+# Like AuctionVersion, together they change whenever the page does.
+PageVersion = tuple[tuple[str, int], ...]
 
 
 class AuctionReadRepository(Protocol):
@@ -7,8 +42,26 @@ class AuctionReadRepository(Protocol):
     Acts as a repository for retrieving Read DTOs.
     """
 
-    def list_auctions(self) -> list[dict[str, Any]]: ...
+    def list_auctions(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> dict[str, Any]:
+        """Returns {"items": [...], "next_cursor": str | None}."""
+        ...
 
     def get_auction(self, auction_id: str) -> dict[str, Any] | None: ...
 
     def list_bids(self, auction_id: str) -> list[dict[str, Any]] | None: ...
+
+    def stream_auctions(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> AuctionPageStream:
+        """Like `list_auctions`, yielding rows as they are read. Invalid arguments raise right away."""
+        ...
+
+    def stream_bids(self, auction_id: str) -> Iterator[dict[str, Any]] | None:
+        """Like `list_bids`, yielding rows as they are read."""
+        ...
+
+    def get_auction_version(self, auction_id: str) -> AuctionVersion | None:
+        """None if the auction does not exist. Far cheaper than reading the auction."""
+        ...
+
+    def get_page_version(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> PageVersion:
+        """The version of the page `list_auctions` would return for the same arguments, without reading its rows."""
+        ...
@@ -0,0 +1,71 @@
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from module.auction.domain.value_object import Bid
+
+
+class BidHistory(Sequence[Bid]):
+    """
+    An auction's bids, oldest first, stored column-wise: amounts in an array of doubles and bidders as
+    indexes into a table of distinct (interned) bidder ids, about 12 bytes per bid.
+    `Bid` objects are only created when items are read.
+    """
+
+    __slots__ = ("_amounts", "_bidder_indexes", "_bidders", "_bidder_positions")
+
+    def __init__(self, bids: Iterable[Bid] = ()):
+        self._amounts = array("d")
+        self._bidder_indexes = array("I")
+        self._bidders: list[str] = []
+        self._bidder_positions: dict[str, int] = {}
+        for bid in bids:
+            self.add(bid.bidder_id, bid.amount)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[str, float]]) -> "BidHistory":
+        """Builds a history from (bidder_id, amount) rows without creating a Bid per row."""
+        history = cls()
+        for bidder_id, amount in rows:
+            history.add(bidder_id, amount)
+        return history
+
+    def add(self, bidder_id: str, amount: float):
+        position = self._bidder_positions.get(bidder_id)
+        if position is None:
+            position = self._bidder_positions[bidder_id] = len(self._bidders)
+            self._bidders.append(sys.intern(bidder_id))
+        self._bidder_indexes.append(position)
+        self._amounts.append(amount)
+
+    def append(self, bid: Bid):
+        self.add(bid.bidder_id, bid.amount)
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    @overload
+    def __getitem__(self, index: int) -> Bid: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[Bid]: ...
+    def __getitem__(self, index: int | slice) -> Bid | list[Bid]:
+        if isinstance(index, slice):
+            bidders = self._bidders
+            return [Bid(bidders[i], amount) for i, amount in zip(self._bidder_indexes[index], self._amounts[index], strict=True)]
+        return Bid(self._bidders[self._bidder_indexes[index]], self._amounts[index])
+
+    def __iter__(self) -> Iterator[Bid]:
+        bidders = self._bidders
+        for i, amount in zip(self._bidder_indexes, self._amounts, strict=True):
+            yield Bid(bidders[i], amount)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"BidHistory({len(self)} bids)"
@@ -1,4 +1,7 @@
-from module.auction.domain.event import BidPlaced
+from collections.abc import Callable, Iterable
+
+from module.auction.domain.bid_history import BidHistory
+from module.auction.domain.event import AuctionCreated, BidPlaced
 from module.auction.domain.exception import AuctionException
 from module.auction.domain.value_object import AuctionID, Bid
 from shared.domain.event import Event
@@ -11,16 +14,76 @@ class Auction:
         self.id = AuctionID.generate()
         self.item_id = item_id
         self.starting_price = starting_price
-        self.bids: list[Bid] = []
         self.is_active = True
         self.events: list[Event] = []
+        # Optimistic concurrency token, maintained by the repository (0 = never stored)
+        self.version = 0
+
+        # Bid state. `bid_count` and `highest_bid` are all the invariants need,
+        # so the full history can stay unloaded until someone asks for it.
+        self.bid_count = 0
+        self.highest_bid: Bid | None = None
+        self._bids: BidHistory | None = BidHistory()
+        self._bid_loader: Callable[[], Iterable[Bid]] | None = None
+        self._unloaded_tail: list[Bid] = []
+
+    @classmethod
+    def create(cls, item_id: str, starting_price: float) -> "Auction":
+        """Opens a new auction and records the AuctionCreated event (the constructor alone is also used to rehydrate)."""
+        auction = cls(item_id, starting_price)
+        auction.events.append(AuctionCreated(auction_id=auction.id.value, item_id=item_id, starting_price=starting_price))
+        return auction
+
+    @property
+    def bids(self) -> BidHistory:
+        """Full bid history, oldest first. Loaded on first access for lazily restored auctions."""
+        if self._bids is None:
+            loaded = self._bid_loader() if self._bid_loader else ()
+            self._bids = loaded if isinstance(loaded, BidHistory) else BidHistory(loaded)
+            for bid in self._unloaded_tail:
+                self._bids.append(bid)
+            self._bid_loader = None
+            self._unloaded_tail = []
+        return self._bids
+
+    @bids.setter
+    def bids(self, bids: Iterable[Bid]):
+        self._bids = BidHistory(bids)
+        self._bid_loader = None
+        self._unloaded_tail = []
+        self.bid_count = len(self._bids)
+        self.highest_bid = self._bids[-1] if self._bids else None
+
+    def restore_bids_lazily(self, bid_count: int, highest_bid: Bid | None, loader: Callable[[], Iterable[Bid]]):
+        """
+        Restores the bid summary without the history.
+        `loader` is called at most once, the first time `bids` is read.
+        """
+        self._bids = None
+        self._bid_loader = loader
+        self._unloaded_tail = []
+        self.bid_count = bid_count
+        self.highest_bid = highest_bid
+
+    def bids_after(self, sequence: int) -> list[Bid]:
+        """
+        Returns the bids placed after the given 1-based sequence number.
+        Served from memory when possible so persisting new bids never loads the history.
+        """
+        if self._bids is not None:
+            return self._bids[sequence:]
+
+        loaded_count = self.bid_count - len(self._unloaded_tail)
+        if sequence >= loaded_count:
+            return self._unloaded_tail[sequence - loaded_count :]
+        return self.bids[sequence:]
 
     @property
     def current_price(self) -> float:
         """Get the current highest bid or starting price if no bids."""
-        if not self.bids:
+        if self.highest_bid is None:
             return self.starting_price
-        return self.bids[-1].amount
+        return self.highest_bid.amount
 
     def place_bid(self, bidder_id: str, amount: float):
         """Place a bid on the auction."""
@@ -31,7 +94,12 @@ class Auction:
 
         # State Change
         new_bid = Bid(bidder_id, amount)
-        self.bids.append(new_bid)
+        if self._bids is not None:
+            self._bids.append(new_bid)
+        else:
+            self._unloaded_tail.append(new_bid)
+        self.bid_count += 1
+        self.highest_bid = new_bid
 
         # Event: Record that this happened
-        self.events.append(BidPlaced(auction_id=self.id.value, bidder_id=bidder_id, amount=amount))
+        self.events.append(BidPlaced(auction_id=self.id.value, bidder_id=bidder_id, amount=amount, sequence=self.bid_count))
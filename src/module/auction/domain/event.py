@@ -4,11 +4,22 @@ from datetime import UTC, datetime
 from shared.domain.event import Event
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BidPlaced(Event):
     """Event triggered when a bid is successfully placed."""
 
     auction_id: str
     bidder_id: str
     amount: float
+    sequence: int = 0  # 1-based position of the bid in the auction's history
+    occurred_at: str = field(default_factory=lambda: str(datetime.now(UTC)))
+
+
+@dataclass(frozen=True, slots=True)
+class AuctionCreated(Event):
+    """Event triggered when a new auction is opened."""
+
+    auction_id: str
+    item_id: str
+    starting_price: float
     occurred_at: str = field(default_factory=lambda: str(datetime.now(UTC)))
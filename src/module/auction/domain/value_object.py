@@ -2,7 +2,7 @@ import uuid
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bid:
     """Value object representing a bid in an auction."""
 
@@ -10,7 +10,7 @@ class Bid:
     amount: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AuctionID:
     """Value object representing a unique identifier for an auction."""
 
@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from module.auction.domain.entity import Auction
+from module.auction.domain.value_object import Bid
+from shared.application.metrics import MetricSnapshot, MetricsRegistry, single_sample
+
+
+@dataclass(frozen=True)
+class CachedAuction:
+    """The committed state of an Auction that its invariants need; the bid history stays in SQLite."""
+
+    id: str
+    item_id: str
+    starting_price: float
+    is_active: bool
+    bid_count: int
+    highest_bid: Bid | None
+    version: int
+
+    @classmethod
+    def of(cls, auction: Auction) -> "CachedAuction":
+        return cls(
+            auction.id.value,
+            auction.item_id,
+            auction.starting_price,
+            auction.is_active,
+            auction.bid_count,
+            auction.highest_bid,
+            auction.version,
+        )
+
+
+@dataclass(frozen=True)
+class AggregateCacheStats:
+    """Counters of an AuctionAggregateCache since it was created."""
+
+    entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class AuctionAggregateCache:
+    """
+    Write-side LRU of recently committed auctions, shared by every unit of work.
+    Entries are immutable snapshots, so each UoW still rehydrates its own Auction and nothing is shared mutably.
+    A snapshot that went stale behind our back (another process wrote) is caught by the version check on save.
+    With `metrics`, the cache stats are reported on each scrape, see `collect`.
+    """
+
+    def __init__(self, max_entries: int = 10_000, metrics: MetricsRegistry | None = None):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedAuction] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if metrics:
+            metrics.register_collector(self.collect)
+
+    def get(self, auction_id: str) -> CachedAuction | None:
+        with self._lock:
+            cached = self._entries.get(auction_id)
+            if cached is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(auction_id)
+            self._hits += 1
+            return cached
+
+    def put(self, auction: Auction):
+        """Records the state of an auction whose changes were just committed."""
+        snapshot = CachedAuction.of(auction)
+        with self._lock:
+            current = self._entries.get(snapshot.id)
+            # Commits can finish out of order; never replace a newer version with an older one
+            if current is not None and current.version >= snapshot.version:
+                self._entries.move_to_end(snapshot.id)
+                return
+            self._entries[snapshot.id] = snapshot
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def evict(self, auction_id: str):
+        with self._lock:
+            self._entries.pop(auction_id, None)
+
+    def stats(self) -> AggregateCacheStats:
+        with self._lock:
+            return AggregateCacheStats(len(self._entries), self._hits, self._misses, self._evictions)
+
+    def collect(self) -> list[MetricSnapshot]:
+        """The cache stats as metrics, for a MetricsRegistry collector."""
+        stats = self.stats()
+        return [
+            single_sample("aggregate_cache_entries", "Auctions in the write-side aggregate cache.", "gauge", stats.entries),
+            single_sample("aggregate_cache_hits_total", "Auctions loaded from the aggregate cache.", "counter", stats.hits),
+            single_sample("aggregate_cache_misses_total", "Auctions the aggregate cache did not hold.", "counter", stats.misses),
+            single_sample(
+                "aggregate_cache_evictions_total", "Auctions evicted to stay within the aggregate cache bound.", "counter", stats.evictions
+            ),
+        ]
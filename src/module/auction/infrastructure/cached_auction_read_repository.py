@@ -0,0 +1,203 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from module.auction.application.read_repository import AuctionPageStream, AuctionReadRepository, AuctionVersion, PageVersion
+from module.auction.domain.event import AuctionCreated, BidPlaced
+from shared.application.event_bus import EventBus
+from shared.application.metrics import MetricSnapshot, MetricsRegistry, single_sample
+from shared.domain.event import Event
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a CachedAuctionReadRepository since it was created."""
+
+    entries: int
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float | None
+
+
+class CachedAuctionReadRepository(AuctionReadRepository):
+    """
+    LRU cache in front of another AuctionReadRepository.
+    Bounded by entry count and by (approximate, JSON-encoded) size, with an optional TTL.
+    Entries are invalidated exactly by BidPlaced and AuctionCreated events, see `subscribe`
+    (or feed `on_event` from whatever updates the underlying read model, so it runs after the update).
+    Returned DTOs are shared between callers and must be treated as read-only.
+    With `metrics`, the cache stats are reported on each scrape, see `collect`.
+    """
+
+    def __init__(
+        self,
+        inner: AuctionReadRepository,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float | None = None,
+        metrics: MetricsRegistry | None = None,
+    ):
+        self.inner = inner
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries: OrderedDict[tuple[Any, ...], _Entry] = OrderedDict()
+        self._bytes = 0
+        # Bumped by every invalidation, so a load that raced with one is not cached
+        self._generation = 0
+        # Part of the key of every list page: bumping it invalidates them all at once, and the LRU evicts them later
+        self._list_generation = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        if metrics:
+            metrics.register_collector(self.collect)
+
+    def subscribe(self, event_bus: EventBus):
+        event_bus.subscribe(BidPlaced, self.on_bid_placed)
+        event_bus.subscribe(AuctionCreated, self.on_auction_created)
+
+    # Event handlers
+
+    def on_event(self, event: Event):
+        if isinstance(event, BidPlaced):
+            self.on_bid_placed(event)
+        elif isinstance(event, AuctionCreated):
+            self.on_auction_created(event)
+
+    def on_bid_placed(self, event: BidPlaced):
+        # List pages show the current price and bid count, and may be sorted by price
+        self._invalidate(self._keys_of(event.auction_id), lists=True)
+
+    def on_auction_created(self, event: AuctionCreated):
+        # Drops cached 404s for the id, and every list page since the new auction may belong on one
+        self._invalidate(self._keys_of(event.auction_id), lists=True)
+
+    @staticmethod
+    def _keys_of(auction_id: str) -> list[tuple[Any, ...]]:
+        return [("auction", auction_id), ("bids", auction_id), ("version", auction_id)]
+
+    # AuctionReadRepository
+
+    def list_auctions(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> dict[str, Any]:
+        return self._get_or_load(
+            ("list", self._list_generation, limit, cursor, is_active, sort),
+            lambda: self.inner.list_auctions(limit=limit, cursor=cursor, is_active=is_active, sort=sort),
+        )
+
+    def get_auction(self, auction_id: str) -> dict[str, Any] | None:
+        return self._get_or_load(("auction", auction_id), lambda: self.inner.get_auction(auction_id))
+
+    def list_bids(self, auction_id: str) -> list[dict[str, Any]] | None:
+        return self._get_or_load(("bids", auction_id), lambda: self.inner.list_bids(auction_id))
+
+    def get_auction_version(self, auction_id: str) -> AuctionVersion | None:
+        return self._get_or_load(("version", auction_id), lambda: self.inner.get_auction_version(auction_id))
+
+    def get_page_version(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> PageVersion:
+        # With the list pages: the same events change it
+        return self._get_or_load(
+            ("list", self._list_generation, "version", limit, cursor, is_active, sort),
+            lambda: self.inner.get_page_version(limit=limit, cursor=cursor, is_active=is_active, sort=sort),
+        )
+
+    # Cached pages and bid lists are in memory already, so they are streamed from there
+
+    def stream_auctions(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> AuctionPageStream:
+        page = self.list_auctions(limit=limit, cursor=cursor, is_active=is_active, sort=sort)
+        return AuctionPageStream(iter(page["items"]), page["next_cursor"])
+
+    def stream_bids(self, auction_id: str) -> Iterator[dict[str, Any]] | None:
+        bids = self.list_bids(auction_id)
+        return None if bids is None else iter(bids)
+
+    # Cache mechanics
+
+    def _get_or_load(self, key: tuple[Any, ...], load: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at is None or entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.value
+                self._remove(key)
+                self._expirations += 1
+            self._misses += 1
+            generation = self._generation
+
+        value = load()
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if generation != self._generation:
+                return value
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, now + self.ttl if self.ttl is not None else None)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+        return value
+
+    def _remove(self, key: tuple[Any, ...]):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _invalidate(self, keys: list[tuple[Any, ...]], lists: bool = False):
+        with self._lock:
+            self._generation += 1
+            if lists:
+                self._list_generation += 1
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    self._invalidations += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+            )
+
+    def collect(self) -> list[MetricSnapshot]:
+        """The cache stats as metrics, for a MetricsRegistry collector."""
+        stats = self.stats()
+        return [
+            single_sample("read_cache_entries", "Entries in the read cache.", "gauge", stats.entries),
+            single_sample("read_cache_bytes", "Approximate size of the read cache entries.", "gauge", stats.bytes),
+            single_sample("read_cache_hits_total", "Reads answered from the read cache.", "counter", stats.hits),
+            single_sample("read_cache_misses_total", "Reads that went to the read model.", "counter", stats.misses),
+            single_sample("read_cache_evictions_total", "Entries evicted to stay within the read cache bounds.", "counter", stats.evictions),
+            single_sample("read_cache_expirations_total", "Entries dropped after their TTL.", "counter", stats.expirations),
+            single_sample("read_cache_invalidations_total", "Entries dropped because an event changed them.", "counter", stats.invalidations),
+        ]
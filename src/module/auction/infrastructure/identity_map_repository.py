@@ -0,0 +1,141 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+
+from module.auction.application.write_repository import AuctionWriteRepository
+from module.auction.domain.entity import Auction
+from module.auction.domain.value_object import AuctionID, Bid
+from module.auction.infrastructure.auction_aggregate_cache import AuctionAggregateCache
+from shared.application.exception import DetachedAggregateException
+from shared.application.tracing import span
+
+
+class IdentityMapRepository(AuctionWriteRepository, ABC):
+    """
+    Identity map and change tracking shared by the write repositories a SQLiteAuctionUnitOfWork can use.
+    Within a unit of work each auction is loaded once and always returned as the same instance, and only
+    aggregates with unsaved changes are written. Subclasses implement `is_dirty`, `_write` and `_load`.
+    """
+
+    def __init__(self, aggregate_cache: AuctionAggregateCache | None = None):
+        # Committed auctions kept in memory across units of work; a hit skips the SELECT
+        self.aggregate_cache = aggregate_cache
+        # Identity map: AuctionID value -> the one in-memory instance of that auction
+        self._identity_map: dict[str, Auction] = {}
+        # Every load and save in order (for savepoints), and every auction ever touched
+        self._touched: list[str] = []
+        self._visited: set[str] = set()
+        # Set once the unit of work is over and its connection may serve someone else
+        self._closed = False
+
+    @property
+    def seen_entities(self) -> list[Auction]:
+        """Every aggregate loaded or saved through this repository, each exactly once."""
+        return list(self._identity_map.values())
+
+    def mark(self) -> int:
+        """A position in the log of loaded or saved aggregates, see `touched_since` and `forget_since`."""
+        return len(self._touched)
+
+    def touched_since(self, mark: int) -> list[Auction]:
+        """The aggregates loaded or saved after `mark`, each once."""
+        ids = dict.fromkeys(self._touched[mark:])
+        return [self._identity_map[auction_id] for auction_id in ids if auction_id in self._identity_map]
+
+    def forget_since(self, mark: int):
+        """
+        Drops the aggregates loaded or saved after `mark`, with their pending events, after the
+        changes made to them were rolled back. The next `find_by_id` reloads them from the database.
+        """
+        for auction_id in dict.fromkeys(self._touched[mark:]):
+            auction = self._identity_map.pop(auction_id, None)
+            if auction:
+                auction.events.clear()
+            self._forget(auction_id)
+        del self._touched[mark:]
+
+    def _track(self, auction: Auction):
+        auction_id = auction.id.value
+        self._identity_map[auction_id] = auction
+        self._touched.append(auction_id)
+        self._visited.add(auction_id)
+
+    def _forget(self, auction_id: str):
+        """Drops whatever a subclass remembers about the stored state of the auction."""
+
+    def is_persisted(self, auction: Auction) -> bool:
+        """Whether the aggregate is stored exactly as it is in memory."""
+        return auction.version > 0 and not self.is_dirty(auction)
+
+    def save(self, auction: Auction) -> None:
+        self._track(auction)
+        with span("repository.write", auction_id=auction.id.value):
+            self._write(auction)
+
+    def flush(self):
+        """Writes every loaded aggregate that was modified without being saved."""
+        for auction in self.seen_entities:
+            if self.is_dirty(auction):
+                with span("repository.write", auction_id=auction.id.value):
+                    self._write(auction)
+
+    def find_by_id(self, auction_id: AuctionID) -> Auction | None:
+        # Identity map: within a unit of work an auction is loaded once, and always the same instance
+        auction = self._identity_map.get(auction_id.value)
+        if auction:
+            self._touched.append(auction_id.value)
+            return auction
+
+        with span("repository.find_by_id", auction_id=auction_id.value) as current:
+            # The cache holds committed state, so it cannot answer for auctions this transaction already touched
+            cached = None
+            if self.aggregate_cache and auction_id.value not in self._visited:
+                cached = self.aggregate_cache.get(auction_id.value)
+            if cached:
+                current.set(source="aggregate_cache")
+                auction = Auction(item_id=cached.item_id, starting_price=cached.starting_price)
+                auction.id = auction_id
+                auction.is_active = cached.is_active
+                auction.version = cached.version
+                auction.restore_bids_lazily(cached.bid_count, cached.highest_bid, self._bid_loader(auction_id.value))
+            else:
+                current.set(source="database")
+                auction = self._load(auction_id)
+                if auction is None:
+                    return None
+
+        self._track(auction)
+        self._loaded(auction)
+        return auction
+
+    def close(self):
+        """Called when the unit of work ends. Bid histories not loaded by then can no longer be."""
+        self._closed = True
+
+    def _bid_loader(self, auction_id: str) -> Callable[[], Iterable[Bid]]:
+        """Loads the bid history of a lazily restored auction, on this repository's connection while it is still open."""
+
+        def load() -> Iterable[Bid]:
+            if self._closed:
+                raise DetachedAggregateException(f"The bid history of auction {auction_id} was not loaded before its unit of work ended")
+            return self._load_bids(auction_id)
+
+        return load
+
+    def _loaded(self, auction: Auction):
+        """Called with each auction read from the cache or the database, before it is handed out."""
+
+    @abstractmethod
+    def is_dirty(self, auction: Auction) -> bool:
+        """Whether the aggregate has changes this repository has not stored yet."""
+
+    @abstractmethod
+    def _write(self, auction: Auction):
+        """Stores the changes of the aggregate, raising ConcurrencyException if it is stale."""
+
+    @abstractmethod
+    def _load(self, auction_id: AuctionID) -> Auction | None:
+        """Rehydrates the auction from the database."""
+
+    @abstractmethod
+    def _load_bids(self, auction_id: str) -> Iterable[Bid]:
+        """The full bid history, oldest first."""
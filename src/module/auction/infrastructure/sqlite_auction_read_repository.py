@@ -1,51 +1,222 @@
+import base64
+import binascii
 import json
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
-from module.auction.application.read_repository import AuctionReadRepository
+from module.auction.application.query import AUCTION_SORT_ORDERS
+from module.auction.application.read_repository import (
+    AuctionPageStream,
+    AuctionReadRepository,
+    AuctionVersion,
+    InvalidCursorError,
+    PageVersion,
+)
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool
+
+
+def _encode_cursor(sort: str, value: Any, auction_id: str) -> str:
+    raw = json.dumps([sort, value, auction_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, auction_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+    if cursor_sort != sort or not isinstance(auction_id, str):
+        raise InvalidCursorError("Pagination cursor does not match the requested sort order")
+    return value, auction_id
+
+
+# Columns of the auction_summary read model returned for each auction
+_SUMMARY_COLUMNS = "id, item_id, starting_price, is_active, current_price, bid_count, highest_bidder, last_bid_at"
+
+# How to tell that an auction exists, read its bids, count them (with the read model's count), and derive its
+# summary columns, from the write side: the state tables or the event store
+_STATE_QUERIES = (
+    "SELECT 1 FROM auctions WHERE id = ?",
+    "SELECT bidder_id, amount FROM bids WHERE auction_id = ? ORDER BY sequence",
+    "SELECT s.bid_count, a.bid_count FROM auctions a LEFT JOIN auction_summary s ON s.id = a.id WHERE a.id = ?",
+    """
+    SELECT a.id, a.item_id, a.starting_price, a.is_active, COALESCE(b.amount, a.starting_price) AS current_price, a.bid_count,
+           b.bidder_id AS highest_bidder, b.placed_at AS last_bid_at
+    FROM auctions a
+    LEFT JOIN bids b ON b.auction_id = a.id AND b.sequence = a.bid_count
+    WHERE a.id = ?
+""",
+)
+_EVENT_STORE_QUERIES = (
+    "SELECT 1 FROM auction_events WHERE auction_id = ? AND sequence = 1",
+    """
+    SELECT json_extract(payload, '$.bidder_id') AS bidder_id, json_extract(payload, '$.amount') AS amount
+    FROM auction_events
+    WHERE auction_id = ? AND event_type = 'BidPlaced'
+    ORDER BY sequence
+""",
+    # The last event of the stream: the creation is at 1, so the bid count is one less
+    """
+    SELECT s.bid_count, e.sequence - 1
+    FROM auction_events e LEFT JOIN auction_summary s ON s.id = e.auction_id
+    WHERE e.auction_id = ?
+    ORDER BY e.sequence DESC LIMIT 1
+""",
+    # The stream's creation event, joined with its last event if that is a bid
+    """
+    SELECT c.auction_id AS id, json_extract(c.payload, '$.item_id') AS item_id, json_extract(c.payload, '$.starting_price') AS starting_price,
+           1 AS is_active, COALESCE(json_extract(b.payload, '$.amount'), json_extract(c.payload, '$.starting_price')) AS current_price,
+           COALESCE(json_extract(b.payload, '$.sequence'), 0) AS bid_count, json_extract(b.payload, '$.bidder_id') AS highest_bidder,
+           json_extract(b.payload, '$.occurred_at') AS last_bid_at
+    FROM auction_events c
+    LEFT JOIN auction_events b ON b.auction_id = c.auction_id AND b.event_type = 'BidPlaced'
+        AND b.sequence = (SELECT MAX(sequence) FROM auction_events WHERE auction_id = c.auction_id)
+    WHERE c.auction_id = ? AND c.sequence = 1
+""",
+)
 
 
 class SQLiteAuctionReadRepository(AuctionReadRepository):
     """
     Infrastructure implementation of the Read Repository using SQLite.
     Bypasses the Domain Model for performance and returns simple DTOs (dicts).
+    Auctions are read from the `auction_summary` projection, bids from the `bids` write table
+    (or the BidPlaced events, with `event_sourced`).
+    A single auction whose summary is missing or behind its bids, because the projection has not applied the latest
+    events yet, is derived from the write side instead, so an auction can be read back as soon as it is written.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: SQLiteConnectionPool | None = None, event_sourced: bool = False):
         self.db_path = db_path
+        # Optional pool of (ideally read-only) connections; without one, each query opens its own
+        self.pool = pool
+        queries = _EVENT_STORE_QUERIES if event_sourced else _STATE_QUERIES
+        self._exists_query, self._bids_query, self._version_query, self._auction_query = queries
+
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        if self.pool:
+            with self.pool.connection() as conn:
+                conn.row_factory = sqlite3.Row  # Access columns by name
+                yield conn
+            return
 
-    def _get_connection(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row  # Access columns by name
-        return conn
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def list_auctions(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> dict[str, Any]:
+        page = self.stream_auctions(limit=limit, cursor=cursor, is_active=is_active, sort=sort)
+        items = list(page.items)
+        return {"items": items, "next_cursor": page.next_cursor}
 
-    def list_auctions(self) -> list[dict[str, Any]]:
+    def stream_auctions(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> AuctionPageStream:
+        """
+        Keyset pagination: every page is a range scan over an index on the sort key,
+        continuing after the (sort value, id) of the previous page's last row.
+        Rows are read from the cursor as the page is iterated.
+        """
+        sql, args = self._page_query(_SUMMARY_COLUMNS, limit, cursor, is_active, sort)
+        column = sort.lstrip("-")
+
+        def rows() -> Iterator[dict[str, Any]]:
+            with self._get_connection() as conn:
+                last = None
+                for count, row in enumerate(conn.execute(sql, args)):
+                    if count == limit:
+                        page.next_cursor = _encode_cursor(sort, last[column], last["id"])
+                        break
+                    last = dict(row)
+                    last["is_active"] = bool(last["is_active"])
+                    yield last
+
+        page = AuctionPageStream(rows())
+        return page
+
+    def get_page_version(self, limit: int = 50, cursor: str | None = None, is_active: bool | None = None, sort: str = "id") -> PageVersion:
+        # The same range scan, reading only what the page's representation depends on
+        sql, args = self._page_query("id, bid_count", limit, cursor, is_active, sort)
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, item_id, starting_price, is_active FROM auctions")
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return tuple((row[0], row[1]) for row in conn.execute(sql, args))
+
+    @staticmethod
+    def _page_query(columns: str, limit: int, cursor: str | None, is_active: bool | None, sort: str) -> tuple[str, list[Any]]:
+        if sort not in AUCTION_SORT_ORDERS:
+            raise ValueError(f"Unsupported sort order: {sort}")
+        descending = sort.startswith("-")
+        column = sort.lstrip("-")
+        comparison = "<" if descending else ">"
+        direction = "DESC" if descending else "ASC"
+
+        conditions: list[str] = []
+        args: list[Any] = []
+        if is_active is not None:
+            conditions.append("is_active = ?")
+            args.append(1 if is_active else 0)
+        if cursor:
+            last_value, last_id = _decode_cursor(cursor, sort)
+            if column == "id":
+                conditions.append(f"id {comparison} ?")
+                args.append(last_id)
+            else:
+                conditions.append(f"({column}, id) {comparison} (?, ?)")
+                args.extend([last_value, last_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order_by = f"id {direction}" if column == "id" else f"{column} {direction}, id {direction}"
+        # Fetch one extra row to learn whether there is a next page
+        return f"SELECT {columns} FROM auction_summary {where} ORDER BY {order_by} LIMIT ?", [*args, limit + 1]
 
     def get_auction(self, auction_id: str) -> dict[str, Any] | None:
+        with self._get_connection() as conn:
+            # One read transaction, so the summary columns and the bids come from the same snapshot
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute(f"SELECT {_SUMMARY_COLUMNS} FROM auction_summary WHERE id = ?", (auction_id,)).fetchone()
+                bids = self._fetch_bids(conn, auction_id)
+                if row is None or row["bid_count"] != len(bids):
+                    row = conn.execute(self._auction_query, (auction_id,)).fetchone()
+            finally:
+                conn.rollback()
+        if not row:
+            return None
+
+        data = dict(row)
+        data["is_active"] = bool(data["is_active"])
+        data["bids"] = bids
+        return data
+
+    def list_bids(self, auction_id: str) -> list[dict[str, Any]] | None:
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM auctions WHERE id = ?", (auction_id,))
-            row = cursor.fetchone()
-            if not row:
+            cursor.execute(self._exists_query, (auction_id,))
+            if not cursor.fetchone():
                 return None
+            return self._fetch_bids(conn, auction_id)
 
-            data = dict(row)
-            # Parse JSON bids
-            if data.get("bids"):
-                data["bids"] = json.loads(data["bids"])
-            else:
-                data["bids"] = []
+    def stream_bids(self, auction_id: str) -> Iterator[dict[str, Any]] | None:
+        with self._get_connection() as conn:
+            if not conn.execute(self._exists_query, (auction_id,)).fetchone():
+                return None
+        return self._stream_bids(auction_id)
+
+    def _stream_bids(self, auction_id: str) -> Iterator[dict[str, Any]]:
+        with self._get_connection() as conn:
+            for row in conn.execute(self._bids_query, (auction_id,)):
+                yield dict(row)
 
-            data["is_active"] = bool(data["is_active"])
-            return data
+    def get_auction_version(self, auction_id: str) -> AuctionVersion | None:
+        with self._get_connection() as conn:
+            row = conn.execute(self._version_query, (auction_id,)).fetchone()
+        return AuctionVersion(row[0], row[1]) if row else None
 
-    def list_bids(self, auction_id: str) -> list[dict[str, Any]] | None:
-        auction = self.get_auction(auction_id)
-        if not auction:
-            return None
-        return auction.get("bids", [])
+    def _fetch_bids(self, conn: sqlite3.Connection, auction_id: str) -> list[dict[str, Any]]:
+        cursor = conn.cursor()
+        cursor.execute(self._bids_query, (auction_id,))
+        return [dict(row) for row in cursor.fetchall()]
@@ -0,0 +1,144 @@
+import logging
+import sqlite3
+from collections.abc import Callable
+from typing import Any
+
+from module.auction.application.projection import AuctionSummaryProjection
+from module.auction.domain.event import AuctionCreated, BidPlaced
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool
+from shared.application.event_bus import EventBus
+from shared.application.metrics import MetricsRegistry
+from shared.domain.event import Event
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "id, item_id, starting_price, is_active, current_price, bid_count, highest_bidder, last_bid_at"
+
+# Every summary row, derived from the write side: each auction joined with its last bid
+_STATE_SUMMARIES = """
+    SELECT a.id, a.item_id, a.starting_price, a.is_active, COALESCE(b.amount, a.starting_price) AS current_price, a.bid_count,
+           b.bidder_id AS highest_bidder, b.placed_at AS last_bid_at
+    FROM auctions a
+    LEFT JOIN bids b ON b.auction_id = a.id AND b.sequence = a.bid_count
+"""
+# Or from the event store: each stream's creation event, joined with its last event if that is a bid
+_EVENT_STORE_SUMMARIES = """
+    SELECT c.auction_id AS id, json_extract(c.payload, '$.item_id') AS item_id, json_extract(c.payload, '$.starting_price') AS starting_price,
+           1 AS is_active, COALESCE(json_extract(b.payload, '$.amount'), json_extract(c.payload, '$.starting_price')) AS current_price,
+           COALESCE(json_extract(b.payload, '$.sequence'), 0) AS bid_count, json_extract(b.payload, '$.bidder_id') AS highest_bidder,
+           json_extract(b.payload, '$.occurred_at') AS last_bid_at
+    FROM auction_events c
+    LEFT JOIN auction_events b ON b.auction_id = c.auction_id AND b.event_type = 'BidPlaced'
+        AND b.sequence = (SELECT MAX(sequence) FROM auction_events WHERE auction_id = c.auction_id)
+    WHERE c.sequence = 1
+"""
+
+
+class SQLiteAuctionSummaryProjection(AuctionSummaryProjection):
+    """
+    Maintains the `auction_summary` read model, one row per auction, from domain events.
+    Handlers are idempotent (a BidPlaced only applies if its sequence is newer than the row's
+    bid_count), so at-least-once delivery from the outbox is safe.
+    `on_applied` callbacks run after an event has been committed to the read model.
+    With `event_sourced`, rebuilds read the event store rather than the state tables.
+    With `metrics`, batches that failed to apply are counted: the rows they missed stay behind until `catch_up_on` runs.
+    """
+
+    def __init__(self, pool: SQLiteConnectionPool, event_sourced: bool = False, metrics: MetricsRegistry | None = None):
+        self.pool = pool
+        self.event_sourced = event_sourced
+        self.on_applied: list[Callable[[Event], Any]] = []
+        self._failures = None
+        if metrics:
+            family = metrics.counter("projection_failures_total", "Event batches a projection failed to apply.", ("projection",))
+            self._failures = family.labels("auction_summary")
+
+    @staticmethod
+    def create_schema(connection: sqlite3.Connection):
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS auction_summary (
+                id TEXT PRIMARY KEY,
+                item_id TEXT,
+                starting_price REAL,
+                is_active INTEGER,
+                current_price REAL,
+                bid_count INTEGER NOT NULL DEFAULT 0,
+                highest_bidder TEXT,
+                last_bid_at TEXT
+            )
+        """)
+        # Indexes backing keyset pagination of the auction list (the primary key covers sorting by id)
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_summary_active_id ON auction_summary (is_active, id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_summary_price_id ON auction_summary (starting_price, id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_summary_active_price_id ON auction_summary (is_active, starting_price, id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_summary_current_price_id ON auction_summary (current_price, id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_summary_active_current_price_id ON auction_summary (is_active, current_price, id)")
+
+    def subscribe(self, event_bus: EventBus):
+        # As a batch subscriber, all the events of one commit are applied in a single transaction
+        event_bus.subscribe_batch((AuctionCreated, BidPlaced), self.apply)
+
+    def apply(self, events: list[Event]):
+        try:
+            self._apply(events)
+        except Exception:
+            if self._failures:
+                self._failures.inc()
+            raise
+        for event in events:
+            self._applied(event)
+
+    def _apply(self, events: list[Event]):
+        with self.pool.connection() as conn, conn:
+            for event in events:
+                if isinstance(event, AuctionCreated):
+                    conn.execute(
+                        """
+                        INSERT OR IGNORE INTO auction_summary (id, item_id, starting_price, is_active, current_price, bid_count)
+                        VALUES (?, ?, ?, 1, ?, 0)
+                    """,
+                        (event.auction_id, event.item_id, event.starting_price, event.starting_price),
+                    )
+                elif isinstance(event, BidPlaced):
+                    conn.execute(
+                        """
+                        UPDATE auction_summary
+                        SET current_price = ?, bid_count = ?, highest_bidder = ?, last_bid_at = ?
+                        WHERE id = ? AND bid_count < ?
+                    """,
+                        (event.amount, event.sequence, event.bidder_id, event.occurred_at, event.auction_id, event.sequence),
+                    )
+
+    def _applied(self, event: Event):
+        for callback in self.on_applied:
+            callback(event)
+
+    def rebuild(self) -> int:
+        """Re-derives every summary row from the write side, in one transaction."""
+        with self.pool.connection() as conn, conn:
+            self.rebuild_on(conn, self.event_sourced)
+            count = conn.execute("SELECT COUNT(*) FROM auction_summary").fetchone()[0]
+        logger.info(f"🔁 Rebuilt auction_summary: {count} auctions.")
+        return count
+
+    @staticmethod
+    def rebuild_on(connection: sqlite3.Connection, event_sourced: bool = False):
+        connection.execute("DELETE FROM auction_summary")
+        connection.execute(f"INSERT INTO auction_summary ({_COLUMNS}) {_EVENT_STORE_SUMMARIES if event_sourced else _STATE_SUMMARIES}")
+
+    @staticmethod
+    def catch_up_on(connection: sqlite3.Connection, event_sourced: bool = False) -> int:
+        """
+        Derives the summary rows that are missing or behind the write side, e.g. after an apply failed, and returns
+        how many. Rows that are up to date are left alone, so this is cheap to run at every startup.
+        """
+        cursor = connection.execute(f"""
+            INSERT OR REPLACE INTO auction_summary ({_COLUMNS})
+            SELECT w.* FROM ({_EVENT_STORE_SUMMARIES if event_sourced else _STATE_SUMMARIES}) w
+            LEFT JOIN auction_summary s ON s.id = w.id
+            WHERE s.id IS NULL OR s.bid_count < w.bid_count
+        """)
+        if cursor.rowcount:
+            logger.warning(f"🩹 Caught up {cursor.rowcount} auction_summary rows with the write side.")
+        return cursor.rowcount
@@ -1,47 +1,202 @@
 import logging
 import sqlite3
+import time
+from collections.abc import Callable
 from types import TracebackType
 
 from module.auction.application.unit_of_work import AuctionUnitOfWork
-from module.auction.application.write_repository import AuctionWriteRepository
+from module.auction.domain.entity import Auction
+from module.auction.infrastructure.auction_aggregate_cache import AuctionAggregateCache
+from module.auction.infrastructure.identity_map_repository import IdentityMapRepository
 from module.auction.infrastructure.sqlite_auction_write_repository import SQLiteAuctionWriteRepository
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool
+from module.auction.infrastructure.sqlite_outbox import SQLiteOutbox
 from shared.application.event_bus import EventBus
+from shared.application.metrics import MetricsRegistry
+from shared.application.tracing import span
+from shared.domain.event import Event
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
 class SQLiteAuctionUnitOfWork(AuctionUnitOfWork):
-    def __init__(self, event_bus: EventBus, db_path: str = "auctions.db"):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        db_path: str = "auctions.db",
+        pool: SQLiteConnectionPool | None = None,
+        outbox: SQLiteOutbox | None = None,
+        aggregate_cache: AuctionAggregateCache | None = None,
+        repository_factory: Callable[..., IdentityMapRepository] = SQLiteAuctionWriteRepository,
+        metrics: MetricsRegistry | None = None,
+    ):
         self.event_bus = event_bus
         self.db_path = db_path
+        # With a pool, connections are borrowed and the schema is assumed to exist already
+        self.pool = pool
+        # With an outbox, events are stored in the transaction and delivered by an OutboxRelay
+        self.outbox = outbox
+        # With an aggregate cache, committed auctions are written through to it, and evicted on rollback
+        self.aggregate_cache = aggregate_cache
+        # Builds the write repository on the UoW's connection: the state tables, or an event-sourced store
+        self.repository_factory = repository_factory
+        # With metrics, commits are timed (flush, COMMIT and publishing) and rollbacks counted, of savepoints too
+        self.metrics = metrics
+        if metrics:
+            self._commit_durations = metrics.histogram("uow_commit_duration_seconds", "Time to commit a unit of work.").labels()
+            self._rollbacks = metrics.counter("uow_rollbacks_total", "Units of work (or nested scopes) rolled back.", ("scope",))
         self.connection: sqlite3.Connection | None = None
-        self.repo: AuctionWriteRepository = None  # type: ignore
+        self.repo: IdentityMapRepository = None  # type: ignore
+        # Nesting depth, and for each open savepoint the repository mark it started at
+        self._depth = 0
+        self._savepoints: list[int] = []
+        # Events already collected from entities seen before the latest savepoint
+        self._pending_events: list[Event] = []
 
     def __enter__(self) -> "AuctionUnitOfWork":
-        self.connection = sqlite3.connect(self.db_path)
+        if self._depth:
+            self._begin_savepoint()
+            return self
+
+        if self.pool:
+            self.connection = self.pool.checkout()
+        else:
+            self.connection = sqlite3.connect(self.db_path)
         # Use the tracking repo so UoW can see the entities
-        self.repo = SQLiteAuctionWriteRepository(self.connection)
+        self.repo = self.repository_factory(self.connection, create_schema=self.pool is None, aggregate_cache=self.aggregate_cache)
+        if self.outbox and self.pool is None:
+            self.outbox.create_schema(self.connection)
+        self._depth = 1
+        self._savepoints = []
+        self._pending_events = []
         return self
 
     def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
-        super().__exit__(exc_type, exc_value, traceback)
-        if self.connection:
-            self.connection.close()
+        if self._depth > 1:
+            failed = exc_type is not None
+            if not failed:
+                # Write what the scope changed now, so a conflict only undoes this scope
+                try:
+                    self.repo.flush()
+                except Exception:
+                    self._end_savepoint(failed=True)
+                    raise
+            self._end_savepoint(failed)
+            return
+
+        self._depth = 0
+        try:
+            super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            # Aggregates handed out must not reach the connection once it is closed or back in the pool
+            if self.repo:
+                self.repo.close()
+            if self.connection and self.pool:
+                self.pool.checkin(self.connection)
+                self.connection = None
+            elif self.connection:
+                self.connection.close()
+
+    def _begin_savepoint(self):
+        # An explicit BEGIN first, so releasing the savepoint can never commit on its own
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+        self.connection.execute(f"SAVEPOINT uow_{self._depth}")
+        # Set aside the events raised so far, so a failing scope only has to drop what it raised itself.
+        # Only entities touched since the previous savepoint can hold events, which keeps batches linear.
+        start = self._savepoints[-1] if self._savepoints else 0
+        self._pending_events.extend(self._collect_events(self.repo.touched_since(start)))
+        self._savepoints.append(self.repo.mark())
+        self._depth += 1
+
+    def _end_savepoint(self, failed: bool):
+        self._depth -= 1
+        name = f"uow_{self._depth}"
+        start = self._savepoints.pop()
+        if failed:
+            self.connection.execute(f"ROLLBACK TO {name}")
+            # Forget the entities touched inside the scope with their events: they hold changes that were undone
+            self.repo.forget_since(start)
+            if self.metrics:
+                self._rollbacks.labels("savepoint").inc()
+            logger.warning(f"↩️ UoW rolled back to savepoint {name}.")
+        self.connection.execute(f"RELEASE {name}")
+
+    @staticmethod
+    def _collect_events(entities: list[Auction]) -> list[Event]:
+        events: list[Event] = []
+        for entity in entities:
+            if entity.events:
+                events.extend(entity.events)
+                entity.events.clear()
+        return events
 
     def commit(self):
-        # 1. Collect events from ALL loaded entities in the repo
-        # Use the 'seen_entities' list which tracks objects loaded or saved by the repo
-        for auction in self.repo.seen_entities:
-            if auction.events:
-                self.event_bus.publish(list(auction.events))
-                auction.events.clear()
+        with span("uow.commit"):
+            if not self.metrics:
+                self._commit()
+                return
+            started = time.perf_counter()
+            try:
+                self._commit()
+            finally:
+                self._commit_durations.observe(time.perf_counter() - started)
 
+    def _commit(self):
+        # 1. Write the aggregates that were modified but not saved (unchanged ones cost nothing)
+        try:
+            if self.repo:
+                with span("uow.flush"):
+                    self.repo.flush()
+        except Exception:
+            self.rollback()
+            raise
+
+        # 2. Collect events from ALL loaded entities in the repo
+        # Use the identity map ('seen_entities') which tracks objects loaded or saved by the repo
+        # (plus those already set aside when nested scopes began)
+        events = self._pending_events + self._collect_events(self.repo.seen_entities)
+        self._pending_events = []
+
+        # 3a. Outbox: the events become durable atomically with the changes that raised them
+        if self.outbox:
+            if events:
+                self.outbox.append(self.connection, events)
+            self.connection.commit()
+            self._write_through()
+            if events:
+                self.outbox.notify()
+            logger.info("✅ UoW Committed: Database updated & Events stored in the outbox.")
+            return
+
+        # 3b. Make the changes durable first, so subscribers never see events for a write that was lost
         if self.connection:
             self.connection.commit()
+        self._write_through()
+
+        # 4. Publish. The write already succeeded, so a failing subscriber is logged rather than raised.
+        if events:
+            try:
+                self.event_bus.publish(events)
+            except Exception:
+                logger.exception("Publishing events failed after commit.")
         logger.info("✅ UoW Committed: Database updated & Events published.")
 
     def rollback(self):
         if self.connection:
-            self.connection.rollback()
+            with span("uow.rollback"):
+                self.connection.rollback()
+        if self.metrics:
+            self._rollbacks.labels("transaction").inc()
+        # The in-memory aggregates may be ahead of what is stored now
+        if self.aggregate_cache and self.repo:
+            for auction in self.repo.seen_entities:
+                self.aggregate_cache.evict(auction.id.value)
         logger.warning("🛑 UoW Rolled back due to error.")
+
+    def _write_through(self):
+        if self.aggregate_cache:
+            for auction in self.repo.seen_entities:
+                if self.repo.is_persisted(auction):
+                    self.aggregate_cache.put(auction)
@@ -1,52 +1,188 @@
 import json
 import logging
 import sqlite3
+from typing import Any
 
-from module.auction.application.write_repository import AuctionWriteRepository
+from module.auction.domain.bid_history import BidHistory
 from module.auction.domain.entity import Auction, Bid
+from module.auction.domain.event import BidPlaced
 from module.auction.domain.value_object import AuctionID
+from module.auction.infrastructure.auction_aggregate_cache import AuctionAggregateCache
+from module.auction.infrastructure.identity_map_repository import IdentityMapRepository
+from shared.application.exception import ConcurrencyException
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
-class SQLiteAuctionWriteRepository(AuctionWriteRepository):
-    def __init__(self, connection: sqlite3.Connection):
+class SQLiteAuctionWriteRepository(IdentityMapRepository):
+    """Stores each auction as a row of `auctions` (its current state) plus its rows in `bids`."""
+
+    def __init__(self, connection: sqlite3.Connection, create_schema: bool = True, aggregate_cache: AuctionAggregateCache | None = None):
+        super().__init__(aggregate_cache)
         self.connection = connection
-        self.seen_entities: list[Auction] = []
-        self._create_table()
+        # AuctionID value -> the columns as last read or written, to tell which ones changed
+        self._stored: dict[str, dict[str, Any]] = {}
+        if create_schema:
+            self._create_tables(connection)
 
-    def _create_table(self):
-        cursor = self.connection.cursor()
+    @classmethod
+    def create_schema(cls, connection: sqlite3.Connection):
+        """Creates the tables and brings an older database up to date. Run once at startup, not per unit of work."""
+        cls._create_tables(connection)
+        cls._migrate_legacy_schema(connection)
+        # The auction list is served from auction_summary now, so these would only slow down writes
+        connection.execute("DROP INDEX IF EXISTS idx_auctions_active_id")
+        connection.execute("DROP INDEX IF EXISTS idx_auctions_price_id")
+        connection.execute("DROP INDEX IF EXISTS idx_auctions_active_price_id")
+
+    @staticmethod
+    def _create_tables(connection: sqlite3.Connection):
+        cursor = connection.cursor()
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS auctions (
                 id TEXT PRIMARY KEY,
                 item_id TEXT,
                 starting_price REAL,
                 is_active INTEGER,
-                bids TEXT
+                bid_count INTEGER NOT NULL DEFAULT 0,
+                version INTEGER NOT NULL DEFAULT 1
             )
         """)
+        # Append-only bid history. A new bid is a single row insert, never a rewrite.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS bids (
+                auction_id TEXT NOT NULL,
+                sequence INTEGER NOT NULL,
+                bidder_id TEXT NOT NULL,
+                amount REAL NOT NULL,
+                placed_at TEXT,
+                PRIMARY KEY (auction_id, sequence)
+            ) WITHOUT ROWID
+        """)
         # Note: We do NOT commit here, the UoW manages the commit
 
+    @staticmethod
+    def _migrate_legacy_schema(connection: sqlite3.Connection):
+        """
+        Adds the columns older databases lack. Those also stored the whole bid history as a
+        JSON array in `auctions.bids`: any such history is moved into the `bids` table and the column dropped.
+        """
+        cursor = connection.cursor()
+        if "placed_at" not in {row[1] for row in cursor.execute("PRAGMA table_info(bids)")}:
+            cursor.execute("ALTER TABLE bids ADD COLUMN placed_at TEXT")
+
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(auctions)")}
+        if "bid_count" not in columns:
+            cursor.execute("ALTER TABLE auctions ADD COLUMN bid_count INTEGER NOT NULL DEFAULT 0")
+        if "version" not in columns:
+            cursor.execute("ALTER TABLE auctions ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        if "bids" not in columns:
+            return
+
+        legacy_rows = cursor.execute("SELECT id, bids FROM auctions WHERE bids IS NOT NULL").fetchall()
+        for auction_id, bids_json in legacy_rows:
+            bids_data = json.loads(bids_json) if bids_json else []
+            cursor.executemany(
+                "INSERT OR IGNORE INTO bids (auction_id, sequence, bidder_id, amount) VALUES (?, ?, ?, ?)",
+                [(auction_id, sequence, b["bidder_id"], b["amount"]) for sequence, b in enumerate(bids_data, start=1)],
+            )
+            cursor.execute("UPDATE auctions SET bid_count = ?, bids = NULL WHERE id = ?", (len(bids_data), auction_id))
+
+        if legacy_rows:
+            logger.info(f"📦 Migrated bid history of {len(legacy_rows)} auctions to the bids table.")
+        # SQLite only drops columns since 3.35; before that the emptied column stays, always NULL and never read
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            cursor.execute("ALTER TABLE auctions DROP COLUMN bids")
+
+    # Change tracking
+
+    def _loaded(self, auction: Auction):
+        self._stored[auction.id.value] = self._columns(auction)
+
+    def _forget(self, auction_id: str):
+        self._stored.pop(auction_id, None)
+
+    @staticmethod
+    def _columns(auction: Auction) -> dict[str, Any]:
+        return {
+            "item_id": auction.item_id,
+            "starting_price": auction.starting_price,
+            "is_active": 1 if auction.is_active else 0,
+            "bid_count": auction.bid_count,
+        }
+
+    def is_dirty(self, auction: Auction) -> bool:
+        """Whether the aggregate differs from what this repository last read or wrote."""
+        return self._stored.get(auction.id.value) != self._columns(auction)
+
+    def _load_stored(self, auction_id: str) -> dict[str, Any]:
+        row = self.connection.execute("SELECT item_id, starting_price, is_active, bid_count FROM auctions WHERE id = ?", (auction_id,)).fetchone()
+        return dict(zip(("item_id", "starting_price", "is_active", "bid_count"), row, strict=True)) if row else {"bid_count": 0}
+
     def save(self, auction: Auction) -> None:
+        """
+        Inserts a new auction, or writes the changed columns and new bids of a stored one, only if it is
+        still at the version it was loaded at (compare-and-swap). An unchanged auction costs no SQL.
+        Raises ConcurrencyException when another writer got there first.
+        """
+        super().save(auction)
+
+    def _write(self, auction: Auction):
         cursor = self.connection.cursor()
-        # Serialize bids
-        bids_data: list[dict[str, str | float]] = [{"bidder_id": b.bidder_id, "amount": b.amount} for b in auction.bids]
-        bids_json = json.dumps(bids_data)
+        auction_id = auction.id.value
+        columns = self._columns(auction)
+
+        if auction.version == 0:
+            persisted = 0
+            cursor.execute(
+                "INSERT INTO auctions (item_id, starting_price, is_active, bid_count, id, version) VALUES (?, ?, ?, ?, ?, 1)",
+                (*columns.values(), auction_id),
+            )
+        else:
+            stored = self._stored.get(auction_id)
+            if stored is None:
+                stored = self._load_stored(auction_id)
+            changed = {name: value for name, value in columns.items() if stored.get(name) != value}
+            if not changed:
+                self._stored[auction_id] = columns
+                return
+            persisted = stored["bid_count"]
+            assignments = "".join(f"{name} = ?, " for name in changed)
+            cursor.execute(
+                f"UPDATE auctions SET {assignments}version = version + 1 WHERE id = ? AND version = ?",
+                (*changed.values(), auction_id, auction.version),
+            )
+            if cursor.rowcount == 0:
+                # Whatever we validated against is stale, so a retry must go back to the database
+                if self.aggregate_cache:
+                    self.aggregate_cache.evict(auction_id)
+                raise ConcurrencyException(f"Auction {auction_id} was modified concurrently (expected version {auction.version})")
+
+        # Append only the bids placed since the aggregate was loaded (or last saved),
+        # stamped with the time of their (still pending) BidPlaced event
+        new_bids = auction.bids_after(persisted)
+        if new_bids:
+            placed_at = {e.sequence: e.occurred_at for e in auction.events if isinstance(e, BidPlaced)}
+            cursor.executemany(
+                "INSERT INTO bids (auction_id, sequence, bidder_id, amount, placed_at) VALUES (?, ?, ?, ?, ?)",
+                [(auction_id, seq, b.bidder_id, b.amount, placed_at.get(seq)) for seq, b in enumerate(new_bids, start=persisted + 1)],
+            )
+        self._stored[auction_id] = columns
+        auction.version += 1
 
+    def _load(self, auction_id: AuctionID) -> Auction | None:
+        cursor = self.connection.cursor()
+        # Only the latest bid is needed to enforce the bidding rules
         cursor.execute(
             """
-            INSERT OR REPLACE INTO auctions (id, item_id, starting_price, is_active, bids)
-            VALUES (?, ?, ?, ?, ?)
+            SELECT a.id, a.item_id, a.starting_price, a.is_active, a.bid_count, b.bidder_id, b.amount, a.version
+            FROM auctions a
+            LEFT JOIN bids b ON b.auction_id = a.id AND b.sequence = a.bid_count
+            WHERE a.id = ?
         """,
-            (auction.id.value, auction.item_id, auction.starting_price, 1 if auction.is_active else 0, bids_json),
+            (auction_id.value,),
         )
-        self.seen_entities.append(auction)
-
-    def find_by_id(self, auction_id: AuctionID) -> Auction | None:
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT id, item_id, starting_price, is_active, bids FROM auctions WHERE id = ?", (auction_id.value,))
         row = cursor.fetchone()
 
         if not row:
@@ -59,11 +195,14 @@ class SQLiteAuctionWriteRepository(AuctionWriteRepository):
         # Patch ID (because __init__ generates a new random one)
         auction.id = AuctionID(row[0])
         auction.is_active = bool(row[3])
+        auction.version = row[7]
 
-        # Patch Bids
-        bids_data = json.loads(row[4])
-        auction.bids = [Bid(b["bidder_id"], b["amount"]) for b in bids_data]
-
-        if auction:
-            self.seen_entities.append(auction)
+        # Patch Bids: the history itself is only fetched if something reads `auction.bids`
+        highest_bid = Bid(row[5], row[6]) if row[4] else None
+        auction.restore_bids_lazily(row[4], highest_bid, self._bid_loader(auction_id.value))
         return auction
+
+    def _load_bids(self, auction_id: str) -> BidHistory:
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT bidder_id, amount FROM bids WHERE auction_id = ? ORDER BY sequence", (auction_id,))
+        return BidHistory.from_rows(cursor)
@@ -0,0 +1,210 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from module.auction.infrastructure.timed_sqlite_connection import SQLiteTimers, TimedConnection
+from shared.application.metrics import MetricSnapshot, MetricsRegistry, single_sample
+from shared.application.tracing import span
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class SQLitePragmas:
+    """Per-connection PRAGMA settings applied when the pool opens a connection."""
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -16000  # negative means KiB, so ~16 MB of page cache per connection
+    mmap_size: int = 64 * 1024 * 1024
+    busy_timeout: int = 5000  # milliseconds
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time snapshot of a pool's usage."""
+
+    size: int
+    max_size: int
+    idle: int
+    in_use: int
+    checkouts: int
+    waits: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class SQLiteConnectionPool:
+    """
+    Bounded pool of long-lived SQLite connections with checkout/checkin semantics.
+    Connections are opened lazily up to `size` and reused, so their page caches stay warm.
+    A `read_only` pool opens the database with `mode=ro`, for the query side.
+    Shared-cache `:memory:` databases are not supported; every connection must see the same file.
+    With `metrics`, connections time their statements and commits, connections in use are tracked and the pool stats
+    are reported on each scrape, labelled with `name`.
+    With `traced`, checkouts, statements and commits are recorded as spans when inside a trace.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 5,
+        read_only: bool = False,
+        pragmas: SQLitePragmas | None = None,
+        timeout: float = 30.0,
+        name: str = "sqlite",
+        metrics: MetricsRegistry | None = None,
+        traced: bool = False,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.db_path = db_path
+        self.max_size = size
+        self.read_only = read_only
+        self.pragmas = pragmas or SQLitePragmas()
+        self.timeout = timeout
+        self.name = name
+        self._timers = SQLiteTimers(metrics, name) if metrics else None
+        self._instrumented = metrics is not None or traced
+        self._in_use = None
+        if metrics:
+            self._in_use = metrics.gauge("sqlite_pool_connections_in_use", "Connections checked out of the pool.", ("pool",)).labels(name)
+            metrics.register_collector(self.collect)
+
+        # LIFO so the most recently used (warmest) connection is handed out first
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        factory = TimedConnection if self._instrumented else sqlite3.Connection
+        if self.read_only:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False, factory=factory)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=factory)
+        if self._timers:
+            conn.timers = self._timers
+        if not self.read_only:
+            conn.execute(f"PRAGMA journal_mode={self.pragmas.journal_mode}")
+            conn.execute(f"PRAGMA synchronous={self.pragmas.synchronous}")
+        conn.execute(f"PRAGMA cache_size={int(self.pragmas.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.pragmas.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.pragmas.busy_timeout)}")
+        return conn
+
+    def checkout(self) -> sqlite3.Connection:
+        with span("sqlite.checkout", pool=self.name) as current:
+            conn = self._checkout()
+            current.set(connections=len(self._all))
+            return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        if conn is None:
+            with self._lock:
+                can_grow = len(self._all) < self.max_size
+                if can_grow:
+                    conn = self._connect()
+                    self._all.append(conn)
+
+        wait = 0.0
+        if conn is None:
+            # Pool exhausted: block until another thread checks a connection in
+            started = time.perf_counter()
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty as e:
+                raise PoolTimeoutError(f"No SQLite connection available after {self.timeout}s") from e
+            wait = time.perf_counter() - started
+
+        with self._lock:
+            self._checkouts += 1
+            if wait:
+                self._waits += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+        if self._in_use:
+            self._in_use.inc()
+        return conn
+
+    def checkin(self, conn: sqlite3.Connection):
+        if self._in_use:
+            self._in_use.dec()
+        # Never hand out a connection with a half-finished transaction
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            size = len(self._all)
+            idle = self._idle.qsize()
+            return PoolStats(
+                size=size,
+                max_size=self.max_size,
+                idle=idle,
+                in_use=size - idle,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                total_wait_seconds=self._total_wait,
+                max_wait_seconds=self._max_wait,
+            )
+
+    def close(self):
+        """Closes idle connections now; connections still checked out are closed on checkin."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        logger.info(f"🔌 Closed SQLite connection pool for {self.db_path} (read_only={self.read_only}).")
+
+    def collect(self) -> list[MetricSnapshot]:
+        """The pool stats as metrics, for a MetricsRegistry collector (connections in use are a gauge of their own)."""
+        stats = self.stats()
+        pool = {"pool": self.name}
+        return [
+            single_sample("sqlite_pool_connections", "Connections the pool has opened.", "gauge", stats.size, pool),
+            single_sample("sqlite_pool_max_connections", "Connections the pool may open.", "gauge", stats.max_size, pool),
+            single_sample("sqlite_pool_checkouts_total", "Connections checked out of the pool.", "counter", stats.checkouts, pool),
+            single_sample("sqlite_pool_waits_total", "Checkouts that waited for a connection.", "counter", stats.waits, pool),
+            single_sample("sqlite_pool_wait_seconds_total", "Time spent waiting for a connection.", "counter", stats.total_wait_seconds, pool),
+            single_sample("sqlite_pool_max_wait_seconds", "Longest wait for a connection.", "gauge", stats.max_wait_seconds, pool),
+        ]
@@ -0,0 +1,166 @@
+import dataclasses
+import json
+import logging
+import sqlite3
+from typing import Any
+
+from module.auction.domain.bid_history import BidHistory
+from module.auction.domain.entity import Auction
+from module.auction.domain.event import AuctionCreated, BidPlaced
+from module.auction.domain.value_object import AuctionID, Bid
+from module.auction.infrastructure.auction_aggregate_cache import AuctionAggregateCache
+from module.auction.infrastructure.identity_map_repository import IdentityMapRepository
+from shared.application.exception import ConcurrencyException
+from shared.domain.event import Event
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+_EVENT_TYPES: dict[str, type[Event]] = {event_type.__name__: event_type for event_type in (AuctionCreated, BidPlaced)}
+
+
+def stream_position(event: Event) -> int:
+    """1-based position of an auction event in its stream: the creation first, then each bid in order."""
+    if isinstance(event, BidPlaced):
+        return event.sequence + 1
+    return 1
+
+
+class SQLiteEventSourcedAuctionRepository(IdentityMapRepository):
+    """
+    Stores each auction as its stream of domain events in `auction_events`, one row per event, plus a
+    snapshot of its state every `snapshot_every` events in `auction_snapshots`.
+    Loading reads the latest snapshot and replays the events after it; placing a bid inserts one row.
+    The aggregate's version is the position of its last stored event, and the (auction_id, sequence)
+    primary key rejects a second writer appending at the same position.
+    Only state changes recorded as events are stored.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        create_schema: bool = True,
+        aggregate_cache: AuctionAggregateCache | None = None,
+        snapshot_every: int = 20,
+    ):
+        super().__init__(aggregate_cache)
+        self.connection = connection
+        self.snapshot_every = snapshot_every
+        if create_schema:
+            self.create_schema(connection)
+
+    @staticmethod
+    def create_schema(connection: sqlite3.Connection):
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS auction_events (
+                auction_id TEXT NOT NULL,
+                sequence INTEGER NOT NULL,
+                event_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (auction_id, sequence)
+            ) WITHOUT ROWID
+        """)
+        # Only the latest snapshot of each auction is kept
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS auction_snapshots (
+                auction_id TEXT PRIMARY KEY,
+                sequence INTEGER NOT NULL,
+                state TEXT NOT NULL
+            )
+        """)
+
+    def is_dirty(self, auction: Auction) -> bool:
+        """Whether the aggregate is new or has events past its last stored one."""
+        return auction.version == 0 or any(stream_position(e) > auction.version for e in auction.events)
+
+    def save(self, auction: Auction) -> None:
+        """
+        Appends the events the auction recorded since it was loaded (or last saved), and a snapshot when
+        the stream crosses a multiple of `snapshot_every`. An auction without new events costs no SQL.
+        Raises ConcurrencyException when another writer got there first.
+        """
+        super().save(auction)
+
+    def _write(self, auction: Auction):
+        auction_id = auction.id.value
+        new_events = sorted((e for e in auction.events if stream_position(e) > auction.version), key=stream_position)
+        if auction.version == 0 and not (new_events and isinstance(new_events[0], AuctionCreated)):
+            # Built with the bare constructor: its stream still has to start with the creation
+            new_events.insert(0, AuctionCreated(auction_id=auction_id, item_id=auction.item_id, starting_price=auction.starting_price))
+        if not new_events:
+            return
+
+        try:
+            self.connection.executemany(
+                "INSERT INTO auction_events (auction_id, sequence, event_type, payload) VALUES (?, ?, ?, ?)",
+                [(auction_id, stream_position(e), type(e).__name__, json.dumps(dataclasses.asdict(e))) for e in new_events],
+            )
+        except sqlite3.IntegrityError as e:
+            # Whatever we validated against is stale, so a retry must go back to the database
+            if self.aggregate_cache:
+                self.aggregate_cache.evict(auction_id)
+            raise ConcurrencyException(f"Auction {auction_id} was modified concurrently (expected version {auction.version})") from e
+
+        version = stream_position(new_events[-1])
+        if version // self.snapshot_every > auction.version // self.snapshot_every:
+            self._snapshot(auction, version)
+        auction.version = version
+
+    def _snapshot(self, auction: Auction, sequence: int):
+        highest_bid = auction.highest_bid
+        state = {
+            "item_id": auction.item_id,
+            "starting_price": auction.starting_price,
+            "is_active": auction.is_active,
+            "bid_count": auction.bid_count,
+            "highest_bid": [highest_bid.bidder_id, highest_bid.amount] if highest_bid else None,
+        }
+        self.connection.execute(
+            "INSERT OR REPLACE INTO auction_snapshots (auction_id, sequence, state) VALUES (?, ?, ?)",
+            (auction.id.value, sequence, json.dumps(state)),
+        )
+
+    def _load(self, auction_id: AuctionID) -> Auction | None:
+        row = self.connection.execute("SELECT sequence, state FROM auction_snapshots WHERE auction_id = ?", (auction_id.value,)).fetchone()
+        snapshot_version, state = (row[0], json.loads(row[1])) if row else (0, {"is_active": True, "bid_count": 0, "highest_bid": None})
+
+        # Replay the tail of the stream on top of the snapshot; the aggregate is at its last event
+        tail = self.connection.execute(
+            "SELECT sequence, event_type, payload FROM auction_events WHERE auction_id = ? AND sequence > ? ORDER BY sequence",
+            (auction_id.value, snapshot_version),
+        )
+        version = snapshot_version
+        for event_version, event_type, payload in tail:
+            self._apply(state, _EVENT_TYPES[event_type](**json.loads(payload)))
+            version = event_version
+        if version == 0:
+            return None
+
+        auction = Auction(item_id=state["item_id"], starting_price=state["starting_price"])
+        auction.id = auction_id
+        auction.is_active = state["is_active"]
+        auction.version = version
+        highest_bid = Bid(*state["highest_bid"]) if state["highest_bid"] else None
+        auction.restore_bids_lazily(state["bid_count"], highest_bid, self._bid_loader(auction_id.value))
+        return auction
+
+    @staticmethod
+    def _apply(state: dict[str, Any], event: Event):
+        if isinstance(event, AuctionCreated):
+            state["item_id"] = event.item_id
+            state["starting_price"] = event.starting_price
+        elif isinstance(event, BidPlaced):
+            state["bid_count"] = event.sequence
+            state["highest_bid"] = [event.bidder_id, event.amount]
+
+    def _load_bids(self, auction_id: str) -> BidHistory:
+        cursor = self.connection.execute(
+            """
+            SELECT json_extract(payload, '$.bidder_id'), json_extract(payload, '$.amount')
+            FROM auction_events
+            WHERE auction_id = ? AND event_type = 'BidPlaced'
+            ORDER BY sequence
+        """,
+            (auction_id,),
+        )
+        return BidHistory.from_rows(cursor)
@@ -0,0 +1,231 @@
+import dataclasses
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool
+from shared.application.event_bus import EventBus
+from shared.domain.event import Event
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+class SQLiteOutbox:
+    """
+    Transactional outbox: domain events are inserted in the same SQLite transaction as the
+    aggregate changes that raised them, and delivered later by an OutboxRelay.
+    Delivered rows are deleted once every relay is past them, so the table only holds what is still pending.
+    Rows a relay could not decode or deliver are copied to `outbox_dead_letter` before it moves past them.
+    Only the event types passed in can be stored and restored.
+    """
+
+    def __init__(self, event_types: list[type[Event]]):
+        self.event_types = {event_type.__name__: event_type for event_type in event_types}
+        # Set after a commit that added events, so the relay can wake up before its next poll
+        self.pending = threading.Event()
+
+    def create_schema(self, connection: sqlite3.Connection):
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_type TEXT NOT NULL,
+                payload TEXT NOT NULL
+            )
+        """)
+        # One high-water mark per relay: the id of the last event it delivered
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS outbox_relay_state (
+                relay TEXT PRIMARY KEY,
+                last_delivered_id INTEGER NOT NULL
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS outbox_dead_letter (
+                relay TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                event_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                error TEXT NOT NULL,
+                failed_at TEXT NOT NULL,
+                PRIMARY KEY (relay, id)
+            )
+        """)
+
+    def append(self, connection: sqlite3.Connection, events: list[Event]):
+        """Adds the events to the caller's transaction. Does not commit."""
+        connection.executemany(
+            "INSERT INTO outbox (event_type, payload) VALUES (?, ?)",
+            [(type(event).__name__, json.dumps(dataclasses.asdict(event))) for event in events],
+        )
+
+    def notify(self):
+        self.pending.set()
+
+    def high_water_mark(self, connection: sqlite3.Connection, relay: str) -> int:
+        row = connection.execute("SELECT last_delivered_id FROM outbox_relay_state WHERE relay = ?", (relay,)).fetchone()
+        return row[0] if row else 0
+
+    def fetch_after(self, connection: sqlite3.Connection, last_id: int, limit: int) -> list[tuple[int, str, str]]:
+        """The (id, event type, payload) of the rows after `last_id`, still encoded: see `decode`."""
+        return connection.execute(
+            "SELECT id, event_type, payload FROM outbox WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, limit),
+        ).fetchall()
+
+    def decode(self, event_type: str, payload: str) -> Event:
+        """Raises KeyError for an event type this outbox does not know, ValueError or TypeError for a bad payload."""
+        return self.event_types[event_type](**json.loads(payload))
+
+    def mark_delivered(self, connection: sqlite3.Connection, relay: str, last_id: int, dead_letters: list[tuple[int, str, str, str]] | None = None):
+        """
+        Advances the relay's high-water mark, stores the (id, event type, payload, error) of the rows it gave up on
+        and deletes the rows every relay has delivered, atomically.
+        """
+        with connection:
+            failed_at = str(datetime.now(UTC))
+            connection.executemany(
+                "INSERT OR REPLACE INTO outbox_dead_letter (relay, id, event_type, payload, error, failed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(relay, *dead_letter, failed_at) for dead_letter in dead_letters or []],
+            )
+            connection.execute(
+                """
+                INSERT INTO outbox_relay_state (relay, last_delivered_id) VALUES (?, ?)
+                ON CONFLICT(relay) DO UPDATE SET last_delivered_id = excluded.last_delivered_id
+            """,
+                (relay, last_id),
+            )
+            connection.execute("DELETE FROM outbox WHERE id <= (SELECT MIN(last_delivered_id) FROM outbox_relay_state)")
+
+
+@dataclass(frozen=True)
+class RelayStats:
+    """Progress of an OutboxRelay since it started."""
+
+    high_water_mark: int
+    delivered: int
+    batches: int
+    failures: int
+    dead_lettered: int
+
+
+class OutboxRelay:
+    """
+    Background worker that moves events from the outbox to the EventBus subscribers.
+    Delivery is at-least-once: the high-water mark only advances after `EventBus.deliver` returns, which with the
+    async bus is once the handlers have run, so events handled just before a crash are handled again on restart.
+    A row that cannot be decoded, or that still fails after `max_attempts` deliveries, is dead-lettered and skipped,
+    so one bad event never holds back the ones after it (nor has the healthy subscribers handle it forever).
+    """
+
+    def __init__(
+        self,
+        outbox: SQLiteOutbox,
+        pool: SQLiteConnectionPool,
+        event_bus: EventBus,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        name: str = "default",
+        max_attempts: int = 5,
+    ):
+        self.outbox = outbox
+        self.pool = pool
+        self.event_bus = event_bus
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.name = name
+        self.max_attempts = max_attempts
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._high_water_mark: int | None = None
+        self._delivered = 0
+        self._batches = 0
+        self._failures = 0
+        self._dead_lettered = 0
+        # The row that failed on the last pass, and how many deliveries of it failed so far
+        self._failing: tuple[int, int] | None = None
+
+    def run_once(self) -> int:
+        """Handles at most one batch and returns the number of rows moved past (delivered or dead-lettered)."""
+        with self.pool.connection() as conn:
+            if self._high_water_mark is None:
+                self._high_water_mark = self.outbox.high_water_mark(conn, self.name)
+            batch = self.outbox.fetch_after(conn, self._high_water_mark, self.batch_size)
+
+            last_id = None
+            delivered = 0
+            dead_letters: list[tuple[int, str, str, str]] = []
+            for row_id, event_type, payload in batch:
+                try:
+                    event = self.outbox.decode(event_type, payload)
+                except (KeyError, TypeError, ValueError) as e:
+                    # Retrying cannot fix it
+                    logger.error(f"☠️ Outbox relay '{self.name}' cannot decode event {row_id} ({event_type}): {e!r}; dead-lettered.")
+                    dead_letters.append((row_id, event_type, payload, repr(e)))
+                    last_id = row_id
+                    continue
+                try:
+                    self.event_bus.deliver([event])
+                except Exception as e:
+                    self._failures += 1
+                    attempts = (self._failing[1] if self._failing and self._failing[0] == row_id else 0) + 1
+                    if attempts < self.max_attempts:
+                        # Stop at the failure so the high-water mark never skips an event that may still go through
+                        self._failing = (row_id, attempts)
+                        logger.exception(f"📮 Outbox relay '{self.name}' failed event {row_id} ({attempts}/{self.max_attempts}); retrying next pass.")
+                        break
+                    logger.exception(f"☠️ Outbox relay '{self.name}' failed to deliver event {row_id} {attempts} times; dead-lettered.")
+                    dead_letters.append((row_id, event_type, payload, repr(e)))
+                else:
+                    delivered += 1
+                self._failing = None
+                last_id = row_id
+            if last_id is None:
+                return 0
+
+            self.outbox.mark_delivered(conn, self.name, last_id, dead_letters)
+            self._high_water_mark = last_id
+            self._delivered += delivered
+            self._dead_lettered += len(dead_letters)
+            self._batches += 1
+            return delivered + len(dead_letters)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.outbox.pending.clear()
+            try:
+                delivered = self.run_once()
+            except Exception:
+                self._failures += 1
+                logger.exception(f"📮 Outbox relay '{self.name}' batch failed.")
+                delivered = 0
+            # A full batch means there is probably more waiting; otherwise sleep until notified or polled
+            if delivered < self.batch_size:
+                self.outbox.pending.wait(self.poll_interval)
+
+    def start(self) -> "OutboxRelay":
+        self._thread = threading.Thread(target=self._run, name=f"outbox-relay-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None):
+        """
+        Stops polling after a final pass over whatever is already in the outbox. If the relay thread is still
+        delivering after `timeout`, it is left to finish alone rather than racing it over the same batch.
+        """
+        self._stop.set()
+        self.outbox.pending.set()
+        if self._thread:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"⏱️ Outbox relay '{self.name}' did not stop in {timeout:g}s; skipping its final pass.")
+                return
+        while self.run_once():
+            pass
+
+    def stats(self) -> RelayStats:
+        return RelayStats(self._high_water_mark or 0, self._delivered, self._batches, self._failures, self._dead_lettered)
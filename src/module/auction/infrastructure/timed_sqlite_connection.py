@@ -0,0 +1,100 @@
+import sqlite3
+import time
+from typing import Any
+
+from shared.application.metrics import Histogram, MetricsRegistry
+from shared.application.tracing import span
+
+# Distinct SQL strings remembered per pool; the code's statements are constants, so this is only a guard
+MAX_CACHED_STATEMENTS = 1024
+
+
+def statement_kind(sql: str) -> str:
+    """The statement's leading keyword (SELECT, INSERT, SAVEPOINT...), a label that stays bounded whatever the SQL is."""
+    words = sql.split(None, 1)
+    return words[0].upper() if words else ""
+
+
+class SQLiteTimers:
+    """Where a TimedConnection records to: statement execution by kind, and commits, labelled with the pool's name."""
+
+    def __init__(self, metrics: MetricsRegistry, pool: str):
+        self.pool = pool
+        self._statements = metrics.histogram("sqlite_statement_duration_seconds", "Time to execute a SQL statement.", ("pool", "statement"))
+        # SQL string -> its histogram, so timing a statement costs one dict lookup
+        self._by_sql: dict[str, Histogram] = {}
+        # COMMIT is where SQLite writes the WAL and, depending on `synchronous`, fsyncs it
+        self.commits = metrics.histogram("sqlite_commit_duration_seconds", "Time to commit a transaction.", ("pool",)).labels(pool)
+
+    def statement(self, sql: str) -> Histogram:
+        histogram = self._by_sql.get(sql)
+        if histogram is None:
+            histogram = self._statements.labels(self.pool, statement_kind(sql))
+            if len(self._by_sql) < MAX_CACHED_STATEMENTS:
+                self._by_sql[sql] = histogram
+        return histogram
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Times `execute` and `executemany` (inside a trace, as spans too): up to the first row for a query,
+    since rows are read lazily afterwards.
+    """
+
+    def execute(self, sql: str, parameters: Any = (), /) -> "TimedCursor":
+        started = time.perf_counter()
+        try:
+            with span("sqlite.execute", sql=sql):
+                return super().execute(sql, parameters)
+        finally:
+            if self.connection.timers:
+                self.connection.timers.statement(sql).observe(time.perf_counter() - started)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> "TimedCursor":
+        started = time.perf_counter()
+        try:
+            with span("sqlite.executemany", sql=sql):
+                return super().executemany(sql, seq_of_parameters)
+        finally:
+            if self.connection.timers:
+                self.connection.timers.statement(sql).observe(time.perf_counter() - started)
+
+
+class TimedConnection(sqlite3.Connection):
+    """
+    A connection (opened with `factory=TimedConnection`) recording its statements and commits to `timers` when set,
+    and as spans inside a trace. The shortcut `execute` methods go through a TimedCursor, as the built-in ones bypass overrides.
+    """
+
+    timers: SQLiteTimers | None = None
+
+    def cursor(self, factory: type[sqlite3.Cursor] = TimedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            # Includes waiting for the write lock, and the WAL write and fsync
+            with span("sqlite.commit"):
+                super().commit()
+        finally:
+            if self.timers:
+                self.timers.commits.observe(time.perf_counter() - started)
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: Any) -> bool:
+        # As the built-in one, but through the timed commit
+        if exc_type is not None:
+            self.rollback()
+            return False
+        try:
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+        return False
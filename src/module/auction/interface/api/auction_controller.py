@@ -1,42 +1,139 @@
+from collections.abc import Callable
 from typing import Any
+from urllib.parse import urlencode
 
 from module.auction.application.command import CreateAuctionCommand
 from module.auction.application.command_handler import CreateAuctionHandler
-from module.auction.application.query import GetAuctionQuery, ListAuctionsQuery
-from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from module.auction.application.query import (
+    AUCTION_SORT_ORDERS,
+    GetAuctionListVersionQuery,
+    GetAuctionQuery,
+    GetAuctionVersionQuery,
+    ListAuctionsQuery,
+)
+from module.auction.application.read_repository import AuctionPageStream, AuctionVersion, InvalidCursorError, PageVersion
+from module.auction.application.unit_of_work import AuctionUnitOfWork
+from module.auction.interface.api.batch import dispatch_batch, parse_batch
+from module.auction.interface.api.serializer import AuctionSerializer
+from shared.application.command_bus import CommandBus
 from shared.application.event_bus import EventBus
+from shared.application.metrics import MetricsRegistry
 from shared.application.query_bus import QueryBus
+from shared.interface.api.conditional import Validators, strong_etag
+from shared.interface.api.json_backend import STDLIB_JSON, JSONBackend
+from shared.interface.api.json_stream import JSONStream
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
 
 
 class AuctionController:
-    def __init__(self, query_bus: QueryBus, uow_factory: type[SQLiteAuctionUnitOfWork], event_bus: EventBus, db_path: str):
+    def __init__(
+        self,
+        query_bus: QueryBus,
+        uow_factory: Callable[..., AuctionUnitOfWork],
+        event_bus: EventBus,
+        db_path: str,
+        json_backend: JSONBackend = STDLIB_JSON,
+        metrics: MetricsRegistry | None = None,
+    ):
         self.query_bus = query_bus
         self.uow_factory = uow_factory
         self.event_bus = event_bus
         self.db_path = db_path
+        self.json_backend = json_backend
+        # Commands go through a CommandBus, which times them by type when there are metrics
+        self.metrics = metrics
+        # Encodes auctions with their links straight to bytes (query results are never mutated)
+        self.serializer = AuctionSerializer(json_backend)
 
-    def _add_links(self, auction: dict[str, Any]) -> dict[str, Any]:
-        auction_id = auction["id"]
-        auction["_links"] = {
+    def _auction_links(self, auction_id: str) -> dict[str, Any]:
+        return {
             "self": {"href": f"/auctions/{auction_id}", "method": "GET"},
-            "bids": {"href": f"/auctions/{auction_id}/bids", "method": "GET"},
             "place_bid": {"href": f"/auctions/{auction_id}/bids", "method": "POST"},
         }
-        return auction
 
-    # GET /auctions
+    def _parse_create_command(self, body: dict[str, Any]) -> CreateAuctionCommand:
+        item_id = body.get("item_id")
+        starting_price = body.get("starting_price")
+        if item_id is None or starting_price is None:
+            raise ValueError("Missing required fields: item_id and starting_price")
+        return CreateAuctionCommand(item_id=item_id, starting_price=float(starting_price))
+
+    def _parse_list_query(self, params: dict[str, str]) -> ListAuctionsQuery:
+        try:
+            limit = int(params.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError as e:
+            raise ValueError("limit must be an integer") from e
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        is_active = params.get("is_active")
+        if is_active is not None and is_active not in ("true", "false"):
+            raise ValueError("is_active must be 'true' or 'false'")
+
+        sort = params.get("sort", "id")
+        if sort not in AUCTION_SORT_ORDERS:
+            raise ValueError(f"sort must be one of: {', '.join(AUCTION_SORT_ORDERS)}")
+
+        return ListAuctionsQuery(
+            limit=limit,
+            cursor=params.get("cursor") or None,
+            is_active=None if is_active is None else is_active == "true",
+            sort=sort,
+            stream=True,
+        )
+
+    def _list_href(self, query: ListAuctionsQuery, cursor: str | None) -> str:
+        args: dict[str, str] = {"limit": str(query.limit), "sort": query.sort}
+        if query.is_active is not None:
+            args["is_active"] = "true" if query.is_active else "false"
+        if cursor:
+            args["cursor"] = cursor
+        return f"/auctions?{urlencode(args)}"
+
+    # GET /auctions?limit=&cursor=&is_active=&sort=
     def list_auctions(self, body: dict[str, Any] | None, params: dict[str, str]) -> tuple[int, Any]:
-        result = self.query_bus.dispatch(ListAuctionsQuery())
-        for auction in result:
-            self._add_links(auction)
-        return 200, result
+        try:
+            query = self._parse_list_query(params)
+            page: AuctionPageStream = self.query_bus.dispatch(query)
+        except (ValueError, InvalidCursorError) as e:
+            return 400, {"error": str(e)}
+
+        # The next page is only known once the items have been read, so the links come last
+        def links() -> dict[str, Any]:
+            links = {"self": {"href": self._list_href(query, query.cursor), "method": "GET"}}
+            if page.next_cursor:
+                links["next"] = {"href": self._list_href(query, page.next_cursor), "method": "GET"}
+            return {"_links": links}
+
+        return 200, JSONStream(page.items, tail=links, on_close=page.close, backend=self.json_backend, encode_item=self.serializer.encode)
+
+    # Validators of GET /auctions, from the rows of the requested page only, so a bid elsewhere keeps its tag.
+    # No Last-Modified: a row leaving the page can make it older than a representation the client already has.
+    def list_validators(self, params: dict[str, str]) -> Validators | None:
+        try:
+            query = self._parse_list_query(params)
+            version: PageVersion = self.query_bus.dispatch(
+                GetAuctionListVersionQuery(limit=query.limit, cursor=query.cursor, is_active=query.is_active, sort=query.sort)
+            )
+        except (ValueError, InvalidCursorError):
+            # Nothing to validate: the request itself is answered with a 400
+            return None
+        return Validators(strong_etag("auctions", sorted(params.items()), version, self.json_backend.name))
+
+    # Validators of GET /auctions/{id}, read without loading the auction
+    def auction_validators(self, params: dict[str, str]) -> Validators | None:
+        version: AuctionVersion | None = self.query_bus.dispatch(GetAuctionVersionQuery(auction_id=params["id"]))
+        if version is None:
+            return None
+        return Validators(strong_etag("auction", params["id"], *version, self.json_backend.name))
 
     # GET /auctions/{id}
     def get_auction(self, body: dict[str, Any] | None, params: dict[str, str]) -> tuple[int, Any]:
         result = self.query_bus.dispatch(GetAuctionQuery(auction_id=params["id"]))
         if result:
-            self._add_links(result)
-            return 200, result
+            return 200, self.serializer.encode(result)
         return 404, {"error": "Auction not found"}
 
     # POST /auctions
@@ -54,14 +151,25 @@ class AuctionController:
 
         # Instantiate UoW per request
         uow = self.uow_factory(self.event_bus, db_path=self.db_path)
-        handler = CreateAuctionHandler(uow)
-        auction_id = handler.handle(cmd)
+        command_bus = CommandBus(self.metrics)
+        command_bus.register(CreateAuctionCommand, CreateAuctionHandler(uow))
+        auction_id = command_bus.dispatch(cmd)
 
         return 201, {
             "id": auction_id,
             "message": "Auction created",
-            "_links": {
-                "self": {"href": f"/auctions/{auction_id}", "method": "GET"},
-                "place_bid": {"href": f"/auctions/{auction_id}/bids", "method": "POST"},
-            },
+            "_links": self._auction_links(auction_id),
         }
+
+    # POST /auctions/batch
+    def create_auctions_batch(self, body: dict[str, Any] | None, params: dict[str, str]) -> tuple[int, Any]:
+        try:
+            parsed = parse_batch(body, self._parse_create_command)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        # One UoW (one transaction, one commit) shared by every command of the batch
+        uow = self.uow_factory(self.event_bus, db_path=self.db_path)
+        command_bus = CommandBus(self.metrics)
+        command_bus.register(CreateAuctionCommand, CreateAuctionHandler(uow))
+        return dispatch_batch(parsed, command_bus, uow, lambda cmd, auction_id: {"id": auction_id, "_links": self._auction_links(auction_id)})
@@ -0,0 +1,54 @@
+from collections.abc import Callable
+from typing import Any
+
+from shared.application.command import Command
+from shared.application.command_bus import CommandBus
+from shared.application.unit_of_work import UnitOfWork
+
+MAX_BATCH_SIZE = 1000
+
+
+def parse_batch(body: dict[str, Any] | None, parse_item: Callable[[dict[str, Any]], Command]) -> list[Command | str]:
+    """
+    Turns the `items` of a batch request into commands.
+    An item that cannot be parsed becomes its error message, so it fails on its own.
+    Raises ValueError if the batch itself is malformed.
+    """
+    items = (body or {}).get("items")
+    if not isinstance(items, list) or not items:
+        raise ValueError("Body must contain a non-empty 'items' list")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch holds at most {MAX_BATCH_SIZE} items")
+
+    parsed: list[Command | str] = []
+    for item in items:
+        try:
+            parsed.append(parse_item(item if isinstance(item, dict) else {}))
+        except (TypeError, ValueError) as e:
+            parsed.append(str(e))
+    return parsed
+
+
+def dispatch_batch(
+    parsed: list[Command | str],
+    command_bus: CommandBus,
+    uow: UnitOfWork,
+    describe: Callable[[Command, Any], dict[str, Any]],
+) -> tuple[int, Any]:
+    """Runs the valid commands in one unit of work and reports every item in request order."""
+    commands = [item for item in parsed if not isinstance(item, str)]
+    results = iter(command_bus.dispatch_many(commands, uow))
+
+    items: list[dict[str, Any]] = []
+    for index, item in enumerate(parsed):
+        if isinstance(item, str):
+            items.append({"index": index, "ok": False, "error": item})
+            continue
+        result = next(results)
+        if result.ok:
+            items.append({"index": index, "ok": True, **describe(item, result.value)})
+        else:
+            items.append({"index": index, "ok": False, "error": result.error})
+
+    succeeded = sum(1 for item in items if item["ok"])
+    return 200, {"items": items, "succeeded": succeeded, "failed": len(items) - succeeded}
@@ -1,31 +1,67 @@
+from collections.abc import Callable
 from typing import Any
 
 from module.auction.application.command import PlaceBidCommand
 from module.auction.application.command_handler import PlaceBidHandler
-from module.auction.application.query import ListBidsQuery
-from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from module.auction.application.query import GetAuctionVersionQuery, ListBidsQuery
+from module.auction.application.read_repository import AuctionVersion
+from module.auction.application.unit_of_work import AuctionUnitOfWork
+from module.auction.interface.api.batch import dispatch_batch, parse_batch
+from shared.application.command_bus import CommandBus
 from shared.application.event_bus import EventBus
+from shared.application.group_commit import GroupCommitWriter
+from shared.application.metrics import MetricsRegistry
 from shared.application.query_bus import QueryBus
+from shared.application.retry import RetryPolicy
+from shared.application.serial_lanes import SerialLanes
+from shared.interface.api.conditional import Validators, strong_etag
+from shared.interface.api.json_backend import STDLIB_JSON, JSONBackend
+from shared.interface.api.json_stream import JSONStream
 
 
 class BidController:
-    def __init__(self, query_bus: QueryBus, uow_factory: type[SQLiteAuctionUnitOfWork], event_bus: EventBus, db_path: str):
+    def __init__(
+        self,
+        query_bus: QueryBus,
+        uow_factory: Callable[..., AuctionUnitOfWork],
+        event_bus: EventBus,
+        db_path: str,
+        bid_writer: GroupCommitWriter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        lanes: SerialLanes | None = None,
+        json_backend: JSONBackend = STDLIB_JSON,
+        metrics: MetricsRegistry | None = None,
+    ):
         self.query_bus = query_bus
         self.uow_factory = uow_factory
         self.event_bus = event_bus
         self.db_path = db_path
+        # With a group commit writer, bids share transactions with other concurrent bids
+        self.bid_writer = bid_writer
+        # Re-applies bids that lost a race with a concurrent writer
+        self.retry_policy = retry_policy
+        # Serializes bids on the same auction (single bids only: batches already run in one transaction)
+        self.lanes = lanes
+        self.json_backend = json_backend
+        # Commands go through a CommandBus, which times them by type when there are metrics
+        self.metrics = metrics
+
+    # Validators of GET /auctions/{id}/bids: bids are only ever added, so their count identifies the list
+    def bids_validators(self, params: dict[str, str]) -> Validators | None:
+        version: AuctionVersion | None = self.query_bus.dispatch(GetAuctionVersionQuery(auction_id=params["id"]))
+        if version is None:
+            return None
+        return Validators(strong_etag("bids", params["id"], version.bids, self.json_backend.name))
 
     # GET /auctions/{id}/bids
     def list_bids(self, body: dict[str, Any] | None, params: dict[str, str]) -> tuple[int, Any]:
-        result = self.query_bus.dispatch(ListBidsQuery(auction_id=params["id"]))
+        result = self.query_bus.dispatch(ListBidsQuery(auction_id=params["id"], stream=True))
         if result is not None:
-            return 200, {
-                "items": result,
-                "_links": {
-                    "self": {"href": f"/auctions/{params['id']}/bids", "method": "GET"},
-                    "auction": {"href": f"/auctions/{params['id']}", "method": "GET"},
-                },
+            links = {
+                "self": {"href": f"/auctions/{params['id']}/bids", "method": "GET"},
+                "auction": {"href": f"/auctions/{params['id']}", "method": "GET"},
             }
+            return 200, JSONStream(result, tail=lambda: {"_links": links}, backend=self.json_backend)
         return 404, {"error": "Auction not found"}
 
     # POST /auctions/{id}/bids
@@ -41,9 +77,13 @@ class BidController:
 
         cmd = PlaceBidCommand(auction_id=params["id"], bidder_id=bidder_id, amount=float(amount))
 
-        uow = self.uow_factory(self.event_bus, db_path=self.db_path)
-        handler = PlaceBidHandler(uow)
-        handler.handle(cmd)
+        if self.bid_writer:
+            self.bid_writer.submit(cmd)
+        else:
+            uow = self.uow_factory(self.event_bus, db_path=self.db_path)
+            command_bus = CommandBus(self.metrics)
+            command_bus.register(PlaceBidCommand, PlaceBidHandler(uow, self.retry_policy, self.lanes))
+            command_bus.dispatch(cmd)
 
         return 200, {
             "message": "Bid accepted",
@@ -52,3 +92,29 @@ class BidController:
                 "bids": {"href": f"/auctions/{params['id']}/bids", "method": "GET"},
             },
         }
+
+    def _parse_bid_command(self, body: dict[str, Any]) -> PlaceBidCommand:
+        auction_id = body.get("auction_id")
+        bidder_id = body.get("bidder_id")
+        amount = body.get("amount")
+        if auction_id is None or bidder_id is None or amount is None:
+            raise ValueError("Missing required fields: auction_id, bidder_id and amount")
+        return PlaceBidCommand(auction_id=auction_id, bidder_id=bidder_id, amount=float(amount))
+
+    # POST /bids/batch
+    def place_bids_batch(self, body: dict[str, Any] | None, params: dict[str, str]) -> tuple[int, Any]:
+        try:
+            parsed = parse_batch(body, self._parse_bid_command)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        # One UoW (one transaction, one commit) shared by every command of the batch
+        uow = self.uow_factory(self.event_bus, db_path=self.db_path)
+        command_bus = CommandBus(self.metrics)
+        command_bus.register(PlaceBidCommand, PlaceBidHandler(uow, self.retry_policy))
+        return dispatch_batch(
+            parsed,
+            command_bus,
+            uow,
+            lambda cmd, _: {"_links": {"bids": {"href": f"/auctions/{cmd.auction_id}/bids", "method": "GET"}}},
+        )
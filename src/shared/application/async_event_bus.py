@@ -0,0 +1,254 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from shared.application.event_bus import EventBus
+from shared.application.metrics import Histogram, HistogramSnapshot, MetricSnapshot, MetricsRegistry
+from shared.application.tracing import continue_trace, current_span
+from shared.domain.event import Event
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Queued in place of an event to tell a worker thread to exit
+_STOP = object()
+
+
+def _describe(event: Event | list[Event]) -> str:
+    return f"a batch of {len(event)} events" if isinstance(event, list) else type(event).__name__
+
+
+class _Delivery:
+    """The handler runs one `deliver` call waits for, and those that failed even after their retries."""
+
+    def __init__(self, handlers: int):
+        self._remaining = handlers
+        self.failed: list[str] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        if not handlers:
+            self._done.set()
+
+    def finish(self, handler: str, succeeded: bool):
+        with self._lock:
+            if not succeeded:
+                self.failed.append(handler)
+            self._remaining -= 1
+            if not self._remaining:
+                self._done.set()
+
+    def wait(self):
+        self._done.wait()
+
+
+@dataclass(frozen=True)
+class SubscriberStats:
+    """Counters for one subscriber's queue and workers."""
+
+    subscriber: str
+    queue_depth: int
+    delivered: int
+    retried: int
+    failed: int
+    dropped: int
+    latency: HistogramSnapshot
+
+
+class _SubscriberWorker:
+    """A bounded queue plus the threads draining it into a single handler."""
+
+    def __init__(self, handler: Callable[[Any], Any], queue_size: int, workers: int, max_retries: int, retry_backoff: float):
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self.queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self.latency = Histogram()
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+        self.dropped = 0
+
+        self.threads = [threading.Thread(target=self._run, name=f"events-{self.name}-{i}", daemon=True) for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, event: Event | list[Event], timeout: float | None, delivery: _Delivery | None = None):
+        """Queues the event, waiting up to `timeout` for room (forever if None) before dropping it."""
+        try:
+            # With the publisher's span, so a traced delivery is linked to the request that raised the event
+            self.queue.put((event, current_span(), delivery), timeout=timeout)
+        except queue.Full:
+            logger.error(f"🗑️ Dropped {_describe(event)} for {self.name}: queue full ({self.queue.maxsize}).")
+            with self._lock:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                event, parent, delivery = item
+                with continue_trace(parent, "event_handler", handler=self.name, event=_describe(event)):
+                    succeeded = self._deliver(event)
+                if delivery:
+                    delivery.finish(self.name, succeeded)
+            finally:
+                self.queue.task_done()
+
+    def _deliver(self, event: Event | list[Event]) -> bool:
+        # A failing handler is retried with exponential backoff, and never affects other subscribers
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                self.handler(event)
+            except Exception:
+                self.latency.observe(time.perf_counter() - started)
+                if attempt == self.max_retries:
+                    logger.exception(f"❌ Subscriber {self.name} failed on {_describe(event)} after {attempt + 1} attempts.")
+                    with self._lock:
+                        self.failed += 1
+                    return False
+                with self._lock:
+                    self.retried += 1
+                time.sleep(self.retry_backoff * 2**attempt)
+            else:
+                self.latency.observe(time.perf_counter() - started)
+                with self._lock:
+                    self.delivered += 1
+                return True
+        return False
+
+    def stats(self) -> SubscriberStats:
+        with self._lock:
+            return SubscriberStats(self.name, self.queue.qsize(), self.delivered, self.retried, self.failed, self.dropped, self.latency.snapshot())
+
+
+class AsyncEventBus(EventBus):
+    """
+    Event bus that hands events to per-subscriber worker threads instead of running handlers inline.
+    `publish` only enqueues, so a slow or failing subscriber no longer adds to the publisher's latency.
+    When a subscriber's queue is full, `publish` waits up to `enqueue_timeout` and then drops the event;
+    `deliver` never drops, and returns once the handlers have run, for callers that must not lose events.
+    Deliveries of events published inside a trace are recorded as continuations of it, see `continue_trace`.
+    With metrics, the stats of every subscriber are reported on each scrape, see `collect`.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        workers_per_subscriber: int = 1,
+        max_retries: int = 3,
+        retry_backoff: float = 0.05,
+        enqueue_timeout: float = 1.0,
+        metrics: MetricsRegistry | None = None,
+    ):
+        super().__init__(metrics)
+        self.queue_size = queue_size
+        self.workers_per_subscriber = workers_per_subscriber
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.enqueue_timeout = enqueue_timeout
+        self._workers: dict[Callable[[Any], Any], _SubscriberWorker] = {}
+        self._accepting = True
+        if metrics:
+            metrics.register_collector(self.collect)
+
+    def subscribe(self, event_type: type[Event], handler: Callable[[Any], Any]):
+        super().subscribe(event_type, handler)
+        if handler not in self._workers:
+            self._workers[handler] = _SubscriberWorker(handler, self.queue_size, self.workers_per_subscriber, self.max_retries, self.retry_backoff)
+
+    def subscribe_batch(self, event_types: tuple[type[Event], ...], handler: Callable[[list[Event]], Any]):
+        super().subscribe_batch(event_types, handler)
+        if handler not in self._workers:
+            self._workers[handler] = _SubscriberWorker(handler, self.queue_size, self.workers_per_subscriber, self.max_retries, self.retry_backoff)
+
+    def publish(self, events: list[Event]):
+        self._submit(events, self.enqueue_timeout, None)
+
+    def deliver(self, events: list[Event]):
+        """
+        Queues the events like `publish`, but waits for room rather than dropping them, then for every handler to
+        finish. Raises RuntimeError if a handler still failed after its retries, so the caller can deliver them again.
+        """
+        handlers = sum(len(self._subscribers.get(type(event), [])) for event in events)
+        handlers += sum(1 for event_types, _ in self._batch_subscribers if any(type(event) in event_types for event in events))
+        delivery = _Delivery(handlers)
+        self._submit(events, None, delivery)
+        delivery.wait()
+        if delivery.failed:
+            raise RuntimeError(f"Subscribers failed to handle {len(events)} events: {', '.join(delivery.failed)}")
+
+    def _submit(self, events: list[Event], timeout: float | None, delivery: _Delivery | None):
+        if not self._accepting:
+            raise RuntimeError("Event bus is shut down")
+        if self.metrics:
+            self._count(events)
+        for event in events:
+            for handler in self._subscribers.get(type(event), []):
+                self._workers[handler].submit(event, timeout, delivery)
+        # A batch is queued, retried and counted as a single delivery
+        for event_types, handler in self._batch_subscribers:
+            batch = [event for event in events if type(event) in event_types]
+            if batch:
+                self._workers[handler].submit(batch, timeout, delivery)
+
+    def stats(self) -> list[SubscriberStats]:
+        return [worker.stats() for worker in self._workers.values()]
+
+    def collect(self) -> list[MetricSnapshot]:
+        """The subscriber stats as metrics, for a MetricsRegistry collector."""
+        stats = self.stats()
+
+        def per_subscriber(name: str, help: str, kind: str, field: str) -> MetricSnapshot:
+            return MetricSnapshot(name, help, kind, ("subscriber",), tuple(((s.subscriber,), float(getattr(s, field))) for s in stats))
+
+        return [
+            per_subscriber("event_queue_depth", "Events waiting in a subscriber's queue.", "gauge", "queue_depth"),
+            per_subscriber("event_deliveries_total", "Events a subscriber handled.", "counter", "delivered"),
+            per_subscriber("event_retries_total", "Subscriber attempts that failed and were retried.", "counter", "retried"),
+            per_subscriber("event_failures_total", "Events a subscriber still failed on after its retries.", "counter", "failed"),
+            per_subscriber("event_drops_total", "Events dropped because a subscriber's queue was full.", "counter", "dropped"),
+            MetricSnapshot(
+                "event_handler_duration_seconds",
+                "Time a subscriber took to handle an event, per attempt.",
+                "histogram",
+                ("subscriber",),
+                tuple(((s.subscriber,), s.latency) for s in stats if s.latency.count),
+            ),
+        ]
+
+    def shutdown(self, timeout: float | None = None):
+        """
+        Stops accepting events, lets the workers drain what is already queued, then stops them.
+        Returns after `timeout` seconds at the latest, even if a worker is stuck with a full queue.
+        """
+        self._accepting = False
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> float | None:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        for worker in self._workers.values():
+            try:
+                for _ in worker.threads:
+                    worker.queue.put(_STOP, timeout=remaining())
+            except queue.Full:
+                # Its workers are stuck on a full queue; they are daemon threads, so they do not hold up the exit
+                continue
+        for worker in self._workers.values():
+            for thread in worker.threads:
+                thread.join(remaining())
+        stuck = [worker.name for worker in self._workers.values() if any(thread.is_alive() for thread in worker.threads)]
+        if stuck:
+            logger.warning(f"⏱️ Event bus stopped waiting after {timeout:g}s; subscribers still running: {', '.join(stuck)}.")
+            return
+        logger.info("📭 Event bus drained and stopped.")
@@ -1,16 +1,76 @@
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
 from shared.application.command import Command
+from shared.application.metrics import Histogram, MetricsRegistry
+from shared.application.tracing import span
+from shared.application.unit_of_work import UnitOfWork
+from shared.domain.exception import DomainException
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    """Outcome of one command of a `dispatch_many` batch."""
+
+    ok: bool
+    value: Any = None
+    error: str | None = None
+    # The exception behind `error`, for callers that re-raise it
+    exception: DomainException | None = field(default=None, compare=False, repr=False)
 
 
 class CommandBus:
-    """In-memory command bus for dispatching commands to their handlers."""
+    """
+    In-memory command bus for dispatching commands to their handlers.
+    With `metrics`, each command is timed and the business rules it broke are counted, by command type.
+    Inside a trace, each command is a span.
+    """
 
-    def __init__(self):
+    def __init__(self, metrics: MetricsRegistry | None = None):
         self._handlers: dict[type[Command], Any] = {}
+        self.metrics = metrics
+        # Command type -> its histogram, looked up when the handler is registered
+        self._durations: dict[type[Command], Histogram] = {}
+        if metrics:
+            self._domain_exceptions = metrics.counter(
+                "domain_exceptions_total", "Commands rejected for breaking a business rule.", ("command", "exception")
+            )
 
     def register(self, cmd_type: type[Command], handler: Any):
         self._handlers[cmd_type] = handler
+        if self.metrics:
+            family = self.metrics.histogram("command_duration_seconds", "Time to handle a command.", ("command",))
+            self._durations[cmd_type] = family.labels(cmd_type.__name__)
+
+    def dispatch(self, cmd: Command) -> Any:
+        with span("command", command=type(cmd).__name__):
+            return self._handle(cmd)
+
+    def _handle(self, cmd: Command) -> Any:
+        handler = self._handlers[type(cmd)]
+        if not self.metrics:
+            return handler.handle(cmd)
+        started = time.perf_counter()
+        try:
+            return handler.handle(cmd)
+        except DomainException as e:
+            self._domain_exceptions.labels(type(cmd).__name__, type(e).__name__).inc()
+            raise
+        finally:
+            self._durations[type(cmd)].observe(time.perf_counter() - started)
 
-    def dispatch(self, cmd: Command):
-        self._handlers[type(cmd)].handle(cmd)
+    def dispatch_many(self, commands: list[Command], uow: UnitOfWork) -> list[CommandResult]:
+        """
+        Runs the commands inside one unit of work: one transaction and one commit for the whole batch.
+        The registered handlers must use that same `uow`, whose nested scopes are then undone on their own.
+        A command breaking a business rule is reported in its result; any other error aborts the batch.
+        """
+        results: list[CommandResult] = []
+        with uow:
+            for cmd in commands:
+                try:
+                    results.append(CommandResult(ok=True, value=self.dispatch(cmd)))
+                except DomainException as e:
+                    results.append(CommandResult(ok=False, error=str(e), exception=e))
+        return results
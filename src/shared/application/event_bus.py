@@ -1,23 +1,62 @@
 from collections.abc import Callable
 from typing import Any
 
+from shared.application.metrics import MetricsRegistry
+from shared.application.tracing import span
 from shared.domain.event import Event
 
 
+def handler_name(handler: Callable[..., Any]) -> str:
+    return getattr(handler, "__qualname__", None) or repr(handler)
+
+
 class EventBus:
-    """In-memory event bus for publishing domain events to subscribers."""
+    """
+    In-memory event bus for publishing domain events to subscribers.
+    With `metrics`, published events are counted by type. Inside a trace, publishing and each handler are spans.
+    """
 
-    def __init__(self):
+    def __init__(self, metrics: MetricsRegistry | None = None):
+        self.metrics = metrics
+        if metrics:
+            self._published = metrics.counter("events_published_total", "Domain events published.", ("event",))
         # Event -> List of Handlers
         self._subscribers: dict[type[Event], list[Callable[[Event], Any]]] = {}
+        # Handlers that take all the matching events of one publish call at once
+        self._batch_subscribers: list[tuple[tuple[type[Event], ...], Callable[[list[Event]], Any]]] = []
 
     def subscribe(self, event_type: type[Event], handler: Callable[[Any], Any]):
         if event_type not in self._subscribers:
             self._subscribers[event_type] = []
         self._subscribers[event_type].append(handler)
 
-    def publish(self, events: list[Event]):
+    def subscribe_batch(self, event_types: tuple[type[Event], ...], handler: Callable[[list[Event]], Any]):
+        """Subscribes a handler that is called once per `publish` with the events of the given types, in order."""
+        self._batch_subscribers.append((event_types, handler))
+
+    def _count(self, events: list[Event]):
         for event in events:
-            handlers = self._subscribers.get(type(event), [])
-            for handler in handlers:
-                handler(event)
+            self._published.labels(type(event).__name__).inc()
+
+    def publish(self, events: list[Event]):
+        if self.metrics:
+            self._count(events)
+        with span("event_bus.publish", events=len(events)):
+            for event in events:
+                handlers = self._subscribers.get(type(event), [])
+                for handler in handlers:
+                    with span("event_handler", handler=handler_name(handler), event=type(event).__name__):
+                        handler(event)
+            for event_types, handler in self._batch_subscribers:
+                batch = [event for event in events if type(event) in event_types]
+                if batch:
+                    with span("event_handler", handler=handler_name(handler), events=len(batch)):
+                        handler(batch)
+
+    def deliver(self, events: list[Event]):
+        """Publishes the events and returns once every handler has run; raises if one of them failed."""
+        self.publish(events)
+
+    def shutdown(self, timeout: float | None = None):
+        """Handlers run inline, so there is nothing queued to drain."""
+        pass
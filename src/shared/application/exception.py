@@ -0,0 +1,10 @@
+class ConcurrencyException(Exception):
+    """Raised when an aggregate was changed by someone else between being loaded and being saved."""
+
+    pass
+
+
+class DetachedAggregateException(Exception):
+    """Raised when an aggregate lazily loads state after the unit of work that loaded it has ended."""
+
+    pass
@@ -0,0 +1,184 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+from shared.application.command import Command
+from shared.application.command_bus import CommandBus
+from shared.application.metrics import Histogram, HistogramSnapshot, MetricSnapshot, MetricsRegistry, single_sample
+from shared.application.tracing import span
+from shared.application.unit_of_work import UnitOfWork
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Queued in place of a command to tell the writer thread to exit
+_STOP = object()
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+# Waits are bounded by max_wait, so the interesting range is well below a millisecond up to a few
+WAIT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+@dataclass(frozen=True)
+class GroupCommitStats:
+    """Counters of a GroupCommitWriter, plus the distribution of batch sizes and of time spent waiting for a batch."""
+
+    batches: int
+    commands: int
+    failed_batches: int
+    batch_size: HistogramSnapshot
+    wait: HistogramSnapshot
+
+
+@dataclass
+class _Pending:
+    command: Command
+    future: Future
+    enqueued_at: float
+
+
+class GroupCommitWriter:
+    """
+    Funnels commands submitted from many threads into one writer thread, which applies them in batches:
+    whatever arrives within `max_wait` seconds of the first command, up to `max_batch_size`,
+    runs in a single unit of work (one transaction, one commit) through CommandBus.dispatch_many.
+    Each command is still handled, and can fail, on its own; `submit` returns or raises its own outcome.
+    With `metrics`, the writer's stats are reported on each scrape, see `collect`.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], UnitOfWork],
+        command_bus_factory: Callable[[UnitOfWork], CommandBus],
+        max_batch_size: int = 64,
+        max_wait: float = 0.002,
+        metrics: MetricsRegistry | None = None,
+    ):
+        self.uow_factory = uow_factory
+        # Builds a command bus whose handlers use the given unit of work
+        self.command_bus_factory = command_bus_factory
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._accepting = True
+        self._thread: threading.Thread | None = None
+
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.wait = Histogram(WAIT_BUCKETS)
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._commands = 0
+        self._failed_batches = 0
+        if metrics:
+            metrics.register_collector(self.collect)
+
+    def submit(self, command: Command, timeout: float | None = None) -> Any:
+        """Blocks until the batch holding the command has committed; returns the handler's result or raises its exception."""
+        with span("group_commit.wait", command=type(command).__name__):
+            return self.submit_async(command).result(timeout)
+
+    def submit_async(self, command: Command) -> Future:
+        if not self._accepting:
+            raise RuntimeError("Group commit writer is stopped")
+        future: Future = Future()
+        self._queue.put(_Pending(command, future, time.perf_counter()))
+        return future
+
+    def start(self) -> "GroupCommitWriter":
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None):
+        """Stops accepting commands and waits for the ones already queued to be applied."""
+        self._accepting = False
+        self._queue.put(_STOP)
+        if self._thread:
+            self._thread.join(timeout)
+        # Anything that slipped in behind the stop marker is failed rather than left hanging
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is not _STOP:
+                pending.future.set_exception(RuntimeError("Group commit writer is stopped"))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is _STOP:
+                    stopping = True
+                    break
+                batch.append(pending)
+
+            self._apply(batch)
+
+    def _apply(self, batch: list[_Pending]):
+        started = time.perf_counter()
+        for pending in batch:
+            self.wait.observe(started - pending.enqueued_at)
+        self.batch_size.observe(len(batch))
+
+        try:
+            uow = self.uow_factory()
+            results = self.command_bus_factory(uow).dispatch_many([pending.command for pending in batch], uow)
+        except Exception:
+            # The whole transaction was rolled back; retry one by one so a single bad command cannot fail its neighbours
+            logger.exception(f"📦 Group commit of {len(batch)} commands failed; applying them one at a time.")
+            with self._lock:
+                self._failed_batches += 1
+            for pending in batch:
+                self._apply_alone(pending)
+        else:
+            for pending, result in zip(batch, results, strict=True):
+                if result.ok:
+                    pending.future.set_result(result.value)
+                else:
+                    pending.future.set_exception(result.exception)
+
+        with self._lock:
+            self._batches += 1
+            self._commands += len(batch)
+
+    def _apply_alone(self, pending: _Pending):
+        try:
+            uow = self.uow_factory()
+            value = self.command_bus_factory(uow).dispatch(pending.command)
+        except Exception as e:
+            pending.future.set_exception(e)
+        else:
+            pending.future.set_result(value)
+
+    def stats(self) -> GroupCommitStats:
+        with self._lock:
+            return GroupCommitStats(self._batches, self._commands, self._failed_batches, self.batch_size.snapshot(), self.wait.snapshot())
+
+    def collect(self) -> list[MetricSnapshot]:
+        """The writer stats as metrics, for a MetricsRegistry collector."""
+        stats = self.stats()
+        return [
+            single_sample("group_commit_batches_total", "Batches committed (or rolled back) by the group commit writer.", "counter", stats.batches),
+            single_sample("group_commit_commands_total", "Commands applied by the group commit writer.", "counter", stats.commands),
+            single_sample("group_commit_failed_batches_total", "Batches whose commit failed.", "counter", stats.failed_batches),
+            single_sample("group_commit_batch_size", "Commands per batch.", "histogram", stats.batch_size),
+            single_sample("group_commit_wait_seconds", "Time a command waited for its batch to start.", "histogram", stats.wait),
+        ]
@@ -0,0 +1,192 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from typing import Any
+
+# Upper bounds in seconds, from sub-millisecond SQLite reads up to slow event handlers
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Point-in-time copy of a histogram. `counts` has one extra slot for values above the last bucket."""
+
+    buckets: tuple[float, ...]
+    counts: tuple[int, ...]
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0 < q <= 100); inf if it overflowed."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts, strict=False):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Histogram:
+    """Thread-safe histogram with fixed bucket boundaries; observing a value is a bisect and an increment."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            return HistogramSnapshot(self.buckets, tuple(self._counts), self._count, self._sum)
+
+
+class Counter:
+    """Thread-safe monotonically increasing value."""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Thread-safe value that can go up and down, such as connections in use."""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+@dataclass(frozen=True)
+class MetricSnapshot:
+    """Point-in-time copy of a metric family: one value per combination of label values (a HistogramSnapshot for histograms)."""
+
+    name: str
+    help: str
+    kind: str
+    label_names: tuple[str, ...]
+    samples: tuple[tuple[tuple[str, ...], float | HistogramSnapshot], ...]
+
+
+def single_sample(name: str, help: str, kind: str, value: float | HistogramSnapshot, labels: dict[str, str] | None = None) -> MetricSnapshot:
+    """A metric family with one sample, for collectors reporting the stats of a single component."""
+    labels = labels or {}
+    return MetricSnapshot(name, help, kind, tuple(labels), ((tuple(labels.values()), value),))
+
+
+class MetricFamily:
+    """
+    A named counter, gauge or histogram with one child per combination of label values, such as
+    `command_duration_seconds{command="PlaceBidCommand"}`. Look children up once and keep them where the
+    label values are known in advance: `labels` is a dict lookup, and a lock on first use only.
+    """
+
+    def __init__(self, name: str, help: str, kind: str, label_names: tuple[str, ...], new_child: Callable[[], Any]):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.label_names = label_names
+        self._new_child = new_child
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def snapshot(self) -> MetricSnapshot:
+        with self._lock:
+            children = list(self._children.items())
+        samples = tuple((values, child.snapshot() if self.kind == "histogram" else child.value) for values, child in children)
+        return MetricSnapshot(self.name, self.help, self.kind, self.label_names, samples)
+
+
+class MetricsRegistry:
+    """
+    In-process registry of metric families, read by a scrape (see `collect`).
+    Declaring a family that already exists returns it, so every instance of a component can declare what it records.
+    Collectors are called on each scrape, for stats that already live elsewhere (e.g. per-route request stats).
+    """
+
+    def __init__(self):
+        self._families: dict[str, MetricFamily] = {}
+        self._collectors: list[Callable[[], Iterable[MetricSnapshot]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> MetricFamily:
+        return self._family(name, help, "counter", labels, Counter)
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> MetricFamily:
+        return self._family(name, help, "gauge", labels, Gauge)
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> MetricFamily:
+        return self._family(name, help, "histogram", labels, lambda: Histogram(buckets))
+
+    def _family(self, name: str, help: str, kind: str, labels: tuple[str, ...], new_child: Callable[[], Any]) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(name, help, kind, labels, new_child)
+            elif (family.kind, family.label_names) != (kind, labels):
+                raise ValueError(f"Metric {name} is already declared as a {family.kind} with labels {family.label_names}")
+            return family
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricSnapshot]]):
+        self._collectors.append(collector)
+
+    def collect(self) -> list[MetricSnapshot]:
+        with self._lock:
+            families = list(self._families.values())
+        snapshots = [family.snapshot() for family in families]
+        for collector in self._collectors:
+            snapshots.extend(collector())
+        # Instances of a component (e.g. one per pool) report the same families, which are exposed once
+        merged: dict[str, MetricSnapshot] = {}
+        for snapshot in snapshots:
+            first = merged.setdefault(snapshot.name, snapshot)
+            if first is not snapshot:
+                merged[snapshot.name] = replace(first, samples=first.samples + snapshot.samples)
+        return list(merged.values())
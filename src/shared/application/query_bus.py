@@ -1,19 +1,38 @@
+import time
 from typing import Any
 
+from shared.application.metrics import Histogram, MetricsRegistry
 from shared.application.query import Query
+from shared.application.tracing import span
 
 
 class QueryBus:
-    """In-memory query bus for dispatching queries to their handlers."""
+    """
+    In-memory query bus for dispatching queries to their handlers.
+    With `metrics`, each query is timed by query type. Inside a trace, each query is a span.
+    """
 
-    def __init__(self):
+    def __init__(self, metrics: MetricsRegistry | None = None):
         self._handlers: dict[type[Query], Any] = {}
+        self.metrics = metrics
+        # Query type -> its histogram, looked up when the handler is registered
+        self._durations: dict[type[Query], Histogram] = {}
 
     def register(self, query_type: type[Query], handler: Any):
         self._handlers[query_type] = handler
+        if self.metrics:
+            family = self.metrics.histogram("query_duration_seconds", "Time to handle a query.", ("query",))
+            self._durations[query_type] = family.labels(query_type.__name__)
 
     def dispatch(self, query: Query) -> Any:
         handler = self._handlers.get(type(query))
         if not handler:
             raise Exception(f"No handler registered for {type(query)}")
-        return handler.handle(query)
+        with span("query", query=type(query).__name__):
+            if not self.metrics:
+                return handler.handle(query)
+            started = time.perf_counter()
+            try:
+                return handler.handle(query)
+            finally:
+                self._durations[type(query)].observe(time.perf_counter() - started)
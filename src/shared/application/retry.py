@@ -0,0 +1,100 @@
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from shared.application.exception import ConcurrencyException
+from shared.application.metrics import MetricSnapshot, MetricsRegistry, single_sample
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    """Counters of a RetryPolicy since it was created."""
+
+    calls: int
+    attempts: int
+    conflicts: int
+    exhausted: int
+
+    @property
+    def conflict_rate(self) -> float:
+        """Share of attempts that ended in a concurrency conflict."""
+        return self.conflicts / self.attempts if self.attempts else 0.0
+
+
+class RetryPolicy:
+    """
+    Re-runs an operation that failed with a ConcurrencyException, up to `max_attempts` times in total.
+    Waits between attempts use exponential backoff with full jitter, so writers that collided
+    once spread out instead of colliding again in lockstep.
+    With `metrics`, the policy's stats are reported on each scrape, labelled with `name`.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.002,
+        max_delay: float = 0.1,
+        sleep: Callable[[float], None] = time.sleep,
+        name: str = "default",
+        metrics: MetricsRegistry | None = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._attempts = 0
+        self._conflicts = 0
+        self._exhausted = 0
+        if metrics:
+            metrics.register_collector(self.collect)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the attempt following the given (1-based) one."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def run(self, operation: Callable[[], T]) -> T:
+        with self._lock:
+            self._calls += 1
+        for attempt in range(1, self.max_attempts + 1):
+            with self._lock:
+                self._attempts += 1
+            try:
+                return operation()
+            except ConcurrencyException:
+                with self._lock:
+                    self._conflicts += 1
+                    if attempt == self.max_attempts:
+                        self._exhausted += 1
+                if attempt == self.max_attempts:
+                    logger.warning(f"⚔️ Giving up after {attempt} conflicting attempts.")
+                    raise
+                self.sleep(self.backoff(attempt))
+        raise AssertionError("unreachable")
+
+    def stats(self) -> RetryStats:
+        with self._lock:
+            return RetryStats(self._calls, self._attempts, self._conflicts, self._exhausted)
+
+    def collect(self) -> list[MetricSnapshot]:
+        """The policy stats as metrics, for a MetricsRegistry collector."""
+        stats = self.stats()
+        policy = {"policy": self.name}
+        return [
+            single_sample("retry_calls_total", "Operations run through the retry policy.", "counter", stats.calls, policy),
+            single_sample("retry_attempts_total", "Attempts, first ones included.", "counter", stats.attempts, policy),
+            single_sample("retry_conflicts_total", "Attempts that ended in a concurrency conflict.", "counter", stats.conflicts, policy),
+            single_sample("retry_exhausted_total", "Operations that still conflicted on their last attempt.", "counter", stats.exhausted, policy),
+        ]
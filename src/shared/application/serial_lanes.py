@@ -0,0 +1,14 @@
+import threading
+
+
+class SerialLanes:
+    """
+    A fixed set of locks. Work for the same key always takes the same lane, so it runs one at a time,
+    while work for other keys mostly proceeds in parallel. Bounded memory, however many keys there are.
+    """
+
+    def __init__(self, lanes: int = 64):
+        self._locks = [threading.Lock() for _ in range(lanes)]
+
+    def lane(self, key: str) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
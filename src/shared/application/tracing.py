@@ -0,0 +1,184 @@
+import json
+import logging
+import logging.handlers
+import random
+import time
+from contextlib import AbstractContextManager
+from contextvars import ContextVar
+from typing import Any, Protocol
+
+
+class Span:
+    """One timed operation of a trace. Attributes describe it (ids, counts, outcome) and must be JSON-encodable."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "started", "duration", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None, attributes: dict[str, Any]):
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.started = time.perf_counter()
+        self.duration: float | None = None
+        self.error: str | None = None
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "offset_ms": round((self.started - self.trace.started) * 1000, 3),
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """
+    The spans recorded under one root span. Work continued on another thread (e.g. an async event subscriber)
+    is recorded as a separate Trace with the same `trace_id`, whose root's parent is the span it continues.
+    """
+
+    def __init__(self, tracer: "Tracer", trace_id: str, sampled: bool):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.root: Span | None = None
+        # Appended to from whichever thread ends a span; list.append is atomic
+        self.spans: list[Span] = []
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "parent_id": self.root.parent_id,
+            "name": self.root.name,
+            "started_at": self.started_at,
+            "duration_ms": round((self.root.duration or 0.0) * 1000, 3),
+            "sampled": self.sampled,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+class TraceExporter(Protocol):
+    def export(self, trace: Trace): ...
+
+
+# The span the running code is inside of, if its request is being traced
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class _NoSpan:
+    """Stands in for a span outside of traces, so instrumented code needs no checks of its own."""
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: Any) -> None:
+        return None
+
+    def set(self, **attributes: Any):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class _SpanScope:
+    def __init__(self, trace: Trace, name: str, parent_id: str | None, attributes: dict[str, Any]):
+        self.span = Span(trace, name, parent_id, attributes)
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: Any) -> None:
+        span = self.span
+        span.duration = time.perf_counter() - span.started
+        if exc_value is not None:
+            span.error = f"{type(exc_value).__name__}: {exc_value}"
+        _current_span.reset(self._token)
+        span.trace.spans.append(span)
+
+
+class _TraceScope(_SpanScope):
+    def __init__(self, trace: Trace, name: str, parent_id: str | None, attributes: dict[str, Any]):
+        super().__init__(trace, name, parent_id, attributes)
+        trace.root = self.span
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: Any) -> None:
+        super().__exit__(exc_type, exc_value, traceback)
+        self.span.trace.tracer.finish(self.span.trace, self.span.duration)
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[Span | _NoSpan]:
+    """
+    A child of the current span, as a context manager: `with span("uow.commit") as s: ... s.set(events=2)`.
+    Outside of a recorded trace this is a shared no-op, which costs a context variable lookup.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return NO_SPAN
+    return _SpanScope(parent.trace, name, parent.span_id, attributes)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def continue_trace(parent: Span | None, name: str, **attributes: Any) -> AbstractContextManager[Span | _NoSpan]:
+    """A root span, on another thread, for work handed off from `parent` (e.g. queued); a no-op if it was None."""
+    if parent is None:
+        return NO_SPAN
+    trace = Trace(parent.trace.tracer, parent.trace.trace_id, parent.trace.sampled)
+    return _TraceScope(trace, name, parent.span_id, attributes)
+
+
+class Tracer:
+    """
+    Starts traces at the edge of the application (see `trace`); everything below records spans through `span`,
+    found via a context variable, so nothing has to be passed down.
+    Head sampling: a trace is kept from the start with probability `sample_rate`. With `slow_threshold` (seconds),
+    every trace is recorded too, and kept if it took at least that long: cheap, as spans only live in memory until
+    the trace ends. Kept traces go to the exporter when their root span ends.
+    """
+
+    def __init__(self, exporter: TraceExporter, sample_rate: float = 0.01, slow_threshold: float | None = None):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+
+    def trace(self, name: str, **attributes: Any) -> AbstractContextManager[Span | _NoSpan]:
+        """The root span of a new trace, as a context manager; a no-op when it is neither sampled nor watched for slowness."""
+        sampled = random.random() < self.sample_rate
+        if not sampled and self.slow_threshold is None:
+            return NO_SPAN
+        trace = Trace(self, f"{random.getrandbits(128):032x}", sampled)
+        return _TraceScope(trace, name, None, attributes)
+
+    def finish(self, trace: Trace, duration: float):
+        if trace.sampled or (self.slow_threshold is not None and duration >= self.slow_threshold):
+            self.exporter.export(trace)
+
+
+class JSONLTraceExporter:
+    """
+    Appends each trace as one JSON line to `path`, rotated once it reaches `max_bytes`, keeping `backup_count`
+    older files (`path.1`, `path.2`...). The handler serializes writes, so traces from any thread can be exported.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+        self._handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def export(self, trace: Trace):
+        self._handler.handle(logging.makeLogRecord({"msg": json.dumps(trace.to_dict(), default=str)}))
+
+    def close(self):
+        self._handler.close()
@@ -5,6 +5,8 @@ from types import TracebackType
 class UnitOfWork(ABC):
     """
     Abstract Context Manager for Unit of Work pattern.
+    Implementations may support nesting: entering an open UoW again starts a scope that is
+    undone on its own if it fails, while only the outermost exit commits (see CommandBus.dispatch_many).
     """
 
     def __enter__(self) -> "UnitOfWork":
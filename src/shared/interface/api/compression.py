@@ -0,0 +1,137 @@
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+
+from shared.interface.api.json_stream import CHUNK_SIZE, ChunkedBody
+
+# Supported content codings, in order of preference when a client accepts several equally; values are zlib's wbits
+ENCODINGS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """The content coding to answer an Accept-Encoding header with, or None for the body as is."""
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding == "*":
+            for encoding in ENCODINGS:
+                weights.setdefault(encoding, quality)
+        elif coding in ENCODINGS:
+            weights[coding] = quality
+    accepted = [encoding for encoding in ENCODINGS if weights.get(encoding, 0.0) > 0]
+    return max(accepted, key=lambda encoding: weights[encoding]) if accepted else None
+
+
+class CompressedBodyCache:
+    """
+    Compressed bodies by (ETag, content coding), least recently used first out, bounded in bytes.
+    A strong ETag names one exact body, so entries never go stale: they only stop being asked for.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entry_bytes: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str, encoding: str) -> bytes | None:
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((etag, encoding))
+            self.hits += 1
+            return body
+
+    def put(self, etag: str, encoding: str, body: bytes):
+        if len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((etag, encoding), None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[(etag, encoding)] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+class CompressedStream(ChunkedBody):
+    """A streamed body compressed as it is produced. Each chunk is flushed, so the client can decode it right away."""
+
+    def __init__(self, body: ChunkedBody, encoding: str, level: int, on_complete: Callable[[bytes], None] | None = None):
+        self.body = body
+        self.encoding = encoding
+        self.level = level
+        # Called with the whole compressed body once it has been produced (for caching)
+        self.on_complete = on_complete
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, ENCODINGS[self.encoding])
+        produced: list[bytes] | None = [] if self.on_complete else None
+        for chunk in self.body.chunks(chunk_size):
+            compressed = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if produced is not None:
+                produced.append(compressed)
+            yield compressed
+        compressed = compressor.flush()
+        if produced is not None:
+            produced.append(compressed)
+            self.on_complete(b"".join(produced))
+        yield compressed
+
+    def close(self):
+        self.body.close()
+
+
+class ResponseCompressor:
+    """
+    Content-coding negotiation for response bodies: gzip or deflate, at `level` (1 fastest to 9 smallest).
+    Bodies shorter than `min_size` are sent as they are, since compressing them saves next to nothing.
+    Streamed bodies are always compressed when the client accepts it, their size being unknown up front.
+    With a cache, bodies that have an ETag are compressed once per coding.
+    """
+
+    def __init__(self, level: int = 6, min_size: int = 1024, cache: CompressedBodyCache | None = None):
+        if not 1 <= level <= 9:
+            raise ValueError("Compression level must be between 1 and 9")
+        self.level = level
+        self.min_size = min_size
+        self.cache = cache
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, ENCODINGS[encoding])
+        return compressor.compress(body) + compressor.flush()
+
+    def compress_body(self, body: bytes, encoding: str, etag: str | None = None) -> bytes | None:
+        """The compressed body (cached under its ETag), or None when it is too short to be worth it."""
+        if len(body) < self.min_size:
+            return None
+        compressed = self.compress(body, encoding)
+        if etag and self.cache:
+            self.cache.put(etag, encoding, compressed)
+        return compressed
+
+    def compress_stream(self, body: ChunkedBody, encoding: str, etag: str | None = None) -> CompressedStream:
+        on_complete = (lambda compressed: self.cache.put(etag, encoding, compressed)) if etag and self.cache else None
+        return CompressedStream(body, encoding, self.level, on_complete)
+
+    def cached(self, etag: str, encoding: str) -> bytes | None:
+        """A body compressed earlier for this ETag and coding, if the cache still has it."""
+        return self.cache.get(etag, encoding) if self.cache else None
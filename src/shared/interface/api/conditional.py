@@ -0,0 +1,69 @@
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from shared.interface.api.compression import ENCODINGS
+
+
+def strong_etag(*parts: Any) -> str:
+    """A quoted strong entity tag for a representation fully determined by `parts`."""
+    return f'"{hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).hexdigest()}"'
+
+
+def coded_etag(etag: str, encoding: str) -> str:
+    """The ETag of the compressed form of a representation: its bytes differ, so a strong tag must too."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _uncoded(etag: str) -> str:
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+@dataclass(frozen=True)
+class Validators:
+    """What a client can revalidate its copy of a representation with: a strong ETag, and when it last changed."""
+
+    etag: str
+    last_modified: datetime | None = None
+
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified.replace(microsecond=0), usegmt=True)
+        return headers
+
+    def not_modified(self, request_headers: Mapping[str, str]) -> bool:
+        """
+        Whether a GET with these headers can be answered with 304 Not Modified (RFC 9110, section 13).
+        If-Modified-Since only counts when there is no If-None-Match. Header names are looked up in lower case.
+        """
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            # If-None-Match uses the weak comparison: a W/ prefix does not matter, and neither does the content coding
+            return any(_uncoded(tag.strip().removeprefix("W/")) == self.etag for tag in if_none_match.split(","))
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if not if_modified_since or not self.last_modified:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates have whole seconds
+        return self.last_modified.replace(microsecond=0) <= since
+
+    def matched_coded(self, request_headers: Mapping[str, str], encoding: str) -> bool:
+        """Whether If-None-Match names the tag of this representation compressed with `encoding`."""
+        coded = coded_etag(self.etag, encoding)
+        return any(tag.strip().removeprefix("W/") == coded for tag in request_headers.get("if-none-match", "").split(","))
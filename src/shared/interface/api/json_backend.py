@@ -0,0 +1,81 @@
+import json
+import logging
+from typing import Any, Protocol
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+class JSONBackend(Protocol):
+    """
+    Encodes response bodies. The separators are exposed so pre-encoded fragments can be
+    spliced into the backend's own output without changing its formatting.
+    """
+
+    name: str
+    item_separator: bytes
+    key_separator: bytes
+
+    def dumps(self, value: Any) -> bytes: ...
+
+
+class StdlibJSONBackend:
+    """The standard library encoder: output is exactly `json.dumps(value).encode()`."""
+
+    name = "stdlib"
+    item_separator = b", "
+    key_separator = b": "
+
+    def __init__(self):
+        # What json.dumps uses for default arguments, without its per-call argument handling.
+        # Circular references are still detected, raising ValueError like json.dumps.
+        self._encode = json.JSONEncoder().encode
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encode(value).encode("utf-8")
+
+
+class OrjsonJSONBackend:
+    """orjson (optional dependency): compact separators and UTF-8 output rather than escapes."""
+
+    name = "orjson"
+    item_separator = b","
+    key_separator = b":"
+
+    def __init__(self):
+        import orjson
+
+        self.dumps = orjson.dumps
+
+
+def select_json_backend(name: str = "stdlib") -> JSONBackend:
+    """
+    "stdlib", "orjson", or "auto" (orjson when it is installed).
+    Falls back to the standard library when orjson is not available.
+    """
+    if name not in ("stdlib", "orjson", "auto"):
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if name != "stdlib":
+        try:
+            return OrjsonJSONBackend()
+        except ImportError:
+            if name == "orjson":
+                logger.warning("⚠️ orjson is not installed, encoding JSON with the standard library.")
+    return StdlibJSONBackend()
+
+
+STDLIB_JSON = StdlibJSONBackend()
+
+
+class StaticJSON:
+    """A constant response body, encoded once per backend."""
+
+    def __init__(self, value: Any):
+        self.value = value
+        self._encoded: dict[str, bytes] = {}
+
+    def encode(self, backend: JSONBackend) -> bytes:
+        encoded = self._encoded.get(backend.name)
+        if encoded is None:
+            encoded = self._encoded[backend.name] = backend.dumps(self.value)
+        return encoded
@@ -0,0 +1,97 @@
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from shared.interface.api.json_backend import STDLIB_JSON, JSONBackend
+
+# Encoded items are gathered into chunks of about this size, so a chunk is not one tiny write per item
+CHUNK_SIZE = 16 * 1024
+
+
+class ChunkedBody(ABC):
+    """A response body produced in pieces, sent with `Transfer-Encoding: chunked` to clients that support it."""
+
+    @abstractmethod
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """The body, in pieces of roughly `chunk_size` bytes."""
+
+    @abstractmethod
+    def close(self):
+        """Releases what the body is produced from, even if it was not all read. The servers always call it."""
+
+
+class JSONStream(ChunkedBody):
+    """
+    A JSON object whose array of items is encoded as it is produced, to send large results without
+    holding them in memory. Keys in `head` come before the array; `tail` is called once the items are
+    exhausted, for keys that depend on them (such as a link to the next page).
+    Items are encoded with `encode_item` when given (e.g. a precompiled resource encoder), otherwise
+    with the backend; either way the result is byte-for-byte `backend.dumps(stream.collect())`.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        key: str = "items",
+        head: dict[str, Any] | None = None,
+        tail: Callable[[], dict[str, Any]] | None = None,
+        on_close: Callable[[], Any] | None = None,
+        backend: JSONBackend = STDLIB_JSON,
+        encode_item: Callable[[Any], bytes] | None = None,
+    ):
+        self.items = items
+        self.key = key
+        self.head = head or {}
+        self.tail = tail
+        self.on_close = on_close
+        self.backend = backend
+        self.encode_item = encode_item or backend.dumps
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """The encoded object, in pieces of roughly `chunk_size` bytes."""
+        dumps, encode_item = self.backend.dumps, self.encode_item
+        key_separator, item_separator = self.backend.key_separator, self.backend.item_separator
+
+        buffer = bytearray(b"{")
+        for name, value in self.head.items():
+            buffer += dumps(name) + key_separator + dumps(value) + item_separator
+        buffer += dumps(self.key) + key_separator + b"["
+
+        separator = b""
+        for item in self.items:
+            buffer += separator
+            buffer += encode_item(item)
+            separator = item_separator
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        buffer += b"]"
+        for name, value in (self.tail() if self.tail else {}).items():
+            buffer += item_separator + dumps(name) + key_separator + dumps(value)
+        buffer += b"}"
+        yield bytes(buffer)
+
+    def collect(self) -> dict[str, Any]:
+        """Reads every item and returns the object as plain data, decoded from its encoding."""
+        try:
+            return json.loads(b"".join(self.chunks()))
+        finally:
+            self.close()
+
+    def close(self):
+        """Releases what the items are read from (e.g. a pooled connection), even if they were not all read."""
+        close = getattr(self.items, "close", None)
+        if close:
+            close()
+        if self.on_close:
+            self.on_close()
+
+
+def chunked(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Frames chunks for `Transfer-Encoding: chunked`, ending with the zero-length chunk."""
+    for chunk in chunks:
+        if chunk:
+            yield b"%x\r\n%s\r\n" % (len(chunk), chunk)
+    yield b"0\r\n\r\n"
@@ -0,0 +1,47 @@
+from collections.abc import Iterable
+
+from shared.application.metrics import HistogramSnapshot, MetricSnapshot
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render_prometheus(snapshots: Iterable[MetricSnapshot]) -> bytes:
+    """The metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+    for metric in snapshots:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for values, value in metric.samples:
+            if isinstance(value, HistogramSnapshot):
+                # Buckets are cumulative in the exposition format, and end with +Inf
+                cumulative = 0
+                for bound, count in zip((*value.buckets, float("inf")), value.counts, strict=True):
+                    cumulative += count
+                    le = 'le="' + _number(bound) + '"'
+                    lines.append(f"{metric.name}_bucket{_labels(metric.label_names, values, le)} {cumulative}")
+                lines.append(f"{metric.name}_sum{_labels(metric.label_names, values)} {_number(value.sum)}")
+                lines.append(f"{metric.name}_count{_labels(metric.label_names, values)} {value.count}")
+            else:
+                lines.append(f"{metric.name}{_labels(metric.label_names, values)} {_number(value)}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,117 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from interface.api.async_server import AsyncHTTPServer
+from shared.interface.api.json_backend import STDLIB_JSON
+from shared.interface.api.json_stream import JSONStream, chunked
+
+
+async def _exchange(server: AsyncHTTPServer, raw: bytes) -> bytes:
+    tcp = await asyncio.start_server(server._handle_connection, "127.0.0.1", 0)
+    port = tcp.sockets[0].getsockname()[1]
+    async with tcp:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+    return response
+
+
+def make_server():
+    routes = MagicMock(json_backend=STDLIB_JSON)
+    routes.dispatch.side_effect = lambda method, target, content_type, body, headers: (200, {"method": method, "target": target}, {})
+    return AsyncHTTPServer(routes, workers=2), routes
+
+
+def test_pipelined_requests_are_answered_in_order_on_one_connection():
+    server, routes = make_server()
+
+    raw = b"GET /a HTTP/1.1\r\nHost: x\r\n\r\nGET /b HTTP/1.1\r\nHost: x\r\n\r\nGET /c HTTP/1.1\r\nConnection: close\r\n\r\n"
+    response = asyncio.run(_exchange(server, raw))
+
+    assert response.count(b"HTTP/1.1 200 OK") == 3
+    assert response.index(b'"/a"') < response.index(b'"/b"') < response.index(b'"/c"')
+    assert b"Connection: keep-alive" in response
+    assert response.rstrip().endswith(b'"/c"}')
+    server.executor.shutdown()
+
+
+def test_post_body_is_read_by_content_length():
+    server, routes = make_server()
+
+    raw = b'POST /auctions HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: 13\r\nConnection: close\r\n\r\n{"item": "x"}'
+    response = asyncio.run(_exchange(server, raw))
+
+    assert b"HTTP/1.1 200 OK" in response
+    headers = {"content-type": "application/json", "content-length": "13", "connection": "close"}
+    routes.dispatch.assert_called_once_with("POST", "/auctions", "application/json", b'{"item": "x"}', headers)
+    server.executor.shutdown()
+
+
+def test_http_10_closes_after_response_and_rejects_unknown_methods():
+    server, _ = make_server()
+
+    assert b"Connection: close" in asyncio.run(_exchange(server, b"GET / HTTP/1.0\r\n\r\n"))
+    assert b"HTTP/1.1 501" in asyncio.run(_exchange(server, b"DELETE /auctions HTTP/1.1\r\n\r\n"))
+    server.executor.shutdown()
+
+
+def make_streaming_server():
+    routes = MagicMock(json_backend=STDLIB_JSON)
+    routes.dispatch.side_effect = lambda method, target, content_type, body, headers: (200, JSONStream(iter([{"n": i} for i in range(3)])), {})
+    return AsyncHTTPServer(routes, workers=2)
+
+
+def test_streams_are_sent_chunked_to_http_11_clients():
+    server = make_streaming_server()
+
+    response = asyncio.run(_exchange(server, b"GET /auctions HTTP/1.1\r\nConnection: close\r\n\r\n"))
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert b"Transfer-Encoding: chunked" in head
+    assert b"Content-Length" not in head
+    assert body == b"".join(chunked([b'{"items": [{"n": 0}, {"n": 1}, {"n": 2}]}']))
+    server.executor.shutdown()
+
+
+def test_streams_are_sent_whole_to_http_10_clients():
+    server = make_streaming_server()
+
+    response = asyncio.run(_exchange(server, b"GET /auctions HTTP/1.0\r\n\r\n"))
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert b"Content-Length: 41" in head
+    assert body == b'{"items": [{"n": 0}, {"n": 1}, {"n": 2}]}'
+    server.executor.shutdown()
+
+
+def test_not_modified_has_validators_and_no_body():
+    routes = MagicMock(json_backend=STDLIB_JSON)
+    routes.dispatch.return_value = (304, None, {"ETag": '"v1"'})
+    server = AsyncHTTPServer(routes, workers=2)
+
+    raw = b'GET /auctions/1 HTTP/1.1\r\nIf-None-Match: "v1"\r\n\r\nGET /auctions/1 HTTP/1.1\r\nConnection: close\r\n\r\n'
+    response = asyncio.run(_exchange(server, raw))
+
+    # Both responses arrive: without a body the first one ends at its blank line
+    assert response.count(b'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\nConnection: keep-alive\r\n\r\n') == 1
+    assert response.endswith(b'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\nConnection: close\r\n\r\n')
+    assert b"Content-Length" not in response
+    assert routes.dispatch.call_args_list[0].args[4]["if-none-match"] == '"v1"'
+    server.executor.shutdown()
+
+
+def test_draining_server_closes_keep_alive_connections_after_the_response():
+    server, routes = make_server()
+    server.draining = True
+
+    # The second request is never read: the connection closes after the first response
+    raw = b"GET /a HTTP/1.1\r\nHost: x\r\n\r\nGET /b HTTP/1.1\r\nHost: x\r\n\r\n"
+    response = asyncio.run(_exchange(server, raw))
+
+    assert response.count(b"HTTP/1.1 200 OK") == 1
+    assert b"Connection: close" in response
+    assert routes.dispatch.call_count == 1
+    assert asyncio.run(server.drain(timeout=0.1))
+    server.executor.shutdown()
@@ -0,0 +1,77 @@
+import os
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+# Workers answer every connection with their pid
+SUPERVISOR = """
+import os, sys
+from interface.api.prefork import PreforkSupervisor
+
+def worker(sock, ready):
+    ready()
+    while True:
+        connection, _ = sock.accept()
+        connection.sendall(str(os.getpid()).encode())
+        connection.close()
+
+PreforkSupervisor(worker, 2, int(sys.argv[1]), host="127.0.0.1", graceful_timeout=2).run()
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def ask_pid(port: int) -> int:
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        return int(sock.recv(32))
+
+
+class Log:
+    """The supervisor's log lines, as they come."""
+
+    def __init__(self, stream):
+        self._lines: queue.Queue[str] = queue.Queue()
+        threading.Thread(target=lambda: [self._lines.put(line) for line in stream], daemon=True).start()
+
+    def wait_for(self, text: str, times: int = 1) -> list[str]:
+        found = []
+        while len(found) < times:
+            line = self._lines.get(timeout=20)
+            if text in line:
+                found.append(line)
+        return found
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-forking needs os.fork")
+def test_supervisor_restarts_crashed_workers_reloads_on_sighup_and_stops_on_sigterm():
+    port = free_port()
+    # Importing the supervisor the way this test process does
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    process = subprocess.Popen([sys.executable, "-c", SUPERVISOR, str(port)], stderr=subprocess.PIPE, text=True, env=env)
+    log = Log(process.stderr)
+    try:
+        log.wait_for("Started worker", times=2)
+        crashed = ask_pid(port)
+
+        os.kill(crashed, signal.SIGKILL)
+        log.wait_for(f"(pid {crashed}) exited with -9")
+        log.wait_for("Started worker")
+
+        process.send_signal(signal.SIGHUP)
+        assert len(log.wait_for("Started worker", times=2)) == 2
+        log.wait_for("Reloaded every worker")
+        assert ask_pid(port) != crashed
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+    finally:
+        process.kill()
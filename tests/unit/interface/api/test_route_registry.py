@@ -0,0 +1,46 @@
+import pytest
+
+from interface.api.route_registry import UNMATCHED, Route, RouteRegistry
+
+
+def controller(body, params):
+    return 200, params
+
+
+def test_registry_matches_templates_with_literals_first():
+    by_id = Route("GET", "/auctions/{id}", controller)
+    batch = Route("GET", "/auctions/batch", controller)
+    bids = Route("GET", "/auctions/{id}/bids/{bidder}", controller)
+    registry = RouteRegistry([by_id, batch, bids])
+
+    assert registry.match("GET", "/auctions/batch") == (batch, {})
+    assert registry.match("GET", "/auctions/42") == (by_id, {"id": "42"})
+    assert registry.match("GET", "/auctions/42/bids/u1") == (bids, {"id": "42", "bidder": "u1"})
+    assert registry.match("GET", "/auctions/42/offers/u1") is None
+    assert registry.match("GET", "/auctions//bids/u1") is None
+    assert registry.match("POST", "/auctions/42") is None
+
+
+def test_registry_rejects_malformed_and_duplicate_templates():
+    registry = RouteRegistry([Route("GET", "/auctions/{id}", controller)])
+
+    with pytest.raises(ValueError):
+        registry.add(Route("GET", "/auctions/{id}", controller))
+    with pytest.raises(ValueError):
+        registry.add(Route("GET", "/auctions/{auction_id}", controller))
+    with pytest.raises(ValueError):
+        registry.add(Route("GET", "/auctions/id-{id}", controller))
+    with pytest.raises(ValueError):
+        registry.add(Route("GET", "auctions", controller))
+
+
+def test_registry_records_requests_per_template():
+    registry = RouteRegistry([Route("GET", "/auctions/{id}", controller)], buckets=(0.01, 0.1))
+    registry.record("GET", "/auctions/{id}", 200, 0.005)
+    registry.record("GET", "/auctions/{id}", 404, 0.05)
+    registry.record("GET", UNMATCHED, 404, 0.001)
+
+    by_id, unmatched = registry.stats()
+    assert (by_id.template, by_id.count, by_id.statuses) == ("/auctions/{id}", 2, {200: 1, 404: 1})
+    assert by_id.latency.counts == (1, 1, 0)
+    assert (unmatched.method, unmatched.template, unmatched.statuses) == ("GET", UNMATCHED, {404: 1})
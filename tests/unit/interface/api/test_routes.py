@@ -0,0 +1,163 @@
+import gzip
+import json
+from unittest.mock import MagicMock
+
+from interface.api.routes import RouteTable, parse_body, root
+from module.auction.domain.exception import AuctionException
+from shared.application.exception import ConcurrencyException
+from shared.application.metrics import MetricsRegistry
+from shared.application.tracing import Tracer
+from shared.interface.api.compression import CompressedBodyCache, ResponseCompressor
+from shared.interface.api.conditional import Validators
+
+
+def make_routes():
+    auction_ctrl = MagicMock()
+    bid_ctrl = MagicMock()
+    # Representations without validators, unless a test sets them
+    auction_ctrl.list_validators.return_value = None
+    auction_ctrl.auction_validators.return_value = None
+    bid_ctrl.bids_validators.return_value = None
+    return RouteTable(auction_ctrl, bid_ctrl), auction_ctrl, bid_ctrl
+
+
+def test_match_resolves_path_parameters():
+    routes, auction_ctrl, bid_ctrl = make_routes()
+
+    assert routes.match("GET", "/") == (root, {})
+    assert routes.match("GET", "/auctions") == (auction_ctrl.list_auctions, {})
+    assert routes.match("GET", "/auctions/123") == (auction_ctrl.get_auction, {"id": "123"})
+    assert routes.match("GET", "/auctions/123/bids") == (bid_ctrl.list_bids, {"id": "123"})
+    assert routes.match("POST", "/auctions") == (auction_ctrl.create_auction, {})
+    assert routes.match("POST", "/auctions/123/bids") == (bid_ctrl.place_bid, {"id": "123"})
+    assert routes.match("POST", "/auctions/batch") == (auction_ctrl.create_auctions_batch, {})
+    assert routes.match("POST", "/bids/batch") == (bid_ctrl.place_bids_batch, {})
+    assert routes.match("POST", "/auctions/123") is None
+    assert routes.match("GET", "/unknown/a/b/c") is None
+
+
+def test_dispatch_merges_query_string_and_body():
+    routes, auction_ctrl, bid_ctrl = make_routes()
+    auction_ctrl.list_auctions.return_value = (200, {"items": []})
+    bid_ctrl.place_bid.return_value = (200, {"message": "Bid accepted"})
+
+    assert routes.dispatch("GET", "/auctions?limit=5&sort=-id") == (200, {"items": []}, {})
+    auction_ctrl.list_auctions.assert_called_once_with(None, {"limit": "5", "sort": "-id"})
+
+    routes.dispatch("POST", "/auctions/9/bids", "application/json", b'{"bidder_id": "u1", "amount": 5}')
+    bid_ctrl.place_bid.assert_called_once_with({"bidder_id": "u1", "amount": 5}, {"id": "9"})
+
+
+def test_dispatch_maps_errors_to_status_codes():
+    routes, auction_ctrl, bid_ctrl = make_routes()
+    bid_ctrl.place_bid.side_effect = AuctionException("Auction is closed.")
+    auction_ctrl.get_auction.side_effect = RuntimeError("boom")
+    bid_ctrl.place_bids_batch.side_effect = ConcurrencyException("conflict")
+
+    assert routes.dispatch("GET", "/nowhere") == (404, {"error": "Not Found"}, {})
+    assert routes.dispatch("POST", "/bids/batch", "application/json", b"{}") == (409, {"error": "conflict", "type": "ConcurrencyConflict"}, {})
+    assert routes.dispatch("POST", "/auctions/1/bids", "application/json", b"{}")[0] == 400
+    assert routes.dispatch("GET", "/auctions/1") == (500, {"error": "boom"}, {})
+
+
+def test_parse_body_handles_forms_and_invalid_json():
+    assert parse_body("application/x-www-form-urlencoded", b"item_id=a&starting_price=5") == {"item_id": "a", "starting_price": "5"}
+    assert parse_body("application/json", b"not json") == {}
+    assert parse_body("application/json", b"") == {}
+
+
+def test_conditional_get_answers_304_without_running_the_controller():
+    routes, auction_ctrl, _ = make_routes()
+    auction_ctrl.auction_validators.return_value = Validators('"v1"')
+    auction_ctrl.get_auction.return_value = (200, {"id": "1"})
+
+    assert routes.dispatch("GET", "/auctions/1") == (200, {"id": "1"}, {"ETag": '"v1"'})
+    assert routes.dispatch("GET", "/auctions/1", headers={"if-none-match": '"v1"'}) == (304, None, {"ETag": '"v1"'})
+    assert routes.dispatch("GET", "/auctions/1", headers={"if-none-match": '"v0"'})[0] == 200
+    assert auction_ctrl.get_auction.call_count == 2
+    auction_ctrl.auction_validators.assert_called_with({"id": "1"})
+
+    # Errors carry no validators
+    auction_ctrl.get_auction.return_value = (404, {"error": "Auction not found"})
+    assert routes.dispatch("GET", "/auctions/1") == (404, {"error": "Auction not found"}, {})
+
+
+def test_dispatch_compresses_large_bodies_and_serves_them_again_from_the_cache():
+    auction_ctrl, bid_ctrl = MagicMock(), MagicMock()
+    routes = RouteTable(auction_ctrl, bid_ctrl, compressor=ResponseCompressor(min_size=100, cache=CompressedBodyCache()))
+    auction = {"id": "1", "bids": [{"bidder_id": f"u{i}", "amount": i} for i in range(50)]}
+    auction_ctrl.auction_validators.return_value = Validators('"v1"')
+    auction_ctrl.get_auction.return_value = (200, auction)
+    gzip_only = {"accept-encoding": "gzip"}
+
+    status, body, headers = routes.dispatch("GET", "/auctions/1", headers=gzip_only)
+
+    assert status == 200
+    assert gzip.decompress(body) == json.dumps(auction).encode()
+    assert headers == {"ETag": '"v1-gzip"', "Vary": "Accept-Encoding", "Content-Encoding": "gzip"}
+    assert routes.dispatch("GET", "/auctions/1", headers=gzip_only) == (200, body, headers)
+    assert auction_ctrl.get_auction.call_count == 1
+    # The compressed form's tag revalidates the representation
+    assert routes.dispatch("GET", "/auctions/1", headers={**gzip_only, "if-none-match": '"v1-gzip"'}) == (
+        304,
+        None,
+        {"ETag": '"v1-gzip"', "Vary": "Accept-Encoding"},
+    )
+    # A client holding the identity form is sent its tag back
+    assert routes.dispatch("GET", "/auctions/1", headers={**gzip_only, "if-none-match": '"v1"'}) == (
+        304,
+        None,
+        {"ETag": '"v1"', "Vary": "Accept-Encoding"},
+    )
+    # Without Accept-Encoding, or for a short body, the body is sent as it is
+    assert routes.dispatch("GET", "/auctions/1")[1:] == (auction, {"ETag": '"v1"', "Vary": "Accept-Encoding"})
+    auction_ctrl.get_auction.return_value = (404, {"error": "Auction not found"})
+    auction_ctrl.auction_validators.return_value = None
+    assert routes.dispatch("GET", "/auctions/2", headers=gzip_only) == (404, b'{"error": "Auction not found"}', {"Vary": "Accept-Encoding"})
+
+
+def test_dispatch_records_stats_per_route_template():
+    routes, auction_ctrl, _ = make_routes()
+    auction_ctrl.get_auction.return_value = (200, {"id": "1"})
+
+    routes.dispatch("GET", "/auctions/1")
+    routes.dispatch("GET", "/auctions/2?fields=id")
+    routes.dispatch("GET", "/nowhere/1")
+
+    stats = {(s.method, s.template): s for s in routes.registry.stats()}
+    assert stats[("GET", "/auctions/{id}")].statuses == {200: 2}
+    assert stats[("GET", "/auctions/{id}")].latency.sum > 0
+    assert stats[("GET", "<unmatched>")].count == 1
+    assert stats[("POST", "/auctions")].count == 0
+
+
+def test_metrics_route_serves_the_registry_with_route_stats():
+    metrics = MetricsRegistry()
+    metrics.counter("events_published_total", "Domain events published.", ("event",)).labels("BidPlaced").inc()
+    routes = RouteTable(MagicMock(), MagicMock(), metrics=metrics)
+    routes.dispatch("GET", "/nowhere")
+
+    status, body, headers = routes.dispatch("GET", "/metrics")
+
+    assert status == 200
+    assert headers == {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+    lines = body.decode().splitlines()
+    assert 'events_published_total{event="BidPlaced"} 1' in lines
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in lines
+
+
+def test_dispatch_is_the_root_span_of_a_sampled_trace():
+    traces = []
+    exporter = MagicMock()
+    exporter.export.side_effect = traces.append
+    auction_ctrl = MagicMock()
+    auction_ctrl.auction_validators.return_value = None
+    auction_ctrl.get_auction.return_value = (200, {"id": "1"})
+    routes = RouteTable(auction_ctrl, MagicMock(), tracer=Tracer(exporter, sample_rate=1.0))
+
+    routes.dispatch("GET", "/auctions/1")
+
+    (trace,) = traces
+    controller, request = trace.spans
+    assert request.attributes == {"method": "GET", "target": "/auctions/1", "route": "/auctions/{id}", "status": 200}
+    assert controller.parent_id == request.span_id
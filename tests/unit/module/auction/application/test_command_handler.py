@@ -1,12 +1,15 @@
 import pytest
 
-from module.auction.application.command import CreateAuctionCommand, PlaceBidCommand
-from module.auction.application.command_handler import CreateAuctionHandler, PlaceBidHandler
+from module.auction.application.command import CreateAuctionCommand, PlaceBidCommand, RebuildAuctionSummaryCommand
+from module.auction.application.command_handler import CreateAuctionHandler, PlaceBidHandler, RebuildAuctionSummaryHandler
 from module.auction.application.unit_of_work import AuctionUnitOfWork
 from module.auction.application.write_repository import AuctionWriteRepository
 from module.auction.domain.entity import Auction
+from module.auction.domain.event import AuctionCreated
 from module.auction.domain.exception import AuctionException
 from module.auction.domain.value_object import AuctionID
+from shared.application.exception import ConcurrencyException
+from shared.application.retry import RetryPolicy
 
 
 class MockAuctionWriteRepository(AuctionWriteRepository):
@@ -119,3 +122,52 @@ def test_place_bid_handler_domain_rule_violation():
 
     assert "must be higher" in str(excinfo.value)
     assert uow.rolled_back is True
+
+
+def test_create_auction_handler_records_auction_created():
+    repo = MockAuctionWriteRepository()
+    handler = CreateAuctionHandler(MockAuctionUnitOfWork(repo))
+
+    auction_id = handler.handle(CreateAuctionCommand(item_id="item-1", starting_price=10.0))
+
+    assert [type(e) for e in repo.saved_auction.events] == [AuctionCreated]
+    assert repo.saved_auction.events[0].auction_id == auction_id
+
+
+def test_rebuild_auction_summary_handler_delegates_to_projection():
+    class FakeProjection:
+        def rebuild(self) -> int:
+            return 3
+
+    assert RebuildAuctionSummaryHandler(FakeProjection()).handle(RebuildAuctionSummaryCommand()) == 3
+
+
+def test_place_bid_handler_retries_conflicts_against_fresh_auction():
+    repo = MockAuctionWriteRepository()
+    auction_id = AuctionID.generate()
+
+    def load_fresh(_):
+        # Like the real repository: every attempt rehydrates a new aggregate from storage
+        fresh = Auction(item_id="item-1", starting_price=10.0)
+        fresh.id = auction_id
+        return fresh
+
+    repo.find_by_id = load_fresh
+    original_save = repo.save
+    attempts = []
+
+    def save_conflicting_once(saved):
+        attempts.append(saved.current_price)
+        if len(attempts) == 1:
+            raise ConcurrencyException("conflict")
+        original_save(saved)
+
+    repo.save = save_conflicting_once
+    uow = MockAuctionUnitOfWork(repo)
+    policy = RetryPolicy(sleep=lambda _: None)
+
+    PlaceBidHandler(uow, policy).handle(PlaceBidCommand(auction_id=auction_id.value, bidder_id="u1", amount=20.0))
+
+    assert len(attempts) == 2
+    assert uow.rolled_back and uow.committed
+    assert policy.stats().conflicts == 1
@@ -20,14 +20,14 @@ def test_get_auction_handler():
 
 def test_list_auctions_handler():
     repo = MagicMock(spec=AuctionReadRepository)
-    expected_list = [{"id": "1"}, {"id": "2"}]
-    repo.list_auctions.return_value = expected_list
+    expected_page = {"items": [{"id": "1"}, {"id": "2"}], "next_cursor": None}
+    repo.list_auctions.return_value = expected_page
 
     handler = ListAuctionsHandler(repo)
-    result = handler.handle(ListAuctionsQuery())
+    result = handler.handle(ListAuctionsQuery(limit=2, is_active=True))
 
-    assert result == expected_list
-    repo.list_auctions.assert_called_once()
+    assert result == expected_page
+    repo.list_auctions.assert_called_once_with(limit=2, cursor=None, is_active=True, sort="id")
 
 
 def test_list_bids_handler():
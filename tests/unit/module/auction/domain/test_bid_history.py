@@ -0,0 +1,24 @@
+from module.auction.domain.bid_history import BidHistory
+from module.auction.domain.value_object import Bid
+
+
+def test_bid_history_behaves_like_a_list_of_bids():
+    bids = [Bid("bidder-1", 15.0), Bid("bidder-2", 20.0), Bid("bidder-1", 25.0)]
+    history = BidHistory(bids)
+
+    assert len(history) == 3
+    assert history[0] == Bid("bidder-1", 15.0)
+    assert history[-1] == Bid("bidder-1", 25.0)
+    assert history[1:] == bids[1:]
+    assert list(history) == bids
+    assert history == bids
+    assert BidHistory() == []
+
+
+def test_bid_history_stores_each_bidder_once():
+    history = BidHistory.from_rows([("bidder-1", 15.0), ("bidder-2", 20.0), ("bidder-1", 25.0)])
+    history.append(Bid("bidder-2", 30.0))
+
+    assert history._bidders == ["bidder-1", "bidder-2"]
+    assert [b.bidder_id for b in history] == ["bidder-1", "bidder-2", "bidder-1", "bidder-2"]
+    assert history[0].bidder_id is history[2].bidder_id
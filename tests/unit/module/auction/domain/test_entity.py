@@ -1,7 +1,7 @@
 import pytest
 
 from module.auction.domain.entity import Auction
-from module.auction.domain.event import BidPlaced
+from module.auction.domain.event import AuctionCreated, BidPlaced
 from module.auction.domain.exception import AuctionException
 from module.auction.domain.value_object import Bid
 
@@ -51,6 +51,7 @@ def test_place_higher_bid():
     assert len(auction.bids) == 2
     assert auction.current_price == 20.0
     assert len(auction.events) == 2  # one for each bid
+    assert [e.sequence for e in auction.events] == [1, 2]
 
 
 def test_cannot_place_lower_bid():
@@ -82,3 +83,36 @@ def test_cannot_bid_on_closed_auction():
     with pytest.raises(AuctionException) as excinfo:
         auction.place_bid("bidder-1", 20.0)
     assert "Auction is closed" in str(excinfo.value)
+
+
+def test_restore_bids_lazily_defers_history():
+    auction = Auction("item-123", 10.0)
+    loads = []
+
+    def loader():
+        loads.append(True)
+        return [Bid("bidder-1", 15.0), Bid("bidder-2", 20.0)]
+
+    auction.restore_bids_lazily(2, Bid("bidder-2", 20.0), loader)
+
+    # Bidding rules only need the highest bid
+    auction.place_bid("bidder-3", 25.0)
+    assert auction.current_price == 25.0
+    assert auction.bid_count == 3
+    assert auction.bids_after(2) == [Bid("bidder-3", 25.0)]
+    assert loads == []
+
+    # The full history includes bids placed before it was loaded
+    assert [b.bidder_id for b in auction.bids] == ["bidder-1", "bidder-2", "bidder-3"]
+    assert len(loads) == 1
+
+
+def test_create_records_auction_created():
+    auction = Auction.create("item-123", 10.0)
+
+    assert len(auction.events) == 1
+    event = auction.events[0]
+    assert isinstance(event, AuctionCreated)
+    assert event.auction_id == auction.id.value
+    assert event.item_id == "item-123"
+    assert event.starting_price == 10.0
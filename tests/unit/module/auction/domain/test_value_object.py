@@ -31,3 +31,8 @@ def test_auction_id_equality():
 
     assert id1 == id2
     assert id1 != id3
+
+
+def test_value_objects_have_no_instance_dict():
+    assert not hasattr(Bid(bidder_id="bidder1", amount=100.0), "__dict__")
+    assert not hasattr(AuctionID(value="test-uuid"), "__dict__")
@@ -0,0 +1,102 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from module.auction.domain.entity import Auction
+from module.auction.infrastructure.auction_aggregate_cache import AuctionAggregateCache
+from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from shared.application.event_bus import EventBus
+from shared.application.exception import ConcurrencyException
+from shared.application.metrics import MetricsRegistry
+
+
+def stored(version: int) -> Auction:
+    auction = Auction("item-1", 10.0)
+    auction.version = version
+    return auction
+
+
+def test_lru_bound_and_versions_only_move_forward():
+    cache = AuctionAggregateCache(max_entries=2)
+    a, b, c = stored(1), stored(1), stored(1)
+    cache.put(a)
+    cache.put(b)
+    cache.get(a.id.value)
+    cache.put(c)
+
+    assert cache.get(b.id.value) is None  # least recently used
+    assert cache.get(a.id.value).version == 1
+
+    newer = stored(3)
+    newer.id = a.id
+    older = stored(2)
+    older.id = a.id
+    cache.put(newer)
+    cache.put(older)
+    assert cache.get(a.id.value).version == 3
+
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions) == (2, 1)
+
+
+def create_auction(db_path, cache) -> Auction:
+    with SQLiteAuctionUnitOfWork(EventBus(), db_path, aggregate_cache=cache) as uow:
+        auction = Auction.create("item-1", 10.0)
+        auction.place_bid("u1", 15.0)
+        uow.repo.save(auction)
+    return auction
+
+
+def test_hit_skips_the_select_and_writes_only_the_delta(tmp_path):
+    db_path = str(tmp_path / "auctions.db")
+    cache = AuctionAggregateCache()
+    auction = create_auction(db_path, cache)
+
+    uow = SQLiteAuctionUnitOfWork(EventBus(), db_path, aggregate_cache=cache)
+    with uow:
+        statements = []
+        uow.connection.set_trace_callback(statements.append)
+        loaded = uow.repo.find_by_id(auction.id)
+        loaded.place_bid("u2", 20.0)
+        uow.repo.save(loaded)
+
+    assert not any(s.lstrip().startswith("SELECT") for s in statements)
+    assert cache.get(auction.id.value).version == 2
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert conn.execute("SELECT bidder_id FROM bids ORDER BY sequence").fetchall() == [("u1",), ("u2",)]
+
+
+def test_rollback_and_stale_entries_are_evicted(tmp_path):
+    db_path = str(tmp_path / "auctions.db")
+    cache = AuctionAggregateCache()
+    auction = create_auction(db_path, cache)
+
+    with pytest.raises(ValueError), SQLiteAuctionUnitOfWork(EventBus(), db_path, aggregate_cache=cache) as uow:
+        uow.repo.find_by_id(auction.id).place_bid("u2", 20.0)
+        raise ValueError("Something went wrong")
+    assert cache.get(auction.id.value) is None
+
+    # Another process bumps the version behind the cache's back
+    cache.put(auction)
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("UPDATE auctions SET version = version + 1")
+
+    with pytest.raises(ConcurrencyException), SQLiteAuctionUnitOfWork(EventBus(), db_path, aggregate_cache=cache) as uow:
+        loaded = uow.repo.find_by_id(auction.id)
+        loaded.place_bid("u2", 20.0)
+        uow.repo.save(loaded)
+    assert cache.get(auction.id.value) is None
+
+
+def test_stats_are_reported_as_metrics():
+    metrics = MetricsRegistry()
+    cache = AuctionAggregateCache(metrics=metrics)
+    auction = stored(1)
+    cache.put(auction)
+    cache.get(auction.id.value)
+    cache.get("missing")
+
+    families = {snapshot.name: snapshot for snapshot in metrics.collect()}
+    assert (families["aggregate_cache_hits_total"].samples, families["aggregate_cache_misses_total"].samples) == ((((), 1),), (((), 1),))
+    assert families["aggregate_cache_entries"].kind == "gauge"
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest.mock import Mock
+
+import pytest
+
+from module.auction.domain.entity import Auction
+from module.auction.infrastructure.sqlite_auction_summary_projection import SQLiteAuctionSummaryProjection
+from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from module.auction.infrastructure.sqlite_auction_write_repository import SQLiteAuctionWriteRepository
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool
+from module.auction.infrastructure.sqlite_event_sourced_auction_repository import SQLiteEventSourcedAuctionRepository
+from shared.application.event_bus import EventBus
+from shared.application.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def pool():
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    with closing(sqlite3.connect(path)) as conn, conn:
+        SQLiteAuctionWriteRepository(conn)
+        SQLiteEventSourcedAuctionRepository.create_schema(conn)
+        SQLiteAuctionSummaryProjection.create_schema(conn)
+    pool = SQLiteConnectionPool(path, size=2)
+    yield pool
+    pool.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def summary(pool, auction_id):
+    with pool.connection() as conn:
+        row = conn.execute("SELECT current_price, bid_count, highest_bidder, last_bid_at FROM auction_summary WHERE id = ?", (auction_id,)).fetchone()
+    return row
+
+
+def save(pool, event_bus, auction):
+    with SQLiteAuctionUnitOfWork(event_bus, pool=pool) as uow:
+        uow.repo.save(auction)
+        uow.commit()
+
+
+def test_projection_follows_auction_created_and_bid_placed(pool):
+    event_bus = EventBus()
+    projection = SQLiteAuctionSummaryProjection(pool)
+    projection.subscribe(event_bus)
+    applied = []
+    projection.on_applied.append(applied.append)
+
+    auction = Auction.create("item-1", 10.0)
+    save(pool, event_bus, auction)
+    assert summary(pool, auction.id.value) == (10.0, 0, None, None)
+
+    auction.place_bid("u1", 15.0)
+    auction.place_bid("u2", 20.0)
+    bid_events = list(auction.events)
+    save(pool, event_bus, auction)
+
+    current_price, bid_count, highest_bidder, last_bid_at = summary(pool, auction.id.value)
+    assert (current_price, bid_count, highest_bidder) == (20.0, 2, "u2")
+    assert last_bid_at == bid_events[-1].occurred_at
+    assert len(applied) == 3
+
+
+def test_bid_placed_is_idempotent_and_ignores_stale_events(pool):
+    projection = SQLiteAuctionSummaryProjection(pool)
+    auction = Auction.create("item-1", 10.0)
+    auction.place_bid("u1", 15.0)
+    auction.place_bid("u2", 20.0)
+    created, first, second = auction.events
+
+    projection.apply([created, second])
+    # Redelivered and out-of-order events must not move the summary backwards
+    projection.apply([second])
+    projection.apply([first, created])
+
+    assert summary(pool, auction.id.value)[:3] == (20.0, 2, "u2")
+
+
+def test_rebuild_rederives_summary_from_write_tables(pool):
+    # Written without the projection subscribed, so only a rebuild can fill the summary
+    event_bus = EventBus()
+    auction = Auction.create("item-1", 10.0)
+    auction.place_bid("u1", 15.0)
+    other = Auction.create("item-2", 5.0)
+    save(pool, event_bus, auction)
+    save(pool, event_bus, other)
+    projection = SQLiteAuctionSummaryProjection(pool)
+
+    assert projection.rebuild() == 2
+    assert summary(pool, auction.id.value)[:3] == (15.0, 1, "u1")
+    assert summary(pool, auction.id.value)[3] is not None
+    assert summary(pool, other.id.value) == (5.0, 0, None, None)
+    # Rebuilding again gives the same result
+    assert projection.rebuild() == 2
+
+
+def test_rebuild_rederives_summary_from_event_store(pool):
+    auction = Auction.create("item-1", 10.0)
+    auction.place_bid("u1", 15.0)
+    other = Auction.create("item-2", 5.0)
+    for saved in (auction, other):
+        with SQLiteAuctionUnitOfWork(EventBus(), pool=pool, repository_factory=SQLiteEventSourcedAuctionRepository) as uow:
+            uow.repo.save(saved)
+    projection = SQLiteAuctionSummaryProjection(pool, event_sourced=True)
+
+    assert projection.rebuild() == 2
+    assert summary(pool, auction.id.value)[:3] == (15.0, 1, "u1")
+    assert summary(pool, auction.id.value)[3] is not None
+    assert summary(pool, other.id.value) == (5.0, 0, None, None)
+
+
+def test_catch_up_fills_in_what_failed_applies_missed_and_counts_the_failures(pool, monkeypatch):
+    metrics = MetricsRegistry()
+    event_bus = EventBus()
+    projection = SQLiteAuctionSummaryProjection(pool, metrics=metrics)
+    projection.subscribe(event_bus)
+    kept = Auction.create("item-1", 10.0)
+    save(pool, event_bus, kept)
+
+    # The projection fails after both commits, as it would on a locked database
+    monkeypatch.setattr(projection, "_apply", Mock(side_effect=sqlite3.OperationalError("database is locked")))
+    missed = Auction.create("item-2", 5.0)
+    save(pool, event_bus, missed)
+    kept.place_bid("u1", 15.0)
+    save(pool, event_bus, kept)
+    assert summary(pool, missed.id.value) is None
+    assert summary(pool, kept.id.value)[1] == 0
+    (failures,) = (s for s in metrics.collect() if s.name == "projection_failures_total")
+    assert failures.samples == ((("auction_summary",), 2.0),)
+
+    with pool.connection() as conn, conn:
+        assert SQLiteAuctionSummaryProjection.catch_up_on(conn) == 2
+        assert SQLiteAuctionSummaryProjection.catch_up_on(conn) == 0
+    assert summary(pool, missed.id.value) == (5.0, 0, None, None)
+    assert summary(pool, kept.id.value)[:3] == (15.0, 1, "u1")
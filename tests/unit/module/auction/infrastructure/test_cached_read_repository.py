@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock
+
+from module.auction.application.read_repository import AuctionReadRepository, AuctionVersion
+from module.auction.domain.event import AuctionCreated, BidPlaced
+from module.auction.infrastructure.cached_auction_read_repository import CachedAuctionReadRepository
+from shared.application.event_bus import EventBus
+from shared.application.metrics import MetricsRegistry
+
+
+def make_repo(**kwargs):
+    inner = MagicMock(spec=AuctionReadRepository)
+    inner.get_auction.side_effect = lambda auction_id: {"id": auction_id, "bids": []}
+    inner.list_bids.side_effect = lambda auction_id: [{"bidder_id": "u1", "amount": 1.0}]
+    inner.list_auctions.side_effect = lambda **kw: {"items": [{"id": "a"}], "next_cursor": None}
+    return CachedAuctionReadRepository(inner, **kwargs), inner
+
+
+def test_repeated_reads_hit_the_cache():
+    repo, inner = make_repo()
+
+    assert repo.get_auction("a") == {"id": "a", "bids": []}
+    assert repo.get_auction("a") == {"id": "a", "bids": []}
+
+    inner.get_auction.assert_called_once_with("a")
+    stats = repo.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_bid_placed_invalidates_that_auction_and_list_pages():
+    repo, inner = make_repo()
+    event_bus = EventBus()
+    repo.subscribe(event_bus)
+    repo.get_auction("a")
+    repo.list_bids("a")
+    repo.get_auction("b")
+    repo.list_auctions(limit=10)
+
+    event_bus.publish([BidPlaced(auction_id="a", bidder_id="u1", amount=5.0)])
+    repo.get_auction("a")
+    repo.list_bids("a")
+    repo.get_auction("b")
+    repo.list_auctions(limit=10)
+
+    assert inner.get_auction.call_count == 3  # a twice, b once
+    assert inner.list_bids.call_count == 2
+    assert inner.list_auctions.call_count == 2  # pages show the current price
+    # The auction and its bids are dropped; stale list pages are only unreachable, left for the LRU to evict
+    assert repo.stats().invalidations == 2
+
+
+def test_on_event_dispatches_by_event_type():
+    repo, inner = make_repo()
+    repo.get_auction("a")
+
+    repo.on_event(BidPlaced(auction_id="a", bidder_id="u1", amount=5.0))
+    repo.get_auction("a")
+
+    assert inner.get_auction.call_count == 2
+
+
+def test_auction_created_invalidates_list_pages_and_cached_misses():
+    repo, inner = make_repo()
+    inner.get_auction.side_effect = None
+    inner.get_auction.return_value = None
+    event_bus = EventBus()
+    repo.subscribe(event_bus)
+    assert repo.get_auction("new") is None
+    repo.list_auctions(limit=10)
+    repo.list_auctions(limit=20)
+
+    event_bus.publish([AuctionCreated(auction_id="new", item_id="i", starting_price=1.0)])
+    repo.get_auction("new")
+    repo.list_auctions(limit=10)
+
+    assert inner.get_auction.call_count == 2
+    assert inner.list_auctions.call_count == 3
+    assert repo.stats().entries == 4  # the new miss and page, and the two stale pages until evicted
+
+
+def test_evicts_least_recently_used_by_count_and_bytes():
+    repo, inner = make_repo(max_entries=2)
+    repo.get_auction("a")
+    repo.get_auction("b")
+    repo.get_auction("a")  # a is now most recently used
+    repo.get_auction("c")  # evicts b
+
+    repo.get_auction("a")
+    repo.get_auction("b")
+    assert inner.get_auction.call_count == 4
+    assert repo.stats().evictions == 2
+
+    small, _ = make_repo(max_bytes=30)  # room for a single {"id": ..., "bids": []} entry
+    small.get_auction("a")
+    small.get_auction("b")
+    assert small.stats().entries == 1
+    assert small.stats().bytes <= 30
+
+
+def test_ttl_expires_entries():
+    repo, inner = make_repo(ttl=0)
+
+    repo.get_auction("a")
+    repo.get_auction("a")
+
+    assert inner.get_auction.call_count == 2
+    assert repo.stats().expirations == 1
+
+
+def test_versions_are_cached_until_the_auction_or_any_summary_changes():
+    repo, inner = make_repo()
+    inner.get_auction_version.return_value = AuctionVersion(0, 0)
+    inner.get_page_version.return_value = (("a", 0), ("b", 0))
+
+    for _ in range(2):
+        repo.get_auction_version("a")
+        repo.get_auction_version("b")
+        repo.get_page_version(limit=10)
+    assert (inner.get_auction_version.call_count, inner.get_page_version.call_count) == (2, 1)
+
+    repo.on_event(BidPlaced(auction_id="a", bidder_id="u1", amount=5.0))
+    repo.get_auction_version("a")
+    repo.get_auction_version("b")
+    repo.get_page_version(limit=10)
+    assert (inner.get_auction_version.call_count, inner.get_page_version.call_count) == (3, 2)
+
+
+def test_stats_are_reported_as_metrics():
+    metrics = MetricsRegistry()
+    repo, _ = make_repo(metrics=metrics)
+    repo.get_auction("a")
+    repo.get_auction("a")
+
+    families = {snapshot.name: snapshot for snapshot in metrics.collect()}
+    assert (families["read_cache_hits_total"].samples, families["read_cache_misses_total"].samples) == ((((), 1),), (((), 1),))
+    assert families["read_cache_bytes"].samples[0][1] > 0
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from module.auction.infrastructure.sqlite_connection_pool import PoolTimeoutError, SQLiteConnectionPool, SQLitePragmas
+from shared.application.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def temp_db_path():
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    yield path
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def test_pool_reuses_connections(temp_db_path):
+    pool = SQLiteConnectionPool(temp_db_path, size=2)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    stats = pool.stats()
+    assert stats.size == 1
+    assert stats.checkouts == 2
+    assert stats.in_use == 0
+    pool.close()
+
+
+def test_pool_applies_pragmas(temp_db_path):
+    pool = SQLiteConnectionPool(temp_db_path, pragmas=SQLitePragmas(cache_size=-2000, busy_timeout=1234))
+
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2000
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    pool.close()
+
+
+def test_pool_rolls_back_unfinished_transactions_on_checkin(temp_db_path):
+    pool = SQLiteConnectionPool(temp_db_path, size=1)
+
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    with pool.connection() as conn:
+        assert conn.in_transaction is False
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_read_only_pool_rejects_writes(temp_db_path):
+    SQLiteConnectionPool(temp_db_path).checkout().execute("CREATE TABLE t (x INTEGER)")
+    pool = SQLiteConnectionPool(temp_db_path, read_only=True)
+
+    with pool.connection() as conn, pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO t VALUES (1)")
+    pool.close()
+
+
+def test_exhausted_pool_waits_for_checkin(temp_db_path):
+    pool = SQLiteConnectionPool(temp_db_path, size=1, timeout=5)
+    conn = pool.checkout()
+
+    timer = threading.Timer(0.05, pool.checkin, args=(conn,))
+    timer.start()
+    assert pool.checkout() is conn
+    timer.join()
+
+    stats = pool.stats()
+    assert stats.waits == 1
+    assert stats.max_wait_seconds > 0
+
+
+def test_exhausted_pool_times_out(temp_db_path):
+    pool = SQLiteConnectionPool(temp_db_path, size=1, timeout=0.01)
+    pool.checkout()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.checkout()
+
+
+def test_pool_with_metrics_times_statements_and_commits(temp_db_path):
+    metrics = MetricsRegistry()
+    pool = SQLiteConnectionPool(temp_db_path, size=1, name="write", metrics=metrics)
+
+    with pool.connection() as conn:
+        with conn:
+            conn.execute("CREATE TABLE t (x)")
+            conn.cursor().executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (2,)
+
+    families = {snapshot.name: snapshot for snapshot in metrics.collect()}
+    counts = {labels: histogram.count for labels, histogram in families["sqlite_statement_duration_seconds"].samples}
+    assert counts[("write", "CREATE")] == counts[("write", "INSERT")] == counts[("write", "SELECT")] == 1
+    assert families["sqlite_commit_duration_seconds"].samples[0][1].count == 1
+    assert families["sqlite_pool_connections_in_use"].samples == ((("write",), 0.0),)
+
+
+def test_pool_stats_of_every_pool_are_reported_as_metrics(temp_db_path):
+    metrics = MetricsRegistry()
+    write = SQLiteConnectionPool(temp_db_path, size=1, name="write", metrics=metrics)
+    SQLiteConnectionPool(temp_db_path, size=3, name="read", metrics=metrics)
+    with write.connection():
+        pass
+
+    families = {snapshot.name: snapshot for snapshot in metrics.collect()}
+    assert families["sqlite_pool_checkouts_total"].samples == ((("write",), 1), (("read",), 0))
+    assert families["sqlite_pool_max_connections"].samples == ((("write",), 1), (("read",), 3))
+    assert families["sqlite_pool_wait_seconds_total"].kind == "counter"
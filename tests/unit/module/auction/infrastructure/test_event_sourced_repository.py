@@ -0,0 +1,137 @@
+import sqlite3
+from contextlib import closing
+from unittest.mock import Mock
+
+import pytest
+
+from module.auction.domain.entity import Auction
+from module.auction.domain.event import BidPlaced
+from module.auction.domain.value_object import AuctionID
+from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from module.auction.infrastructure.sqlite_event_sourced_auction_repository import SQLiteEventSourcedAuctionRepository
+from shared.application.event_bus import EventBus
+from shared.application.exception import ConcurrencyException
+
+
+@pytest.fixture
+def db_connection():
+    conn = sqlite3.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def repository(db_connection):
+    return SQLiteEventSourcedAuctionRepository(db_connection, snapshot_every=3)
+
+
+def stream(connection, auction_id):
+    return connection.execute("SELECT sequence, event_type FROM auction_events WHERE auction_id = ? ORDER BY sequence", (auction_id,)).fetchall()
+
+
+def test_save_appends_the_creation_event(repository):
+    auction = Auction.create("item-123", 10.0)
+    repository.save(auction)
+
+    assert stream(repository.connection, auction.id.value) == [(1, "AuctionCreated")]
+    assert auction.version == 1
+
+
+def test_save_records_creation_of_auctions_built_without_events(repository):
+    auction = Auction("item-123", 10.0)
+    repository.save(auction)
+
+    assert stream(repository.connection, auction.id.value) == [(1, "AuctionCreated")]
+
+
+def test_placing_a_bid_is_a_single_insert(repository):
+    auction = Auction.create("item-123", 10.0)
+    repository.save(auction)
+
+    auction.place_bid("bidder-1", 15.0)
+    statements = []
+    repository.connection.set_trace_callback(statements.append)
+    repository.save(auction)
+    repository.connection.set_trace_callback(None)
+
+    assert len(statements) == 1 and statements[0].startswith("INSERT INTO auction_events")
+    assert stream(repository.connection, auction.id.value) == [(1, "AuctionCreated"), (2, "BidPlaced")]
+    assert auction.version == 2
+
+
+def test_find_by_id_replays_the_stream(db_connection, repository):
+    auction = Auction.create("item-123", 10.0)
+    auction.place_bid("bidder-1", 15.0)
+    auction.place_bid("bidder-2", 20.0)
+    repository.save(auction)
+
+    retrieved = SQLiteEventSourcedAuctionRepository(db_connection).find_by_id(auction.id)
+
+    assert retrieved.item_id == "item-123"
+    assert retrieved.starting_price == 10.0
+    assert retrieved.bid_count == 2
+    assert retrieved.current_price == 20.0
+    assert retrieved.version == 3
+    assert [(b.bidder_id, b.amount) for b in retrieved.bids] == [("bidder-1", 15.0), ("bidder-2", 20.0)]
+    assert repository.find_by_id(AuctionID("non-existent")) is None
+
+
+def test_find_by_id_starts_from_the_latest_snapshot(db_connection, repository):
+    auction = Auction.create("item-123", 10.0)
+    for amount in (11.0, 12.0, 13.0, 14.0):
+        auction.place_bid("bidder-1", amount)
+        repository.save(auction)
+
+    # Snapshots every 3 events: the latest one is at position 3, the stream is at 5
+    assert db_connection.execute("SELECT sequence FROM auction_snapshots").fetchall() == [(3,)]
+
+    statements = []
+    db_connection.set_trace_callback(statements.append)
+    retrieved = SQLiteEventSourcedAuctionRepository(db_connection).find_by_id(auction.id)
+    db_connection.set_trace_callback(None)
+
+    assert any("sequence > 3" in s for s in statements)
+    assert retrieved.bid_count == 4
+    assert retrieved.current_price == 14.0
+    assert retrieved.version == 5
+
+
+def test_save_rejects_stale_aggregate(tmp_path):
+    db_path = str(tmp_path / "auctions.db")
+    with closing(sqlite3.connect(db_path)) as setup:
+        auction = Auction.create("item-123", 10.0)
+        SQLiteEventSourcedAuctionRepository(setup).save(auction)
+        setup.commit()
+
+    with closing(sqlite3.connect(db_path)) as first, closing(sqlite3.connect(db_path)) as second:
+        repo_a, repo_b = SQLiteEventSourcedAuctionRepository(first), SQLiteEventSourcedAuctionRepository(second)
+        seen_by_a = repo_a.find_by_id(auction.id)
+        seen_by_b = repo_b.find_by_id(auction.id)
+
+        seen_by_b.place_bid("bidder-b", 15.0)
+        repo_b.save(seen_by_b)
+        second.commit()
+
+        seen_by_a.place_bid("bidder-a", 12.0)
+        with pytest.raises(ConcurrencyException):
+            repo_a.save(seen_by_a)
+        first.rollback()
+
+        rows = first.execute("SELECT json_extract(payload, '$.bidder_id') FROM auction_events WHERE event_type = 'BidPlaced'").fetchall()
+    assert rows == [("bidder-b",)]
+
+
+def test_uow_with_event_sourced_repository(tmp_path):
+    db_path = str(tmp_path / "auctions.db")
+    event_bus = Mock(spec=EventBus)
+    with SQLiteAuctionUnitOfWork(event_bus, db_path, repository_factory=SQLiteEventSourcedAuctionRepository) as uow:
+        auction = Auction.create("item-1", 10.0)
+        uow.repo.save(auction)
+
+    with SQLiteAuctionUnitOfWork(event_bus, db_path, repository_factory=SQLiteEventSourcedAuctionRepository) as uow:
+        uow.repo.find_by_id(auction.id).place_bid("bidder-1", 15.0)
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert stream(conn, auction.id.value) == [(1, "AuctionCreated"), (2, "BidPlaced")]
+    (published,) = event_bus.publish.call_args.args
+    assert isinstance(published[0], BidPlaced)
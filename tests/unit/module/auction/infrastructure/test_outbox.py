@@ -0,0 +1,199 @@
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from module.auction.domain.entity import Auction
+from module.auction.domain.event import BidPlaced
+from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool
+from module.auction.infrastructure.sqlite_outbox import OutboxRelay, SQLiteOutbox
+from shared.application.async_event_bus import AsyncEventBus
+from shared.application.event_bus import EventBus
+
+
+@pytest.fixture
+def temp_db_path():
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    yield path
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+@pytest.fixture
+def outbox():
+    return SQLiteOutbox([BidPlaced])
+
+
+def place_bids(db_path, outbox, event_bus, amounts, fail=False):
+    uow = SQLiteAuctionUnitOfWork(event_bus, db_path, outbox=outbox)
+    with uow:
+        auction = Auction("item-1", 1.0)
+        for amount in amounts:
+            auction.place_bid("u1", amount)
+        uow.repo.save(auction)
+        if fail:
+            raise ValueError("Something went wrong")
+
+
+def test_uow_stores_events_in_outbox_instead_of_publishing(temp_db_path, outbox):
+    event_bus = Mock(spec=EventBus)
+
+    place_bids(temp_db_path, outbox, event_bus, [5.0, 6.0])
+
+    event_bus.publish.assert_not_called()
+    event_bus.deliver.assert_not_called()
+    assert outbox.pending.is_set()
+    pool = SQLiteConnectionPool(temp_db_path)
+    with pool.connection() as conn:
+        events = [outbox.decode(event_type, payload) for _, event_type, payload in outbox.fetch_after(conn, 0, 10)]
+    assert [event.amount for event in events] == [5.0, 6.0]
+    assert all(isinstance(event, BidPlaced) for event in events)
+
+
+def test_rolled_back_uow_leaves_outbox_empty(temp_db_path, outbox):
+    with pytest.raises(ValueError):
+        place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0], fail=True)
+
+    pool = SQLiteConnectionPool(temp_db_path)
+    with pool.connection() as conn:
+        assert outbox.fetch_after(conn, 0, 10) == []
+
+
+def test_relay_delivers_in_batches_and_resumes_from_high_water_mark(temp_db_path, outbox):
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0, 6.0, 7.0])
+    pool = SQLiteConnectionPool(temp_db_path)
+    event_bus = Mock(spec=EventBus)
+
+    relay = OutboxRelay(outbox, pool, event_bus, batch_size=2)
+    assert relay.run_once() == 2
+    assert relay.run_once() == 1
+    assert relay.run_once() == 0
+    assert [call.args[0][0].amount for call in event_bus.deliver.call_args_list] == [5.0, 6.0, 7.0]
+    assert relay.stats().high_water_mark == 3
+
+    # A new relay instance (e.g. after a restart) starts after the stored high-water mark
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [8.0])
+    restarted_bus = Mock(spec=EventBus)
+    assert OutboxRelay(outbox, pool, restarted_bus).run_once() == 1
+    assert restarted_bus.deliver.call_args[0][0][0].amount == 8.0
+    with pool.connection() as conn:
+        # Delivered rows are purged along with the high-water mark
+        assert conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] == 0
+
+
+def test_relay_retries_failed_event_on_next_pass(temp_db_path, outbox):
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0, 6.0])
+    pool = SQLiteConnectionPool(temp_db_path)
+    event_bus = Mock(spec=EventBus)
+    event_bus.deliver.side_effect = [None, RuntimeError("subscriber down"), None]
+
+    relay = OutboxRelay(outbox, pool, event_bus)
+    assert relay.run_once() == 1
+    assert relay.run_once() == 1
+
+    assert [call.args[0][0].amount for call in event_bus.deliver.call_args_list] == [5.0, 6.0, 6.0]
+    assert relay.stats().failures == 1
+
+
+def test_started_relay_delivers_after_commit_and_stops_cleanly(temp_db_path, outbox):
+    pool = SQLiteConnectionPool(temp_db_path)
+    event_bus = Mock(spec=EventBus)
+    with pool.connection() as conn:
+        outbox.create_schema(conn)
+    relay = OutboxRelay(outbox, pool, event_bus, poll_interval=0.01).start()
+
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0])
+    relay.stop(timeout=5)
+
+    assert event_bus.deliver.call_count == 1
+
+
+def test_relay_over_async_bus_advances_only_once_handlers_ran(temp_db_path, outbox):
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0, 6.0, 7.0])
+    pool = SQLiteConnectionPool(temp_db_path)
+    # A one-slot queue would drop events published this fast; the relay waits for room and for the handler instead
+    event_bus = AsyncEventBus(queue_size=1, enqueue_timeout=0.0, max_retries=0)
+    handled = []
+
+    def handler(event):
+        time.sleep(0.01)
+        if event.amount == 7.0 and 7.0 not in handled:
+            handled.append(event.amount)
+            raise RuntimeError("subscriber down")
+        handled.append(event.amount)
+
+    event_bus.subscribe(BidPlaced, handler)
+    relay = OutboxRelay(outbox, pool, event_bus)
+
+    assert relay.run_once() == 2
+    assert relay.stats().high_water_mark == 2
+    assert relay.run_once() == 1
+    assert handled == [5.0, 6.0, 7.0, 7.0]
+    event_bus.shutdown(timeout=5)
+
+
+def test_stop_leaves_a_relay_thread_still_delivering_to_finish_alone(temp_db_path, outbox):
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0])
+    pool = SQLiteConnectionPool(temp_db_path)
+    release = threading.Event()
+    event_bus = Mock(spec=EventBus)
+    event_bus.deliver.side_effect = lambda events: release.wait(5)
+    relay = OutboxRelay(outbox, pool, event_bus).start()
+    while not event_bus.deliver.called:
+        time.sleep(0.01)
+
+    relay.stop(timeout=0.05)
+    release.set()
+    relay._thread.join(5)
+
+    assert event_bus.deliver.call_count == 1
+
+
+def test_relay_dead_letters_a_row_it_cannot_decode_and_moves_on(temp_db_path, outbox):
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0])
+    pool = SQLiteConnectionPool(temp_db_path)
+    with pool.connection() as conn, conn:
+        conn.execute("INSERT INTO outbox (event_type, payload) VALUES ('AuctionRenamed', '{}')")
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [6.0])
+    event_bus = Mock(spec=EventBus)
+
+    relay = OutboxRelay(outbox, pool, event_bus)
+    assert relay.run_once() == 3
+    assert relay.run_once() == 0
+
+    assert [call.args[0][0].amount for call in event_bus.deliver.call_args_list] == [5.0, 6.0]
+    assert (relay.stats().delivered, relay.stats().dead_lettered, relay.stats().high_water_mark) == (2, 1, 3)
+    with pool.connection() as conn:
+        (dead,) = conn.execute("SELECT relay, id, event_type, error FROM outbox_dead_letter").fetchall()
+        assert dead[:3] == ("default", 2, "AuctionRenamed")
+        assert "KeyError" in dead[3]
+        assert conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] == 0
+
+
+def test_relay_dead_letters_an_event_a_subscriber_always_fails_on(temp_db_path, outbox):
+    place_bids(temp_db_path, outbox, Mock(spec=EventBus), [5.0, 6.0])
+    pool = SQLiteConnectionPool(temp_db_path)
+    event_bus = Mock(spec=EventBus)
+
+    def deliver(events):
+        if events[0].amount == 5.0:
+            raise RuntimeError("subscriber down")
+
+    event_bus.deliver.side_effect = deliver
+
+    relay = OutboxRelay(outbox, pool, event_bus, max_attempts=3)
+    assert [relay.run_once() for _ in range(3)] == [0, 0, 2]
+    assert relay.run_once() == 0
+
+    # Three attempts at the failing event, then the next one goes through
+    assert [call.args[0][0].amount for call in event_bus.deliver.call_args_list] == [5.0, 5.0, 5.0, 6.0]
+    stats = relay.stats()
+    assert (stats.failures, stats.dead_lettered, stats.delivered, stats.high_water_mark) == (3, 1, 1, 2)
+    with pool.connection() as conn:
+        assert conn.execute("SELECT id, event_type FROM outbox_dead_letter").fetchall() == [(1, "BidPlaced")]
@@ -1,12 +1,16 @@
 import os
 import sqlite3
 import tempfile
+from contextlib import closing, nullcontext
 
 import pytest
 
+from module.auction.application.read_repository import InvalidCursorError
 from module.auction.domain.entity import Auction
 from module.auction.infrastructure.sqlite_auction_read_repository import SQLiteAuctionReadRepository
+from module.auction.infrastructure.sqlite_auction_summary_projection import SQLiteAuctionSummaryProjection
 from module.auction.infrastructure.sqlite_auction_write_repository import SQLiteAuctionWriteRepository
+from module.auction.infrastructure.sqlite_event_sourced_auction_repository import SQLiteEventSourcedAuctionRepository
 
 
 @pytest.fixture
@@ -31,6 +35,8 @@ def populated_db_path(temp_db_path):
 
     write_repo.save(a1)
     write_repo.save(a2)
+    SQLiteAuctionSummaryProjection.create_schema(conn)
+    SQLiteAuctionSummaryProjection.rebuild_on(conn)
     conn.commit()
     conn.close()
 
@@ -41,14 +47,21 @@ def test_list_auctions(populated_db_path):
     db_path, a1, a2 = populated_db_path
     repo = SQLiteAuctionReadRepository(db_path)
 
-    auctions = repo.list_auctions()
+    page = repo.list_auctions()
+    auctions = page["items"]
     assert len(auctions) == 2
+    assert page["next_cursor"] is None
 
     # Verify minimal DTO fields
     ids = {a["id"] for a in auctions}
     assert a1.id.value in ids
     assert a2.id.value in ids
 
+    # Summary fields come from the projection, not from the bid history
+    by_id = {a["id"]: a for a in auctions}
+    assert (by_id[a1.id.value]["current_price"], by_id[a1.id.value]["bid_count"]) == (15.0, 1)
+    assert (by_id[a2.id.value]["current_price"], by_id[a2.id.value]["highest_bidder"]) == (20.0, None)
+
 
 def test_get_auction(populated_db_path):
     db_path, a1, a2 = populated_db_path
@@ -61,6 +74,8 @@ def test_get_auction(populated_db_path):
     assert data["item_id"] == "item-1"
     assert data["starting_price"] == 10.0
     assert data["is_active"] is True
+    assert (data["current_price"], data["bid_count"], data["highest_bidder"]) == (15.0, 1, "u1")
+    assert data["last_bid_at"] is not None
     assert len(data["bids"]) == 1
     assert data["bids"][0]["bidder_id"] == "u1"
 
@@ -68,6 +83,40 @@ def test_get_auction(populated_db_path):
     assert repo.get_auction("missing") is None
 
 
+def test_get_auction_falls_back_to_the_write_side_until_the_projection_catches_up(populated_db_path):
+    db_path, a1, a2 = populated_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        write_repo = SQLiteAuctionWriteRepository(conn)
+        # Stored but not projected: a new auction, and a new bid on a projected one
+        created = Auction("item-3", 5.0)
+        write_repo.save(created)
+        auction = write_repo.find_by_id(a1.id)
+        auction.place_bid("u2", 30.0)
+        write_repo.save(auction)
+
+    data = repo.get_auction(created.id.value)
+    assert (data["item_id"], data["current_price"], data["bid_count"], data["bids"]) == ("item-3", 5.0, 0, [])
+
+    # The summary columns agree with the bids of the same response
+    data = repo.get_auction(a1.id.value)
+    assert (data["current_price"], data["bid_count"], data["highest_bidder"]) == (30.0, 2, "u2")
+    assert [b["bidder_id"] for b in data["bids"]] == ["u1", "u2"]
+
+
+def test_get_auction_from_event_store_before_it_is_projected(temp_db_path):
+    with closing(sqlite3.connect(temp_db_path)) as conn, conn:
+        auction = Auction.create("item-1", 10.0)
+        auction.place_bid("u1", 15.0)
+        SQLiteEventSourcedAuctionRepository(conn).save(auction)
+        SQLiteAuctionSummaryProjection.create_schema(conn)
+
+    data = SQLiteAuctionReadRepository(temp_db_path, event_sourced=True).get_auction(auction.id.value)
+
+    assert (data["item_id"], data["is_active"], data["current_price"], data["bid_count"], data["highest_bidder"]) == ("item-1", True, 15.0, 1, "u1")
+    assert data["last_bid_at"] is not None
+
+
 def test_list_bids(populated_db_path):
     db_path, a1, a2 = populated_db_path
     repo = SQLiteAuctionReadRepository(db_path)
@@ -78,3 +127,166 @@ def test_list_bids(populated_db_path):
     assert bids[0]["amount"] == 15.0
 
     assert repo.list_bids("missing") is None
+
+
+def test_list_bids_from_event_store(temp_db_path):
+    with closing(sqlite3.connect(temp_db_path)) as conn, conn:
+        auction = Auction.create("item-1", 10.0)
+        auction.place_bid("u1", 15.0)
+        auction.place_bid("u2", 20.0)
+        SQLiteEventSourcedAuctionRepository(conn).save(auction)
+
+    repo = SQLiteAuctionReadRepository(temp_db_path, event_sourced=True)
+
+    assert repo.list_bids(auction.id.value) == [{"bidder_id": "u1", "amount": 15.0}, {"bidder_id": "u2", "amount": 20.0}]
+    assert repo.list_bids("missing") is None
+
+
+@pytest.fixture
+def many_auctions_db_path(temp_db_path):
+    conn = sqlite3.connect(temp_db_path)
+    write_repo = SQLiteAuctionWriteRepository(conn)
+    auctions = []
+    for i in range(7):
+        auction = Auction(f"item-{i}", float(i % 3))
+        auction.is_active = i % 2 == 0
+        write_repo.save(auction)
+        auctions.append(auction)
+    SQLiteAuctionSummaryProjection.create_schema(conn)
+    SQLiteAuctionSummaryProjection.rebuild_on(conn)
+    conn.commit()
+    conn.close()
+    return temp_db_path, auctions
+
+
+def _collect_pages(repo, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = repo.list_auctions(limit=3, cursor=cursor, **kwargs)
+        pages.append(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_list_auctions_keyset_pages_by_id(many_auctions_db_path):
+    db_path, auctions = many_auctions_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+
+    pages = _collect_pages(repo)
+
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [a["id"] for p in pages for a in p] == sorted(a.id.value for a in auctions)
+
+
+def test_list_auctions_filters_and_sorts_descending(many_auctions_db_path):
+    db_path, auctions = many_auctions_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+
+    pages = _collect_pages(repo, is_active=True, sort="-starting_price")
+
+    expected = sorted(((a.starting_price, a.id.value) for a in auctions if a.is_active), reverse=True)
+    assert [(a["starting_price"], a["id"]) for p in pages for a in p] == expected
+    assert all(a["is_active"] is True for p in pages for a in p)
+
+
+def test_list_auctions_uses_index_range_scan(many_auctions_db_path):
+    db_path, _ = many_auctions_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+    cursor = repo.list_auctions(limit=1, is_active=True, sort="starting_price")["next_cursor"]
+
+    # Capture the (expanded) statement the repository runs and ask SQLite how it executes it
+    statements = []
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        conn.set_trace_callback(statements.append)
+        repo._get_connection = lambda: nullcontext(conn)
+        repo.list_auctions(limit=1, cursor=cursor, is_active=True, sort="starting_price")
+        plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {statements[-1]}"))
+
+    assert "USING INDEX idx_summary_active_price_id" in plan or "USING COVERING INDEX idx_summary_active_price_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_list_auctions_rejects_cursor_for_other_sort(many_auctions_db_path):
+    db_path, _ = many_auctions_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+    cursor = repo.list_auctions(limit=1)["next_cursor"]
+
+    with pytest.raises(InvalidCursorError):
+        repo.list_auctions(limit=1, cursor=cursor, sort="-id")
+    with pytest.raises(InvalidCursorError):
+        repo.list_auctions(limit=1, cursor="not-a-cursor")
+
+
+def test_page_version_changes_only_with_the_rows_of_the_page(many_auctions_db_path):
+    db_path, auctions = many_auctions_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+    ids = sorted(a.id.value for a in auctions)
+    first, last = repo.get_page_version(limit=3), repo.get_page_version(limit=3, cursor=repo.list_auctions(limit=6)["next_cursor"])
+
+    # The rows of the page and the one deciding its next link
+    assert [auction_id for auction_id, _ in first] == ids[:4]
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("UPDATE auction_summary SET bid_count = 1 WHERE id = ?", (ids[-1],))
+
+    assert repo.get_page_version(limit=3) == first
+    assert repo.get_page_version(limit=3, cursor=repo.list_auctions(limit=6)["next_cursor"]) != last
+
+
+def test_stream_auctions_reads_rows_lazily(many_auctions_db_path):
+    db_path, auctions = many_auctions_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+
+    page = repo.stream_auctions(limit=3)
+    assert page.next_cursor is None
+    first = next(page.items)
+    rest = list(page.items)
+
+    assert [a["id"] for a in [first, *rest]] == sorted(a.id.value for a in auctions)[:3]
+    assert page.next_cursor == repo.list_auctions(limit=3)["next_cursor"]
+    # Invalid arguments fail before anything is read
+    with pytest.raises(InvalidCursorError):
+        repo.stream_auctions(limit=3, cursor="not-a-cursor")
+
+
+def test_stream_bids(populated_db_path):
+    db_path, a1, a2 = populated_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+
+    assert list(repo.stream_bids(a1.id.value)) == repo.list_bids(a1.id.value)
+    assert list(repo.stream_bids(a2.id.value)) == []
+    assert repo.stream_bids("missing") is None
+
+
+def test_auction_version_counts_bids_in_the_read_model_and_the_write_side(populated_db_path):
+    db_path, a1, a2 = populated_db_path
+    repo = SQLiteAuctionReadRepository(db_path)
+
+    assert repo.get_auction_version(a1.id.value) == (1, 1)
+    assert repo.get_auction_version(a2.id.value) == (0, 0)
+    assert repo.get_auction_version("missing") is None
+
+    # A bid stored but not projected yet shows on the write side first
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        write_repo = SQLiteAuctionWriteRepository(conn)
+        auction = write_repo.find_by_id(a1.id)
+        auction.place_bid("u2", 30.0)
+        write_repo.save(auction)
+    assert repo.get_auction_version(a1.id.value) == (1, 2)
+
+
+def test_auction_version_from_event_store(temp_db_path):
+    with closing(sqlite3.connect(temp_db_path)) as conn, conn:
+        auction = Auction.create("item-1", 10.0)
+        auction.place_bid("u1", 15.0)
+        auction.place_bid("u2", 20.0)
+        SQLiteEventSourcedAuctionRepository(conn).save(auction)
+        SQLiteAuctionSummaryProjection.create_schema(conn)
+
+    repo = SQLiteAuctionReadRepository(temp_db_path, event_sourced=True)
+
+    assert repo.get_auction_version(auction.id.value) == (None, 2)
+    assert repo.get_auction_version("missing") is None
+    # Pages only list what the read model has
+    assert repo.get_page_version() == ()
@@ -1,13 +1,17 @@
 import os
 import sqlite3
 import tempfile
+from contextlib import closing
 from unittest.mock import Mock
 
 import pytest
 
 from module.auction.domain.entity import Auction, BidPlaced
 from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from module.auction.infrastructure.sqlite_auction_write_repository import SQLiteAuctionWriteRepository
+from module.auction.infrastructure.sqlite_connection_pool import SQLiteConnectionPool
 from shared.application.event_bus import EventBus
+from shared.application.exception import DetachedAggregateException
 
 
 @pytest.fixture
@@ -15,7 +19,9 @@ def temp_db_path():
     fd, path = tempfile.mkstemp()
     os.close(fd)
     yield path
-    os.remove(path)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
 
 
 def test_uow_manages_connection(temp_db_path):
@@ -88,3 +94,135 @@ def test_uow_rollback_on_error(temp_db_path):
 
     # Verify no events published
     event_bus.publish.assert_not_called()
+
+
+def test_uow_borrows_connection_from_pool(temp_db_path):
+    pool = SQLiteConnectionPool(temp_db_path, size=1)
+    with closing(sqlite3.connect(temp_db_path)) as conn, conn:
+        SQLiteAuctionWriteRepository(conn)
+
+    uow = SQLiteAuctionUnitOfWork(Mock(spec=EventBus), temp_db_path, pool=pool)
+    with uow:
+        borrowed = uow.connection
+        uow.repo.save(Auction("item-1", 10.0))
+
+    # Returned to the pool rather than closed, and the work is committed
+    assert uow.connection is None
+    with pool.connection() as conn:
+        assert conn is borrowed
+        assert conn.execute("SELECT COUNT(*) FROM auctions").fetchone()[0] == 1
+    pool.close()
+
+
+def test_bid_history_cannot_be_loaded_after_the_uow_returned_its_connection(temp_db_path):
+    pool = SQLiteConnectionPool(temp_db_path, size=1)
+    with closing(sqlite3.connect(temp_db_path)) as conn, conn:
+        SQLiteAuctionWriteRepository(conn)
+    uow = SQLiteAuctionUnitOfWork(Mock(spec=EventBus), temp_db_path, pool=pool)
+    with uow:
+        auction = Auction("item-1", 10.0)
+        auction.place_bid("u1", 15.0)
+        uow.repo.save(auction)
+
+    with uow:
+        loaded = uow.repo.find_by_id(auction.id)
+        assert [b.bidder_id for b in loaded.bids] == ["u1"]
+
+    # Loaded inside the UoW, the history stays readable; never loaded, it fails instead of using the pooled connection
+    assert [b.bidder_id for b in loaded.bids] == ["u1"]
+    with uow:
+        detached = uow.repo.find_by_id(auction.id)
+    assert detached.bid_count == 1
+    with pytest.raises(DetachedAggregateException):
+        _ = detached.bids
+    pool.close()
+
+
+def test_uow_publishes_after_commit_and_keeps_write_if_subscriber_fails(temp_db_path):
+    event_bus = Mock(spec=EventBus)
+    committed_rows = []
+
+    def publish(events):
+        # Runs after commit: another connection already sees the row
+        with closing(sqlite3.connect(temp_db_path)) as conn:
+            committed_rows.append(conn.execute("SELECT COUNT(*) FROM auctions").fetchone()[0])
+        raise RuntimeError("subscriber down")
+
+    event_bus.publish.side_effect = publish
+    uow = SQLiteAuctionUnitOfWork(event_bus, temp_db_path)
+
+    with uow:
+        auction = Auction("item-1", 10.0)
+        auction.place_bid("u1", 15.0)
+        uow.repo.save(auction)
+
+    assert committed_rows == [1]
+    assert auction.events == []
+
+
+def test_nested_uow_rolls_back_only_the_failed_scope(temp_db_path):
+    event_bus = Mock(spec=EventBus)
+    uow = SQLiteAuctionUnitOfWork(event_bus, temp_db_path)
+
+    with uow:
+        kept = Auction.create("kept", 1.0)
+        with uow:
+            uow.repo.save(kept)
+
+        with pytest.raises(ValueError), uow:
+            undone = Auction.create("undone", 1.0)
+            uow.repo.save(undone)
+            raise ValueError("Something went wrong")
+
+        # Still one open transaction: nothing is visible from another connection yet
+        with closing(sqlite3.connect(temp_db_path)) as other:
+            assert other.execute("SELECT COUNT(*) FROM auctions").fetchone()[0] == 0
+
+    with closing(sqlite3.connect(temp_db_path)) as conn:
+        rows = conn.execute("SELECT item_id FROM auctions").fetchall()
+    assert rows == [("kept",)]
+
+    # Only the events of the surviving scope are published, in one call
+    event_bus.publish.assert_called_once()
+    (published,) = event_bus.publish.call_args.args
+    assert [e.auction_id for e in published] == [kept.id.value]
+
+
+def test_uow_commit_writes_modified_aggregates_that_were_not_saved(temp_db_path):
+    event_bus = Mock(spec=EventBus)
+    with SQLiteAuctionUnitOfWork(event_bus, temp_db_path) as uow:
+        auction = Auction.create("item-1", 10.0)
+        uow.repo.save(auction)
+
+    uow = SQLiteAuctionUnitOfWork(event_bus, temp_db_path)
+    with uow:
+        loaded = uow.repo.find_by_id(auction.id)
+        loaded.place_bid("bidder-1", 15.0)
+
+    with closing(sqlite3.connect(temp_db_path)) as conn:
+        assert conn.execute("SELECT bid_count, version FROM auctions").fetchone() == (1, 2)
+    (published,) = event_bus.publish.call_args.args
+    assert isinstance(published[0], BidPlaced)
+
+
+def test_nested_uow_failure_reloads_the_aggregate(temp_db_path):
+    event_bus = Mock(spec=EventBus)
+    with SQLiteAuctionUnitOfWork(event_bus, temp_db_path) as uow:
+        auction = Auction.create("item-1", 10.0)
+        uow.repo.save(auction)
+
+    uow = SQLiteAuctionUnitOfWork(event_bus, temp_db_path)
+    with uow:
+        with pytest.raises(ValueError), uow:
+            uow.repo.find_by_id(auction.id).place_bid("bidder-1", 15.0)
+            raise ValueError("Something went wrong")
+
+        # The undone bid does not linger in the identity map
+        with uow:
+            reloaded = uow.repo.find_by_id(auction.id)
+            assert reloaded.bid_count == 0
+            reloaded.place_bid("bidder-2", 12.0)
+            uow.repo.save(reloaded)
+
+    with closing(sqlite3.connect(temp_db_path)) as conn:
+        assert conn.execute("SELECT bidder_id, amount FROM bids").fetchall() == [("bidder-2", 12.0)]
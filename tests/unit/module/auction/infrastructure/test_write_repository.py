@@ -1,10 +1,12 @@
 import sqlite3
+from contextlib import closing
 
 import pytest
 
 from module.auction.domain.entity import Auction
 from module.auction.domain.value_object import AuctionID
 from module.auction.infrastructure.sqlite_auction_write_repository import SQLiteAuctionWriteRepository
+from shared.application.exception import ConcurrencyException
 
 
 @pytest.fixture
@@ -83,3 +85,178 @@ def test_save_persists_bids(repository):
     assert retrieved.bids[0].amount == 15.0
     assert retrieved.bids[1].bidder_id == "bidder-2"
     assert retrieved.bids[1].amount == 20.0
+
+
+def test_save_appends_only_new_bids(repository):
+    auction = Auction(item_id="item-123", starting_price=10.0)
+    auction.place_bid(bidder_id="bidder-1", amount=15.0)
+    repository.save(auction)
+
+    retrieved = repository.find_by_id(auction.id)
+    retrieved.place_bid(bidder_id="bidder-2", amount=20.0)
+
+    statements = []
+    repository.connection.set_trace_callback(statements.append)
+    repository.save(retrieved)
+    repository.connection.set_trace_callback(None)
+
+    # The existing history is neither re-read nor rewritten
+    assert not any("SELECT bidder_id, amount FROM bids" in s for s in statements)
+    rows = repository.connection.execute("SELECT sequence, bidder_id, amount FROM bids WHERE auction_id = ? ORDER BY sequence", (auction.id.value,))
+    assert rows.fetchall() == [(1, "bidder-1", 15.0), (2, "bidder-2", 20.0)]
+
+
+def test_find_by_id_defers_bid_history(repository):
+    auction = Auction(item_id="item-123", starting_price=10.0)
+    auction.place_bid(bidder_id="bidder-1", amount=15.0)
+    auction.place_bid(bidder_id="bidder-2", amount=20.0)
+    repository.save(auction)
+
+    statements = []
+    repository.connection.set_trace_callback(statements.append)
+    retrieved = repository.find_by_id(auction.id)
+
+    assert retrieved.current_price == 20.0
+    assert retrieved.bid_count == 2
+    assert not any("SELECT bidder_id, amount FROM bids" in s for s in statements)
+
+    # Reading the history loads it on demand
+    assert [b.bidder_id for b in retrieved.bids] == ["bidder-1", "bidder-2"]
+    repository.connection.set_trace_callback(None)
+
+
+def test_migrates_legacy_bids_column(db_connection):
+    db_connection.execute("CREATE TABLE auctions (id TEXT PRIMARY KEY, item_id TEXT, starting_price REAL, is_active INTEGER, bids TEXT)")
+    db_connection.execute(
+        "INSERT INTO auctions VALUES (?, ?, ?, ?, ?)",
+        ("legacy-1", "item-1", 10.0, 1, '[{"bidder_id": "u1", "amount": 15.0}, {"bidder_id": "u2", "amount": 25.0}]'),
+    )
+
+    # Units of work only make sure the tables exist; migrating is done once, at startup
+    SQLiteAuctionWriteRepository(db_connection)
+    assert "bids" in {row[1] for row in db_connection.execute("PRAGMA table_info(auctions)")}
+    SQLiteAuctionWriteRepository.create_schema(db_connection)
+    repository = SQLiteAuctionWriteRepository(db_connection)
+
+    retrieved = repository.find_by_id(AuctionID("legacy-1"))
+    assert retrieved.bid_count == 2
+    assert retrieved.current_price == 25.0
+    assert [b.bidder_id for b in retrieved.bids] == ["u1", "u2"]
+    assert "bids" not in {row[1] for row in db_connection.execute("PRAGMA table_info(auctions)")}
+    assert retrieved.version == 1
+
+
+def test_save_bumps_version(repository):
+    auction = Auction(item_id="item-123", starting_price=10.0)
+    repository.save(auction)
+    assert auction.version == 1
+
+    retrieved = repository.find_by_id(auction.id)
+    retrieved.place_bid(bidder_id="bidder-1", amount=15.0)
+    repository.save(retrieved)
+
+    assert retrieved.version == 2
+    assert repository.connection.execute("SELECT version FROM auctions").fetchone()[0] == 2
+
+
+def test_save_rejects_stale_aggregate(tmp_path):
+    db_path = str(tmp_path / "auctions.db")
+    with closing(sqlite3.connect(db_path)) as setup:
+        auction = Auction(item_id="item-123", starting_price=10.0)
+        SQLiteAuctionWriteRepository(setup).save(auction)
+        setup.commit()
+
+    with closing(sqlite3.connect(db_path)) as first, closing(sqlite3.connect(db_path)) as second:
+        repo_a, repo_b = SQLiteAuctionWriteRepository(first), SQLiteAuctionWriteRepository(second)
+        seen_by_a = repo_a.find_by_id(auction.id)
+        seen_by_b = repo_b.find_by_id(auction.id)
+
+        seen_by_b.place_bid(bidder_id="bidder-b", amount=15.0)
+        repo_b.save(seen_by_b)
+        second.commit()
+
+        # A still validated its bid against the old price, so its write must not go through
+        seen_by_a.place_bid(bidder_id="bidder-a", amount=12.0)
+        with pytest.raises(ConcurrencyException):
+            repo_a.save(seen_by_a)
+        first.rollback()
+
+        rows = first.execute("SELECT bidder_id, amount FROM bids").fetchall()
+    assert rows == [("bidder-b", 15.0)]
+
+
+def test_find_by_id_returns_the_same_instance_without_a_query(repository):
+    auction = Auction(item_id="item-123", starting_price=10.0)
+    repository.save(auction)
+
+    statements = []
+    repository.connection.set_trace_callback(statements.append)
+    first = repository.find_by_id(auction.id)
+    second = repository.find_by_id(AuctionID(auction.id.value))
+    repository.connection.set_trace_callback(None)
+
+    assert first is second is auction
+    assert statements == []
+    assert repository.seen_entities == [auction]
+
+
+def test_save_skips_unchanged_aggregate(repository):
+    auction = Auction(item_id="item-123", starting_price=10.0)
+    repository.save(auction)
+
+    statements = []
+    repository.connection.set_trace_callback(statements.append)
+    repository.save(auction)
+    repository.connection.set_trace_callback(None)
+
+    assert statements == []
+    assert auction.version == 1
+
+
+def test_save_writes_only_changed_columns(repository):
+    auction = Auction(item_id="item-123", starting_price=10.0)
+    repository.save(auction)
+
+    auction.is_active = False
+    statements = []
+    repository.connection.set_trace_callback(statements.append)
+    repository.save(auction)
+    repository.connection.set_trace_callback(None)
+
+    assert len(statements) == 1
+    assert "SET is_active = 0, version = version + 1" in statements[0]
+
+
+def test_flush_writes_modified_aggregates_only(repository):
+    changed = Auction(item_id="changed", starting_price=10.0)
+    untouched = Auction(item_id="untouched", starting_price=10.0)
+    repository.save(changed)
+    repository.save(untouched)
+
+    changed.place_bid(bidder_id="bidder-1", amount=15.0)
+    assert repository.is_dirty(changed) and not repository.is_dirty(untouched)
+    repository.flush()
+
+    assert not repository.is_dirty(changed)
+    assert repository.connection.execute("SELECT item_id, version FROM auctions ORDER BY item_id").fetchall() == [
+        ("changed", 2),
+        ("untouched", 1),
+    ]
+    assert repository.connection.execute("SELECT bidder_id FROM bids").fetchall() == [("bidder-1",)]
+
+
+def test_forget_since_drops_aggregates_touched_after_the_mark(repository):
+    kept = Auction(item_id="kept", starting_price=10.0)
+    repository.save(kept)
+    mark = repository.mark()
+
+    dropped = repository.find_by_id(kept.id)
+    dropped.place_bid(bidder_id="bidder-1", amount=15.0)
+    repository.forget_since(mark)
+
+    assert repository.seen_entities == []
+    assert dropped.events == []
+    # The next load goes back to the database
+    reloaded = repository.find_by_id(kept.id)
+    assert reloaded is not dropped
+    assert reloaded.bid_count == 0
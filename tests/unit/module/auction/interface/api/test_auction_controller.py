@@ -1,5 +1,11 @@
+import json
+import threading
 from unittest.mock import MagicMock
 
+from interface.api.bootstrap import bootstrap_dependencies
+from module.auction.application.query import GetAuctionListVersionQuery, GetAuctionVersionQuery, ListAuctionsQuery
+from module.auction.application.read_repository import AuctionPageStream, AuctionVersion, InvalidCursorError
+from module.auction.infrastructure.sqlite_auction_summary_projection import SQLiteAuctionSummaryProjection
 from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
 from module.auction.interface.api.auction_controller import AuctionController
 from shared.application.event_bus import EventBus
@@ -17,7 +23,8 @@ def test_auction_controller_get_auction_links():
     auction_data = {"id": "123", "item_id": "item-1", "price": 100}
     query_bus.dispatch.return_value = auction_data
 
-    status, result = controller.get_auction(None, {"id": "123"})
+    status, encoded = controller.get_auction(None, {"id": "123"})
+    result = json.loads(encoded)
 
     assert status == 200
     assert result["id"] == "123"
@@ -32,11 +39,106 @@ def test_auction_controller_list_auctions_links():
 
     # Mock query result
     auctions = [{"id": "1", "item_id": "i1"}, {"id": "2", "item_id": "i2"}]
-    query_bus.dispatch.return_value = auctions
+    query_bus.dispatch.return_value = AuctionPageStream(iter(auctions))
 
-    status, result = controller.list_auctions(None, {})
+    status, stream = controller.list_auctions(None, {})
+    result = stream.collect()
 
     assert status == 200
-    assert len(result) == 2
-    assert result[0]["_links"]["self"]["href"] == "/auctions/1"
-    assert result[1]["_links"]["self"]["href"] == "/auctions/2"
+    assert len(result["items"]) == 2
+    assert result["items"][0]["_links"]["self"]["href"] == "/auctions/1"
+    assert result["items"][1]["_links"]["self"]["href"] == "/auctions/2"
+    assert "next" not in result["_links"]
+
+
+def test_auction_controller_list_auctions_passes_query_params():
+    query_bus = MagicMock(spec=QueryBus)
+    controller = AuctionController(query_bus, MagicMock(), MagicMock(), "db.db")
+    query_bus.dispatch.return_value = AuctionPageStream(iter([{"id": "1"}]), next_cursor="abc")
+
+    status, stream = controller.list_auctions(None, {"limit": "1", "is_active": "true", "sort": "-starting_price"})
+    result = stream.collect()
+
+    assert status == 200
+    assert query_bus.dispatch.call_args[0][0] == ListAuctionsQuery(limit=1, cursor=None, is_active=True, sort="-starting_price", stream=True)
+    assert result["_links"]["next"]["href"] == "/auctions?limit=1&sort=-starting_price&is_active=true&cursor=abc"
+
+
+def test_auction_controller_list_auctions_rejects_bad_params():
+    query_bus = MagicMock(spec=QueryBus)
+    controller = AuctionController(query_bus, MagicMock(), MagicMock(), "db.db")
+
+    assert controller.list_auctions(None, {"limit": "lots"})[0] == 400
+    assert controller.list_auctions(None, {"limit": "0"})[0] == 400
+    assert controller.list_auctions(None, {"is_active": "maybe"})[0] == 400
+    assert controller.list_auctions(None, {"sort": "item_id"})[0] == 400
+    query_bus.dispatch.assert_not_called()
+
+
+def test_auction_controller_create_auctions_batch_commits_valid_items(tmp_path):
+    db_path = str(tmp_path / "auctions.db")
+    event_bus = MagicMock(spec=EventBus)
+    controller = AuctionController(MagicMock(spec=QueryBus), SQLiteAuctionUnitOfWork, event_bus, db_path)
+
+    body = {"items": [{"item_id": "a", "starting_price": 1.0}, {"item_id": "b"}, {"item_id": "c", "starting_price": "3"}]}
+    status, result = controller.create_auctions_batch(body, {})
+
+    assert status == 200
+    ok, invalid, ok_too = result["items"]
+    assert ok["ok"] and ok_too["ok"]
+    assert ok["_links"]["self"]["href"] == f"/auctions/{ok['id']}"
+    assert invalid == {"index": 1, "ok": False, "error": "Missing required fields: item_id and starting_price"}
+    # Both creations are published together, after the single commit
+    event_bus.publish.assert_called_once()
+    assert len(event_bus.publish.call_args.args[0]) == 2
+
+
+def test_auction_controller_validators_follow_versions():
+    query_bus = MagicMock(spec=QueryBus)
+    controller = AuctionController(query_bus, MagicMock(), MagicMock(), "db.db")
+
+    query_bus.dispatch.return_value = AuctionVersion(summary=1, bids=1)
+    etag = controller.auction_validators({"id": "a"}).etag
+    query_bus.dispatch.return_value = AuctionVersion(summary=1, bids=2)
+    assert controller.auction_validators({"id": "a"}).etag != etag
+    assert query_bus.dispatch.call_args[0][0] == GetAuctionVersionQuery(auction_id="a")
+    query_bus.dispatch.return_value = None
+    assert controller.auction_validators({"id": "a"}) is None
+
+    query_bus.dispatch.return_value = (("a", 1), ("b", 0))
+    page = controller.list_validators({"limit": "10", "sort": "-id"})
+    assert query_bus.dispatch.call_args[0][0] == GetAuctionListVersionQuery(limit=10, cursor=None, is_active=None, sort="-id")
+    assert "Last-Modified" not in page.headers()
+    # The tag is tied to the query string, not just to the rows
+    assert controller.list_validators({"limit": "20", "sort": "-id"}).etag != page.etag
+    query_bus.dispatch.return_value = (("a", 2), ("b", 0))
+    assert controller.list_validators({"limit": "10", "sort": "-id"}).etag != page.etag
+
+    # Invalid requests are answered with a 400, so there is nothing to validate
+    assert controller.list_validators({"limit": "lots"}) is None
+    query_bus.dispatch.side_effect = InvalidCursorError("Malformed pagination cursor")
+    assert controller.list_validators({"cursor": "x"}) is None
+
+
+def test_auction_created_with_the_async_bus_can_be_read_back_right_away(tmp_path, monkeypatch):
+    # Hold the projection back, as a busy subscriber queue would
+    projected = threading.Event()
+    apply = SQLiteAuctionSummaryProjection.apply
+
+    def delayed_apply(self, events):
+        projected.wait(5)
+        apply(self, events)
+
+    monkeypatch.setattr(SQLiteAuctionSummaryProjection, "apply", delayed_apply)
+    db_path = str(tmp_path / "auctions.db")
+    container = bootstrap_dependencies(db_path, async_events=True)
+    controller = AuctionController(container.query_bus, container.uow_factory, container.event_bus, db_path)
+
+    status, created = controller.create_auction({"item_id": "item-1", "starting_price": 10.0}, {})
+    assert status == 201
+    status, encoded = controller.get_auction(None, {"id": created["id"]})
+
+    assert status == 200
+    assert json.loads(encoded)["item_id"] == "item-1"
+    projected.set()
+    container.close()
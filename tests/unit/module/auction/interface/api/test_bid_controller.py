@@ -1,5 +1,9 @@
+import sqlite3
+from contextlib import closing
 from unittest.mock import MagicMock
 
+from module.auction.infrastructure.sqlite_auction_unit_of_work import SQLiteAuctionUnitOfWork
+from module.auction.interface.api.auction_controller import AuctionController
 from module.auction.interface.api.bid_controller import BidController
 from shared.application.event_bus import EventBus
 from shared.application.query_bus import QueryBus
@@ -13,7 +17,8 @@ def test_bid_controller_list_bids_structure():
     bids = [{"amount": 10}, {"amount": 20}]
     query_bus.dispatch.return_value = bids
 
-    status, result = controller.list_bids(None, {"id": "123"})
+    status, stream = controller.list_bids(None, {"id": "123"})
+    result = stream.collect()
 
     assert status == 200
     # Expecting wrapped structure now
@@ -40,3 +45,54 @@ def test_bid_controller_place_bid_response():
     assert status == 200
     assert result["message"] == "Bid accepted"
     assert result["_links"]["auction"]["href"] == "/auctions/123"
+
+
+def test_bid_controller_place_bids_batch_reports_each_item(tmp_path):
+    db_path = str(tmp_path / "auctions.db")
+    event_bus = EventBus()
+    auction_ctrl = AuctionController(MagicMock(spec=QueryBus), SQLiteAuctionUnitOfWork, event_bus, db_path)
+    _, created = auction_ctrl.create_auction({"item_id": "item-1", "starting_price": 10.0}, {})
+    auction_id = created["id"]
+    controller = BidController(MagicMock(spec=QueryBus), SQLiteAuctionUnitOfWork, event_bus, db_path)
+
+    body = {
+        "items": [
+            {"auction_id": auction_id, "bidder_id": "u1", "amount": 15.0},
+            {"auction_id": auction_id, "bidder_id": "u2", "amount": 12.0},  # lower than the previous item
+            {"auction_id": auction_id, "bidder_id": "u3"},
+            {"auction_id": "missing", "bidder_id": "u4", "amount": 50.0},
+            {"auction_id": auction_id, "bidder_id": "u5", "amount": 20.0},
+        ]
+    }
+    status, result = controller.place_bids_batch(body, {})
+
+    assert status == 200
+    assert [item["ok"] for item in result["items"]] == [True, False, False, False, True]
+    assert [item["index"] for item in result["items"]] == [0, 1, 2, 3, 4]
+    assert "must be higher" in result["items"][1]["error"]
+    assert (result["succeeded"], result["failed"]) == (2, 3)
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        bids = conn.execute("SELECT bidder_id, amount FROM bids ORDER BY sequence").fetchall()
+    assert bids == [("u1", 15.0), ("u5", 20.0)]
+
+
+def test_bid_controller_place_bids_batch_rejects_malformed_batches():
+    controller = BidController(MagicMock(spec=QueryBus), MagicMock(), MagicMock(), "db.db")
+
+    assert controller.place_bids_batch({"items": []}, {})[0] == 400
+    assert controller.place_bids_batch({"items": "nope"}, {})[0] == 400
+    assert controller.place_bids_batch(None, {})[0] == 400
+
+
+def test_bid_controller_place_bid_goes_through_group_commit_writer():
+    uow_factory = MagicMock()
+    bid_writer = MagicMock()
+    controller = BidController(MagicMock(spec=QueryBus), uow_factory, MagicMock(), "db.db", bid_writer=bid_writer)
+
+    status, _ = controller.place_bid({"bidder_id": "u1", "amount": 50.0}, {"id": "123"})
+
+    assert status == 200
+    (cmd,) = bid_writer.submit.call_args.args
+    assert (cmd.auction_id, cmd.bidder_id, cmd.amount) == ("123", "u1", 50.0)
+    uow_factory.assert_not_called()
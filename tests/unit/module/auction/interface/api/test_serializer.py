@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from module.auction.interface.api.serializer import AuctionSerializer, auction_links
+from shared.interface.api.json_backend import OrjsonJSONBackend
+from shared.interface.api.json_stream import JSONStream
+
+
+class CompactJSONBackend:
+    name = "compact"
+    item_separator = b","
+    key_separator = b":"
+
+    def dumps(self, value):
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+AUCTIONS = [
+    {"id": "3f2c", "item_id": "item-1", "starting_price": 10.5, "is_active": True, "bid_count": 2, "highest_bid": 12.0},
+    {"id": 'we"ird/\\ü id', "item_id": "é", "starting_price": 0.0, "is_active": False, "bid_count": 0, "highest_bid": None},
+]
+
+
+def test_auction_encoding_is_byte_identical_to_the_full_dict():
+    serializer = AuctionSerializer()
+
+    for auction in AUCTIONS:
+        expected = json.dumps({**auction, "_links": auction_links(auction["id"])}).encode("utf-8")
+        assert serializer.encode(auction) == expected
+    # The query result is left as it was
+    assert "_links" not in AUCTIONS[0]
+
+
+def test_link_fragments_follow_the_backend_formatting():
+    backend = CompactJSONBackend()
+    serializer = AuctionSerializer(backend)
+
+    for auction in AUCTIONS:
+        assert serializer.encode(auction) == backend.dumps({**auction, "_links": auction_links(auction["id"])})
+
+
+def test_listing_stream_matches_the_dict_it_replaces():
+    serializer = AuctionSerializer()
+    tail = {"_links": {"self": {"href": "/auctions?limit=50&sort=id", "method": "GET"}}}
+
+    stream = JSONStream(iter(AUCTIONS), tail=lambda: tail, encode_item=serializer.encode)
+
+    expected = {"items": [{**a, "_links": auction_links(a["id"])} for a in AUCTIONS], **tail}
+    assert b"".join(stream.chunks(chunk_size=64)) == json.dumps(expected).encode("utf-8")
+
+
+def test_orjson_encoding_is_byte_identical_to_orjson():
+    orjson = pytest.importorskip("orjson")
+    serializer = AuctionSerializer(OrjsonJSONBackend())
+
+    for auction in AUCTIONS:
+        assert serializer.encode(auction) == orjson.dumps({**auction, "_links": auction_links(auction["id"])})
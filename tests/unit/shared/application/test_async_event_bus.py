@@ -0,0 +1,113 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from shared.application.async_event_bus import AsyncEventBus
+from shared.application.metrics import MetricsRegistry
+from shared.domain.event import Event
+
+
+@dataclass(frozen=True)
+class SomethingHappened(Event):
+    value: int
+
+
+def test_publish_returns_before_slow_handler_runs():
+    bus = AsyncEventBus()
+    release = threading.Event()
+    received = []
+
+    def slow_handler(event):
+        release.wait(5)
+        received.append(event.value)
+
+    bus.subscribe(SomethingHappened, slow_handler)
+    bus.publish([SomethingHappened(1), SomethingHappened(2)])
+
+    assert received == []
+    assert bus.stats()[0].queue_depth >= 1
+
+    release.set()
+    bus.shutdown(timeout=5)
+    assert received == [1, 2]
+
+
+def test_failing_handler_is_retried_and_isolated():
+    bus = AsyncEventBus(max_retries=2, retry_backoff=0)
+    attempts = []
+    delivered = []
+
+    def flaky(event):
+        attempts.append(event.value)
+        if len(attempts) < 3:
+            raise RuntimeError("temporarily unavailable")
+
+    def always_fails(event):
+        raise RuntimeError("broken")
+
+    bus.subscribe(SomethingHappened, flaky)
+    bus.subscribe(SomethingHappened, always_fails)
+    bus.subscribe(SomethingHappened, lambda event: delivered.append(event.value))
+
+    bus.publish([SomethingHappened(7)])
+    bus.shutdown(timeout=5)
+
+    stats = {s.subscriber: s for s in bus.stats()}
+    assert attempts == [7, 7, 7]
+    assert stats["test_failing_handler_is_retried_and_isolated.<locals>.flaky"].delivered == 1
+    assert stats["test_failing_handler_is_retried_and_isolated.<locals>.flaky"].retried == 2
+    assert stats["test_failing_handler_is_retried_and_isolated.<locals>.always_fails"].failed == 1
+    assert delivered == [7]
+    assert stats["test_failing_handler_is_retried_and_isolated.<locals>.<lambda>"].latency.count == 1
+
+
+def test_full_queue_drops_events():
+    bus = AsyncEventBus(queue_size=1, enqueue_timeout=0.01)
+    release = threading.Event()
+    bus.subscribe(SomethingHappened, lambda event: release.wait(5))
+
+    bus.publish([SomethingHappened(i) for i in range(5)])
+    release.set()
+    bus.shutdown(timeout=5)
+
+    assert bus.stats()[0].dropped >= 1
+
+
+def test_batch_subscriber_gets_one_delivery_per_publish():
+    bus = AsyncEventBus()
+    batches = []
+    bus.subscribe_batch((SomethingHappened,), batches.append)
+
+    bus.publish([SomethingHappened(1), SomethingHappened(2)])
+    bus.publish([])
+    bus.shutdown(timeout=5)
+
+    assert batches == [[SomethingHappened(1), SomethingHappened(2)]]
+    assert bus.stats()[0].delivered == 1
+
+
+def test_shutdown_returns_after_its_timeout_when_a_worker_is_stuck_on_a_full_queue():
+    bus = AsyncEventBus(queue_size=1, enqueue_timeout=0.01)
+    release = threading.Event()
+    bus.subscribe(SomethingHappened, lambda event: release.wait(5))
+    bus.publish([SomethingHappened(1), SomethingHappened(2)])
+
+    started = time.monotonic()
+    bus.shutdown(timeout=0.2)
+
+    assert time.monotonic() - started < 2
+    release.set()
+
+
+def test_subscriber_stats_are_reported_as_metrics():
+    metrics = MetricsRegistry()
+    bus = AsyncEventBus(metrics=metrics)
+    bus.subscribe(SomethingHappened, lambda event: None)
+
+    bus.publish([SomethingHappened(1)])
+    bus.shutdown(timeout=5)
+
+    families = {snapshot.name: snapshot for snapshot in metrics.collect()}
+    assert families["event_deliveries_total"].samples == (((bus.stats()[0].subscriber,), 1.0),)
+    assert families["event_queue_depth"].kind == "gauge"
+    assert families["event_handler_duration_seconds"].samples[0][1].count == 1
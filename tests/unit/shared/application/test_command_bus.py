@@ -0,0 +1,80 @@
+import pytest
+
+from shared.application.command import Command
+from shared.application.command_bus import CommandBus, CommandResult
+from shared.application.metrics import MetricsRegistry
+from shared.application.unit_of_work import UnitOfWork
+from shared.domain.exception import DomainException
+
+
+class RecordingUnitOfWork(UnitOfWork):
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class Double(Command):
+    def __init__(self, value):
+        self.value = value
+
+
+class DoubleHandler:
+    def handle(self, cmd: Double) -> int:
+        if cmd.value < 0:
+            raise DomainException("value must not be negative")
+        if cmd.value == 0:
+            raise RuntimeError("database is gone")
+        return cmd.value * 2
+
+
+def test_dispatch_returns_handler_result():
+    bus = CommandBus()
+    bus.register(Double, DoubleHandler())
+
+    assert bus.dispatch(Double(2)) == 4
+
+
+def test_dispatch_many_reports_business_rule_failures_per_item():
+    bus = CommandBus()
+    bus.register(Double, DoubleHandler())
+    uow = RecordingUnitOfWork()
+
+    results = bus.dispatch_many([Double(1), Double(-1), Double(3)], uow)
+
+    assert results == [
+        CommandResult(ok=True, value=2),
+        CommandResult(ok=False, error="value must not be negative"),
+        CommandResult(ok=True, value=6),
+    ]
+    assert (uow.commits, uow.rollbacks) == (1, 0)
+
+
+def test_dispatch_many_aborts_on_unexpected_errors():
+    bus = CommandBus()
+    bus.register(Double, DoubleHandler())
+    uow = RecordingUnitOfWork()
+
+    with pytest.raises(RuntimeError):
+        bus.dispatch_many([Double(1), Double(0)], uow)
+    assert (uow.commits, uow.rollbacks) == (0, 1)
+
+
+def test_dispatch_times_commands_and_counts_broken_business_rules():
+    metrics = MetricsRegistry()
+    bus = CommandBus(metrics)
+    bus.register(Double, DoubleHandler())
+
+    bus.dispatch(Double(1))
+    with pytest.raises(DomainException):
+        bus.dispatch(Double(-1))
+
+    domain_exceptions, durations = metrics.collect()
+    assert durations.samples[0][0] == ("Double",)
+    assert durations.samples[0][1].count == 2
+    assert domain_exceptions.samples == ((("Double", "DomainException"), 1.0),)
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+from shared.application.event_bus import EventBus
+from shared.domain.event import Event
+
+
+@dataclass(frozen=True)
+class Opened(Event):
+    value: int
+
+
+@dataclass(frozen=True)
+class Closed(Event):
+    value: int
+
+
+def test_batch_subscriber_receives_matching_events_of_one_publish_in_order():
+    bus = EventBus()
+    single, batches = [], []
+    bus.subscribe(Opened, single.append)
+    bus.subscribe_batch((Opened,), batches.append)
+
+    bus.publish([Opened(1), Closed(2), Opened(3)])
+    bus.publish([Closed(4)])
+
+    assert single == [Opened(1), Opened(3)]
+    assert batches == [[Opened(1), Opened(3)]]
@@ -0,0 +1,116 @@
+import pytest
+
+from shared.application.command import Command
+from shared.application.command_bus import CommandBus
+from shared.application.group_commit import GroupCommitWriter
+from shared.application.metrics import MetricsRegistry
+from shared.application.unit_of_work import UnitOfWork
+from shared.domain.exception import DomainException
+
+
+class RecordingUnitOfWork(UnitOfWork):
+    """Supports nesting like the SQLite UoW: only the outermost scope commits."""
+
+    commits: list[list[int]] = []
+
+    def __init__(self):
+        self.applied: list[int] = []
+        self.depth = 0
+
+    def __enter__(self):
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            super().__exit__(exc_type, exc_value, traceback)
+
+    def commit(self):
+        RecordingUnitOfWork.commits.append(self.applied)
+
+    def rollback(self):
+        pass
+
+
+class Add(Command):
+    def __init__(self, value):
+        self.value = value
+
+
+class AddHandler:
+    def __init__(self, uow: RecordingUnitOfWork):
+        self.uow = uow
+
+    def handle(self, cmd: Add) -> int:
+        with self.uow:
+            if cmd.value < 0:
+                raise DomainException("negative")
+            if cmd.value == 0 and self.uow.applied:
+                raise RuntimeError("only fails when batched")
+            self.uow.applied.append(cmd.value)
+            return cmd.value
+
+
+def command_bus(uow: UnitOfWork) -> CommandBus:
+    bus = CommandBus()
+    bus.register(Add, AddHandler(uow))
+    return bus
+
+
+@pytest.fixture(autouse=True)
+def reset_commits():
+    RecordingUnitOfWork.commits = []
+
+
+def test_concurrent_commands_share_one_commit_and_keep_their_own_outcome():
+    # A long wait, so the batch is closed by its size
+    writer = GroupCommitWriter(RecordingUnitOfWork, command_bus, max_batch_size=3, max_wait=5.0).start()
+    futures = [writer.submit_async(Add(v)) for v in (1, -1, 2)]
+
+    assert futures[0].result(5) == 1
+    with pytest.raises(DomainException):
+        futures[1].result(5)
+    assert futures[2].result(5) == 2
+    writer.stop(timeout=5)
+
+    assert RecordingUnitOfWork.commits == [[1, 2]]
+    stats = writer.stats()
+    assert (stats.batches, stats.commands, stats.failed_batches) == (1, 3, 0)
+    assert (stats.batch_size.count, stats.batch_size.sum) == (1, 3)
+    assert stats.wait.count == 3
+
+
+def test_failed_batch_is_retried_one_command_at_a_time():
+    writer = GroupCommitWriter(RecordingUnitOfWork, command_bus, max_batch_size=2, max_wait=5.0).start()
+    first, second = writer.submit_async(Add(1)), writer.submit_async(Add(0))
+
+    assert first.result(5) == 1
+    assert second.result(5) == 0
+    writer.stop(timeout=5)
+
+    assert RecordingUnitOfWork.commits == [[1], [0]]
+    assert writer.stats().failed_batches == 1
+
+
+def test_stop_applies_queued_commands_and_rejects_new_ones():
+    writer = GroupCommitWriter(RecordingUnitOfWork, command_bus, max_batch_size=10, max_wait=5.0).start()
+    future = writer.submit_async(Add(1))
+    writer.stop(timeout=5)
+
+    assert future.result(0) == 1
+    with pytest.raises(RuntimeError):
+        writer.submit(Add(2))
+
+
+def test_stats_are_reported_as_metrics():
+    metrics = MetricsRegistry()
+    writer = GroupCommitWriter(RecordingUnitOfWork, command_bus, max_batch_size=2, max_wait=5.0, metrics=metrics).start()
+    futures = [writer.submit_async(Add(v)) for v in (1, 2)]
+    for future in futures:
+        future.result(5)
+    writer.stop(timeout=5)
+
+    families = {snapshot.name: snapshot for snapshot in metrics.collect()}
+    assert families["group_commit_commands_total"].samples == (((), 2),)
+    assert families["group_commit_batch_size"].samples[0][1].sum == 2
@@ -0,0 +1,49 @@
+import pytest
+
+from shared.application.metrics import Histogram, MetricSnapshot, MetricsRegistry, single_sample
+
+
+def test_histogram_counts_values_into_buckets():
+    histogram = Histogram(buckets=(1.0, 5.0, 10.0))
+    for value in (0.5, 1.0, 3.0, 7.0, 20.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot.counts == (2, 1, 1, 1)
+    assert snapshot.count == 5
+    assert snapshot.sum == 31.5
+    assert snapshot.percentile(50) == 5.0
+    assert snapshot.percentile(100) == float("inf")
+
+
+def test_registry_returns_declared_families_and_collects_their_children():
+    registry = MetricsRegistry()
+    commands = registry.counter("commands_total", "Commands handled.", ("command",))
+    commands.labels("PlaceBid").inc()
+    commands.labels("PlaceBid").inc(2)
+    registry.gauge("in_use", "Connections in use.").labels().set(3)
+    registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)).labels().observe(0.5)
+    registry.register_collector(lambda: [MetricSnapshot("extra", "From a collector.", "gauge", (), (((), 1.0),))])
+
+    # Declaring it again (e.g. from another instance of a component) returns the same family
+    assert registry.counter("commands_total", "Commands handled.", ("command",)) is commands
+    with pytest.raises(ValueError):
+        registry.gauge("commands_total", "Commands handled.", ("command",))
+    with pytest.raises(ValueError):
+        commands.labels("PlaceBid", "extra")
+
+    counter, gauge, histogram, extra = registry.collect()
+    assert counter.samples == ((("PlaceBid",), 3.0),)
+    assert gauge.samples == (((), 3.0),)
+    assert histogram.samples[0][1].counts == (0, 1, 0)
+    assert extra.name == "extra"
+
+
+def test_collectors_reporting_the_same_family_are_merged():
+    registry = MetricsRegistry()
+    for pool in ("read", "write"):
+        registry.register_collector(lambda pool=pool: [single_sample("pool_size", "Connections.", "gauge", 2, {"pool": pool})])
+
+    (size,) = registry.collect()
+    assert size.label_names == ("pool",)
+    assert size.samples == ((("read",), 2), (("write",), 2))
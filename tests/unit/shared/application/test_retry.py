@@ -0,0 +1,60 @@
+import pytest
+
+from shared.application.exception import ConcurrencyException
+from shared.application.metrics import MetricsRegistry
+from shared.application.retry import RetryPolicy
+
+
+def flaky(failures: int):
+    calls = []
+
+    def operation():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise ConcurrencyException("conflict")
+        return len(calls)
+
+    return operation
+
+
+def test_retries_conflicts_with_bounded_jittered_backoff():
+    delays = []
+    policy = RetryPolicy(max_attempts=5, base_delay=0.01, max_delay=0.02, sleep=delays.append)
+
+    assert policy.run(flaky(3)) == 4
+
+    assert len(delays) == 3
+    assert 0 <= delays[0] <= 0.01
+    assert all(0 <= d <= 0.02 for d in delays)
+    stats = policy.stats()
+    assert (stats.calls, stats.attempts, stats.conflicts, stats.exhausted) == (1, 4, 3, 0)
+    assert stats.conflict_rate == 0.75
+
+
+def test_gives_up_after_max_attempts():
+    policy = RetryPolicy(max_attempts=2, sleep=lambda _: None)
+
+    with pytest.raises(ConcurrencyException):
+        policy.run(flaky(5))
+    assert policy.stats().exhausted == 1
+
+
+def test_other_errors_are_not_retried():
+    policy = RetryPolicy(sleep=lambda _: None)
+
+    def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        policy.run(broken)
+    assert policy.stats().attempts == 1
+
+
+def test_stats_are_reported_as_metrics():
+    metrics = MetricsRegistry()
+    policy = RetryPolicy(max_attempts=5, sleep=lambda _: None, name="bid", metrics=metrics)
+    policy.run(flaky(2))
+
+    families = {snapshot.name: snapshot for snapshot in metrics.collect()}
+    assert families["retry_attempts_total"].samples == ((("bid",), 3),)
+    assert families["retry_conflicts_total"].samples == ((("bid",), 2),)
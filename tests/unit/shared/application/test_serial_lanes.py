@@ -0,0 +1,8 @@
+from shared.application.serial_lanes import SerialLanes
+
+
+def test_same_key_always_takes_the_same_lane():
+    lanes = SerialLanes(lanes=8)
+
+    assert lanes.lane("auction-1") is lanes.lane("auction-1")
+    assert len({id(lanes.lane(f"auction-{i}")) for i in range(100)}) == 8
@@ -0,0 +1,98 @@
+import json
+import threading
+
+import pytest
+
+from shared.application.tracing import NO_SPAN, JSONLTraceExporter, Tracer, continue_trace, current_span, span
+
+
+class ListExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+def test_spans_nest_under_the_sampled_root_and_record_errors():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, sample_rate=1.0)
+
+    with tracer.trace("http.request", target="/auctions") as root:
+        with span("command", command="PlaceBid") as command:
+            with pytest.raises(ValueError), span("uow.commit"):
+                raise ValueError("conflict")
+            command.set(attempts=1)
+        root.set(status=200)
+
+    (trace,) = exporter.traces
+    commit, command, root = trace.spans
+    assert trace.root is root and root.parent_id is None
+    assert command.parent_id == root.span_id and commit.parent_id == command.span_id
+    assert command.attributes == {"command": "PlaceBid", "attempts": 1}
+    assert commit.error == "ValueError: conflict"
+    assert trace.to_dict()["spans"][2]["attributes"] == {"target": "/auctions", "status": 200}
+    assert current_span() is None
+
+
+def test_span_is_a_no_op_outside_a_trace_and_unsampled_traces_are_not_recorded():
+    tracer = Tracer(ListExporter(), sample_rate=0.0)
+
+    assert span("uow.commit") is NO_SPAN
+    assert tracer.trace("http.request") is NO_SPAN
+    with tracer.trace("http.request"):
+        assert span("command") is NO_SPAN
+
+
+def test_slow_threshold_keeps_only_slow_unsampled_traces():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, sample_rate=0.0, slow_threshold=0.5)
+
+    with tracer.trace("http.request", target="/fast"):
+        pass
+    with tracer.trace("http.request", target="/slow") as root:
+        root.started -= 1.0
+
+    (trace,) = exporter.traces
+    assert trace.root.attributes["target"] == "/slow"
+    assert not trace.sampled
+
+
+def test_continue_trace_records_handed_off_work_under_the_same_trace_id():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, sample_rate=1.0)
+
+    with tracer.trace("http.request"), span("event_bus.publish"):
+        parent = current_span()
+
+    def subscriber():
+        with continue_trace(parent, "event_handler", handler="project"), span("sqlite.commit"):
+            pass
+
+    worker = threading.Thread(target=subscriber)
+    worker.start()
+    worker.join()
+
+    request, handler = exporter.traces
+    assert handler.trace_id == request.trace_id
+    assert handler.root.parent_id == parent.span_id
+    assert [s.name for s in handler.spans] == ["sqlite.commit", "event_handler"]
+    assert continue_trace(None, "event_handler") is NO_SPAN
+
+
+def test_jsonl_exporter_writes_one_trace_per_line_and_rotates(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = JSONLTraceExporter(str(path), max_bytes=600, backup_count=1)
+    tracer = Tracer(exporter, sample_rate=1.0)
+
+    for i in range(5):
+        with tracer.trace("http.request", target=f"/auctions/{i}"), span("query", query="GetAuction"):
+            pass
+    exporter.close()
+
+    lines = path.read_text().splitlines() + (tmp_path / "traces.jsonl.1").read_text().splitlines()
+    assert 0 < len(lines) <= 5
+    trace = json.loads(lines[0])
+    assert trace["name"] == "http.request"
+    assert [s["name"] for s in trace["spans"]] == ["query", "http.request"]
+    assert trace["spans"][0]["parent_id"] == trace["spans"][1]["span_id"]
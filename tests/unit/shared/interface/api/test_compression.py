@@ -0,0 +1,63 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from shared.interface.api.compression import CompressedBodyCache, ResponseCompressor, negotiate_encoding
+from shared.interface.api.json_stream import JSONStream
+
+
+def test_negotiate_encoding_follows_quality_values():
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("deflate;q=1.0, gzip;q=0.5") == "deflate"
+    assert negotiate_encoding("br, *;q=0.1") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate;q=0") is None
+    assert negotiate_encoding("br, identity") is None
+    assert negotiate_encoding(None) is None
+
+
+def test_bodies_below_the_threshold_are_left_alone():
+    compressor = ResponseCompressor(level=6, min_size=100)
+    body = json.dumps({"items": [{"id": str(i), "_links": {"self": {"href": f"/auctions/{i}"}}} for i in range(50)]}).encode()
+
+    assert compressor.compress_body(body[:99], "gzip") is None
+    assert gzip.decompress(compressor.compress_body(body, "gzip")) == body
+    assert zlib.decompress(compressor.compress_body(body, "deflate")) == body
+    assert len(compressor.compress_body(body, "gzip")) < len(body) / 5
+    with pytest.raises(ValueError):
+        ResponseCompressor(level=0)
+
+
+def test_streams_are_compressed_chunk_by_chunk_and_cached_once_complete():
+    cache = CompressedBodyCache()
+    compressor = ResponseCompressor(cache=cache)
+    items = [{"id": i, "name": "x" * 20} for i in range(2000)]
+    stream = compressor.compress_stream(JSONStream(iter(items)), "gzip", etag='"v1"')
+
+    expected = json.dumps({"items": items}).encode()
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = stream.chunks(chunk_size=4096)
+    # Each chunk decodes as it arrives: the client does not wait for the end of the stream
+    first = decoder.decompress(next(chunks))
+    assert len(first) >= 4096 and expected.startswith(first)
+    assert cache.get('"v1"', "gzip") is None
+    rest = b"".join(chunks)
+
+    assert first + decoder.decompress(rest) == expected
+    assert gzip.decompress(cache.get('"v1"', "gzip")) == expected
+
+
+def test_cache_is_bounded_in_bytes():
+    cache = CompressedBodyCache(max_bytes=10, max_entry_bytes=6)
+
+    cache.put('"a"', "gzip", b"12345")
+    cache.put('"b"', "gzip", b"12345")
+    cache.get('"a"', "gzip")
+    cache.put('"c"', "gzip", b"12345")
+    cache.put('"d"', "gzip", b"1234567")
+
+    assert cache.get('"a"', "gzip") == b"12345"
+    assert cache.get('"b"', "gzip") is None  # least recently used
+    assert cache.get('"d"', "gzip") is None  # larger than an entry may be
+    assert (cache.hits, cache.misses) == (2, 2)
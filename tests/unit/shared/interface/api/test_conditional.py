@@ -0,0 +1,33 @@
+from datetime import UTC, datetime
+
+from shared.interface.api.conditional import Validators, strong_etag
+
+
+def test_strong_etag_is_quoted_and_follows_its_parts():
+    etag = strong_etag("auction", "a1", 3, "stdlib")
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == strong_etag("auction", "a1", 3, "stdlib")
+    assert etag != strong_etag("auction", "a1", 4, "stdlib")
+
+
+def test_if_none_match_compares_entity_tags():
+    validators = Validators('"abc"')
+
+    assert validators.not_modified({"if-none-match": '"abc"'})
+    assert validators.not_modified({"if-none-match": '"zzz", W/"abc"'})
+    assert validators.not_modified({"if-none-match": "*"})
+    assert not validators.not_modified({"if-none-match": '"zzz"'})
+    assert not validators.not_modified({})
+
+
+def test_if_modified_since_compares_whole_seconds_and_yields_to_if_none_match():
+    validators = Validators('"abc"', datetime(2024, 5, 1, 12, 0, 0, 250_000, tzinfo=UTC))
+
+    assert validators.headers() == {"ETag": '"abc"', "Last-Modified": "Wed, 01 May 2024 12:00:00 GMT"}
+    assert validators.not_modified({"if-modified-since": "Wed, 01 May 2024 12:00:00 GMT"})
+    assert validators.not_modified({"if-modified-since": "Thu, 02 May 2024 00:00:00 GMT"})
+    assert not validators.not_modified({"if-modified-since": "Wed, 01 May 2024 11:59:59 GMT"})
+    assert not validators.not_modified({"if-modified-since": "yesterday"})
+    # A mismatching If-None-Match wins over a matching If-Modified-Since
+    assert not validators.not_modified({"if-none-match": '"zzz"', "if-modified-since": "Thu, 02 May 2024 00:00:00 GMT"})
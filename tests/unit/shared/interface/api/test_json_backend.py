@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from shared.interface.api.json_backend import STDLIB_JSON, StaticJSON, select_json_backend
+
+
+def test_stdlib_backend_encodes_exactly_like_json_dumps():
+    values = [
+        {"id": 'a"b\\c/é', "price": 1.1, "count": 3, "active": True, "none": None, "nested": [1, {"x": [2.5e-7]}]},
+        [float("nan"), float("inf"), -0.0, 10**20],
+        "plain",
+        "ünïcode  ",
+        42,
+        None,
+    ]
+    for value in values:
+        assert STDLIB_JSON.dumps(value) == json.dumps(value).encode("utf-8")
+
+
+def test_stdlib_backend_rejects_what_json_dumps_rejects():
+    with pytest.raises(TypeError):
+        STDLIB_JSON.dumps({"when": object()})
+    cyclic: dict = {}
+    cyclic["self"] = cyclic
+    with pytest.raises(ValueError):
+        STDLIB_JSON.dumps(cyclic)
+
+
+def test_select_json_backend_falls_back_to_the_standard_library():
+    assert select_json_backend("stdlib").name == "stdlib"
+    # orjson is optional: either it is used, or the standard library stands in for it
+    assert select_json_backend("auto").name in ("stdlib", "orjson")
+    with pytest.raises(ValueError):
+        select_json_backend("simdjson")
+
+
+def test_static_json_is_encoded_once_per_backend():
+    document = StaticJSON({"message": "hi"})
+
+    first = document.encode(STDLIB_JSON)
+
+    assert first == b'{"message": "hi"}'
+    assert document.encode(STDLIB_JSON) is first
@@ -0,0 +1,59 @@
+import json
+
+from shared.interface.api.json_stream import JSONStream, chunked
+
+
+def test_stream_encodes_exactly_like_json_dumps():
+    items = [{"id": str(i), "price": i * 1.5, "name": "é"} for i in range(100)]
+    stream = JSONStream(iter(items), head={"count": 100}, tail=lambda: {"_links": {"self": {"href": "/x"}}})
+
+    encoded = b"".join(stream.chunks(chunk_size=256))
+
+    expected = {"count": 100, "items": items, "_links": {"self": {"href": "/x"}}}
+    assert encoded == json.dumps(expected).encode("utf-8")
+    assert b"".join(JSONStream(iter([])).chunks()) == json.dumps({"items": []}).encode("utf-8")
+
+
+def test_stream_is_produced_in_chunks_as_items_are_read():
+    read = []
+
+    def items():
+        for i in range(1000):
+            read.append(i)
+            yield {"id": i}
+
+    chunks = JSONStream(items()).chunks(chunk_size=1024)
+    next(chunks)
+    assert 0 < len(read) < 1000
+
+
+def test_tail_is_computed_after_the_items():
+    state = {"last": None}
+
+    def items():
+        for i in range(3):
+            state["last"] = i
+            yield i
+
+    stream = JSONStream(items(), tail=lambda: {"last": state["last"]})
+    assert stream.collect() == {"items": [0, 1, 2], "last": 2}
+
+
+def test_close_releases_the_items():
+    closed = []
+
+    def items():
+        try:
+            yield 1
+            yield 2
+        finally:
+            closed.append("items")
+
+    stream = JSONStream(items(), on_close=lambda: closed.append("on_close"))
+    next(stream.chunks(chunk_size=1))
+    stream.close()
+    assert closed == ["items", "on_close"]
+
+
+def test_chunked_framing():
+    assert b"".join(chunked([b"hello", b"", b"world!"])) == b"5\r\nhello\r\n6\r\nworld!\r\n0\r\n\r\n"
@@ -0,0 +1,37 @@
+from shared.application.metrics import MetricsRegistry
+from shared.interface.api.prometheus import render_prometheus
+
+
+def test_render_prometheus_writes_the_text_exposition_format():
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events published.", ("event",)).labels('Bid"Placed').inc(2)
+    latency = registry.histogram("query_seconds", "Query time.", ("query",), buckets=(0.01, 0.1)).labels("GetAuction")
+    latency.observe(0.005)
+    latency.observe(0.5)
+
+    assert render_prometheus(registry.collect()).decode().splitlines() == [
+        "# HELP events_total Events published.",
+        "# TYPE events_total counter",
+        'events_total{event="Bid\\"Placed"} 2',
+        "# HELP query_seconds Query time.",
+        "# TYPE query_seconds histogram",
+        'query_seconds_bucket{query="GetAuction",le="0.01"} 1',
+        'query_seconds_bucket{query="GetAuction",le="0.1"} 1',
+        'query_seconds_bucket{query="GetAuction",le="+Inf"} 2',
+        'query_seconds_sum{query="GetAuction"} 0.505',
+        'query_seconds_count{query="GetAuction"} 2',
+    ]
+
+
+def test_render_prometheus_writes_non_finite_values():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("level", "A level.", ("kind",))
+    gauge.labels("nan").set(float("nan"))
+    gauge.labels("inf").set(float("inf"))
+    gauge.labels("-inf").set(float("-inf"))
+
+    assert render_prometheus(registry.collect()).decode().splitlines()[2:] == [
+        'level{kind="nan"} NaN',
+        'level{kind="inf"} +Inf',
+        'level{kind="-inf"} -Inf',
+    ]